@@ -7,6 +7,8 @@ from pydantic import BaseModel
 import uvicorn
 
 from editerra_racag.query import query_racag
+from editerra_racag.db.registry import registry
+from editerra_racag.retrieval.semantic_retriever import warm_up_default_store
 
 # ---------------
 # FastAPI service
@@ -29,6 +31,22 @@ class QueryRequest(BaseModel):
     top_k: int = 5
 
 
+# ----- Lifecycle -----
+
+@app.on_event("startup")
+def warm_up_store():
+    # Open the vector store once, before the first request
+    try:
+        warm_up_default_store()
+    except Exception as e:
+        print(f"⚠️ Vector store warm-up failed: {e}")
+
+
+@app.on_event("shutdown")
+def close_stores():
+    registry.close_all()
+
+
 # ----- Routes -----
 
 @app.post("/context")
@@ -37,6 +55,12 @@ def get_context(req: QueryRequest):
     return {"ok": True, "context": context_bundle}
 
 
+@app.get("/health")
+def health():
+    report = registry.health_check()
+    return {"status": "ok" if report["ok"] else "degraded", **report}
+
+
 @app.get("/last")
 def get_last_context():
     try:
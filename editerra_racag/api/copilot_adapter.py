@@ -1,6 +1,6 @@
 # racag/api/copilot_adapter.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
 from editerra_racag.query import query_racag
 from editerra_racag.context.context_assembler import context_to_markdown
@@ -12,13 +12,15 @@ class CopilotRequest(BaseModel):
     top_k: int = 5
 
 @router.post("/contextualize")
-def contextualize(req: CopilotRequest):
+def contextualize(req: CopilotRequest, request: Request):
     """
     Takes a plain Copilot prompt, retrieves RACAG context,
     formats it using the unified metadata schema,
     and returns a fully assembled superprompt.
     """
-    context_bundle = query_racag(req.prompt, top_k=req.top_k)
+    # Set by create_app(); None serves the current directory
+    workspace = getattr(request.app.state, "workspace", None)
+    context_bundle = query_racag(req.prompt, top_k=req.top_k, workspace=workspace)
 
     # context_bundle["items"] = list of dicts with unified metadata schema
     context_markdown = context_to_markdown(context_bundle["items"])
@@ -4,7 +4,8 @@ import uvicorn
 
 if __name__ == "__main__":
     uvicorn.run(
-        "racag.api.server:app",
+        "editerra_racag.api.server:create_app",
+        factory=True,
         host="127.0.0.1",
         port=8009,
         reload=False,
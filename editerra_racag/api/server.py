@@ -3,29 +3,60 @@
 from editerra_racag.telemetry.noop_tracing import disable_tracing
 disable_tracing()
 
+from pathlib import Path
+from typing import Optional
+
 from fastapi import FastAPI
 from editerra_racag.api.copilot_adapter import router as copilot_router
+from editerra_racag.db.registry import registry
+from editerra_racag.retrieval.semantic_retriever import warm_up_default_store
+
+
+def create_app(workspace: Optional[Path] = None) -> FastAPI:
+    """
+    Build the API app.
 
-app = FastAPI(title="RACAG API", version="0.1")
+    Args:
+        workspace: Workspace to serve; the query path resolves its store and
+            logs relative to it (default: the current directory)
+    """
+    app = FastAPI(title="RACAG API", version="0.1")
+    app.state.workspace = workspace
 
-# Register routers
-app.include_router(copilot_router, prefix="/copilot")
+    # Register routers
+    app.include_router(copilot_router, prefix="/copilot")
 
-@app.get("/")
-def root():
-    return {
-        "status": "online",
-        "message": "RACAG API is running.",
-        "endpoints": {
-            "contextualize": "/copilot/contextualize"
+    @app.on_event("startup")
+    def warm_up_store():
+        # Open the vector store once, before the first request
+        try:
+            warm_up_default_store(workspace)
+        except Exception as e:
+            print(f"⚠️ Vector store warm-up failed: {e}")
+
+    @app.on_event("shutdown")
+    def close_stores():
+        registry.close_all()
+
+    @app.get("/")
+    def root():
+        return {
+            "status": "online",
+            "message": "RACAG API is running.",
+            "endpoints": {
+                "contextualize": "/copilot/contextualize",
+                "health": "/health"
+            }
         }
-    }
 
+    # Health endpoint (vector stores open in this process)
+    @app.get("/health")
+    def health():
+        report = registry.health_check()
+        return {"status": "ok" if report["ok"] else "degraded", **report}
+
+    return app
 
-# Health endpoint
-@app.get("/health")
-def health():
-    return {"status": "ok"}
 
 # --- RACAG API server launcher ---
 
@@ -34,7 +65,8 @@ import uvicorn
 def start_api():
     """Start RACAG API via uvicorn on 127.0.0.1:8009"""
     uvicorn.run(
-        "racag.api.server:app",
+        "editerra_racag.api.server:create_app",
+        factory=True,
         host="127.0.0.1",
         port=8009,
         reload=False,
@@ -0,0 +1,213 @@
+"""
+Token-targeted chunk size balancing.
+
+Chunkers cut files along their structure, which leaves chunk sizes very
+uneven: a one-line Swift function or a two-line markdown section costs a
+whole embedding request, while a huge view or JSON blob overflows the
+model. `balance_chunks` evens one file's chunks out towards a token window:
+
+- oversized chunks are split at line boundaries (preferring blank lines)
+  into pieces around `target_tokens`, each repeating the last
+  `overlap_tokens` of the previous piece
+- runs of small, non-overlapping neighbours are merged while the merged
+  chunk stays within `target_tokens`
+
+Chunks from different files are never merged. Nested chunks (a method
+inside its class) are not merged with their parent, so no text is
+duplicated by merging.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from editerra_racag.chunking.normalize import content_hash, generate_chunk_id
+from editerra_racag.tokenizer import count_tokens, split_to_tokens
+
+
+@dataclass(frozen=True)
+class ChunkBudget:
+    """Token window chunks are balanced towards."""
+
+    target_tokens: int = 400
+    min_tokens: int = 80
+    max_tokens: int = 800
+    overlap_tokens: int = 40
+
+    def __post_init__(self):
+        if not 0 < self.min_tokens <= self.target_tokens <= self.max_tokens:
+            raise ValueError(
+                "Chunk budget must satisfy 0 < min_tokens <= target_tokens <= max_tokens"
+            )
+        if not 0 <= self.overlap_tokens < self.target_tokens:
+            raise ValueError("overlap_tokens must be smaller than target_tokens")
+
+    @property
+    def key(self) -> str:
+        """Stable identifier, used to version cached chunks."""
+        return f"{self.target_tokens}-{self.min_tokens}-{self.max_tokens}-{self.overlap_tokens}"
+
+
+def _with_text(
+    chunk: Dict, text: str, start_line: int, end_line: int, tags: List[str], symbol: str
+) -> Dict:
+    item = dict(chunk)
+    item["chunk_text"] = text
+    item["start_line"] = start_line
+    item["end_line"] = end_line
+    item["tags"] = tags
+    item["symbol"] = symbol
+    item["content_hash"] = content_hash(text)
+    item["chunk_id"] = generate_chunk_id(text, item.get("file_path", "unknown"), symbol)
+    return item
+
+
+# ============================================================
+# SPLITTING
+# ============================================================
+
+def _line_pieces(lines: List[str], budget: ChunkBudget) -> List[Tuple[int, int]]:
+    """Group lines into [start, end) index ranges of about target_tokens each."""
+    costs = [count_tokens(line) + 1 for line in lines]  # +1 for the newline
+    pieces = []
+    start = 0
+    n = len(lines)
+    while start < n:
+        total = 0
+        end = start
+        last_blank = None
+        while end < n and (end == start or total + costs[end] <= budget.target_tokens):
+            total += costs[end]
+            if not lines[end].strip() and end > start:
+                last_blank = end
+            end += 1
+        # Prefer ending at a blank line if that keeps the piece at least half full
+        if end < n and last_blank is not None:
+            if sum(costs[start:last_blank]) >= budget.target_tokens // 2:
+                end = last_blank
+        pieces.append((start, end))
+        if end >= n:
+            break
+
+        # Start the next piece with up to overlap_tokens of trailing lines
+        next_start = end
+        overlap = 0
+        while next_start - 1 > start and overlap + costs[next_start - 1] <= budget.overlap_tokens:
+            next_start -= 1
+            overlap += costs[next_start]
+        start = next_start
+    return pieces
+
+
+def split_chunk(chunk: Dict, budget: ChunkBudget) -> List[Dict]:
+    """Split one oversized chunk into overlapping pieces within the budget."""
+    text = chunk.get("chunk_text", "")
+    lines = text.split("\n")
+    first_line = int(chunk.get("start_line", 0) or 0)
+    base_tags = list(chunk.get("tags") or [])
+    symbol = chunk.get("symbol") or ""
+
+    parts: List[Tuple[str, int, int]] = []
+    for start, end in _line_pieces(lines, budget):
+        piece = "\n".join(lines[start:end])
+        if count_tokens(piece) > budget.max_tokens:
+            # A single enormous line (minified code, data blobs)
+            for sub in split_to_tokens(piece, budget.target_tokens):
+                parts.append((sub, first_line + start, first_line + end - 1))
+        elif piece.strip():
+            parts.append((piece, first_line + start, first_line + end - 1))
+
+    total = len(parts)
+    return [
+        _with_text(
+            chunk, piece, start_line, max(start_line, end_line),
+            base_tags + [f"part:{i}/{total}"], f"{symbol}#part{i}",
+        )
+        for i, (piece, start_line, end_line) in enumerate(parts, 1)
+    ]
+
+
+# ============================================================
+# MERGING
+# ============================================================
+
+def _merge(group: List[Dict]) -> Dict:
+    if len(group) == 1:
+        return group[0]
+    tags: List[str] = []
+    for c in group:
+        for tag in c.get("tags") or []:
+            if tag not in tags:
+                tags.append(tag)
+    text = "\n\n".join(c["chunk_text"] for c in group)
+    start_line = min(int(c.get("start_line", 0) or 0) for c in group)
+    end_line = max(int(c.get("end_line", 0) or 0) for c in group)
+    symbol = f"{group[0].get('symbol') or ''}..{group[-1].get('symbol') or ''}"
+    merged = _with_text(group[0], text, start_line, end_line, tags, symbol)
+    if len({c.get("function") for c in group}) > 1:
+        merged["function"] = ""
+    return merged
+
+
+def iter_balanced_chunks(chunks: Iterable[Dict], budget: ChunkBudget) -> Iterator[Dict]:
+    """
+    Balance the chunks of ONE file towards the budget's token window, lazily.
+
+    Only the group being merged is held in memory, so very large files
+    (streamed JSON) can be balanced chunk by chunk.
+
+    Args:
+        chunks: Normalized chunks of a single file, in document order
+        budget: Token window
+
+    Yields:
+        Balanced chunks, in document order
+    """
+    def sized() -> Iterator[Tuple[Dict, int]]:
+        for chunk in chunks:
+            tokens = count_tokens(chunk.get("chunk_text", ""))
+            if tokens > budget.max_tokens:
+                for piece in split_chunk(chunk, budget):
+                    yield piece, count_tokens(piece["chunk_text"])
+            else:
+                yield chunk, tokens
+
+    group: List[Dict] = []
+    group_tokens = 0
+    group_end = -1
+    for chunk, tokens in sized():
+        start_line = int(chunk.get("start_line", 0) or 0)
+        mergeable = (
+            group
+            and (group_tokens < budget.min_tokens or tokens < budget.min_tokens)
+            and group_tokens + tokens <= budget.target_tokens
+            and start_line > group_end  # disjoint: never merge a chunk into its parent
+            and chunk.get("file_path") == group[0].get("file_path")
+        )
+        if mergeable:
+            group.append(chunk)
+            group_tokens += tokens
+        else:
+            if group:
+                yield _merge(group)
+            group = [chunk]
+            group_tokens = tokens
+        group_end = max(group_end if len(group) > 1 else -1, int(chunk.get("end_line", 0) or 0))
+
+    if group:
+        yield _merge(group)
+
+
+def balance_chunks(chunks: List[Dict], budget: ChunkBudget) -> List[Dict]:
+    """
+    Balance the chunks of ONE file towards the budget's token window.
+
+    Args:
+        chunks: Normalized chunks of a single file, in document order
+        budget: Token window
+
+    Returns:
+        Balanced chunks, in document order
+    """
+    return list(iter_balanced_chunks(chunks, budget))
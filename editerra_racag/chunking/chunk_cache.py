@@ -0,0 +1,119 @@
+"""
+Persistent per-file chunk cache.
+
+Stores the normalized chunk list of every file in an SQLite table under the
+workspace `cache_path`, keyed by (relative path, mtime_ns, size). Re-indexing
+an unchanged file then costs a stat() and one primary-key lookup instead of a
+full read + parse.
+
+The whole table is dropped whenever the chunker version or the repository
+root changes, so stale chunk shapes or absolute paths never leak through.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+CACHE_FILENAME = "chunks.sqlite"
+
+
+class ChunkCache:
+    """SQLite-backed cache of chunk lists per source file."""
+
+    def __init__(self, cache_dir: Path, version: str, repo_root: Path):
+        """
+        Open (or create) the cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            version: Chunker version; a mismatch invalidates all entries
+            repo_root: Repository root the relative paths are based on
+        """
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / CACHE_FILENAME
+        self.version = str(version)
+        self.repo_root = str(Path(repo_root).resolve())
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_chunks (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                chunks TEXT NOT NULL
+            )
+            """
+        )
+        self._check_meta()
+
+    def _check_meta(self):
+        """Drop all entries if the chunker version or repo root changed."""
+        meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        expected = {"version": self.version, "repo_root": self.repo_root}
+        if meta != expected:
+            with self._conn:
+                self._conn.execute("DELETE FROM file_chunks")
+                self._conn.execute("DELETE FROM meta")
+                self._conn.executemany(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)", expected.items()
+                )
+
+    def get(self, rel_path: str, mtime_ns: int, size: int) -> Optional[List[Dict]]:
+        """Return cached chunks for an unchanged file, or None."""
+        row = self._conn.execute(
+            "SELECT chunks FROM file_chunks WHERE path = ? AND mtime_ns = ? AND size = ?",
+            (rel_path, mtime_ns, size),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, rel_path: str, mtime_ns: int, size: int, chunks: List[Dict]):
+        """Store (or replace) the chunks for a file."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO file_chunks (path, mtime_ns, size, chunks) VALUES (?, ?, ?, ?)",
+            (rel_path, mtime_ns, size, json.dumps(chunks, ensure_ascii=False)),
+        )
+
+    def clear(self):
+        """Drop every cached entry (forced full re-chunk)."""
+        with self._conn:
+            self._conn.execute("DELETE FROM file_chunks")
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Delete entries for files not in `keep` (deleted or now excluded)."""
+        keep_set = set(keep)
+        stale = [
+            (path,)
+            for (path,) in self._conn.execute("SELECT path FROM file_chunks")
+            if path not in keep_set
+        ]
+        self._conn.executemany("DELETE FROM file_chunks WHERE path = ?", stale)
+        return len(stale)
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "ChunkCache":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,68 +1,124 @@
-from tree_sitter import Language, Parser
 from pathlib import Path
-from typing import List, Dict
-import ctypes
-from editerra_racag.paths import get_tree_sitter_lib_path
+from typing import List, Dict, Optional
 
-# Load precompiled Swift language library (tree-sitter 0.25+ API)
-SWIFT_LANGUAGE_LIB = str(get_tree_sitter_lib_path())
+from editerra_racag.chunking.languages import (
+    LanguageSpec,
+    get_chunk_query,
+    get_language_spec,
+    get_parser,
+    load_language,
+    query_captures,
+)
 
-# Load the shared library
-lib = ctypes.CDLL(SWIFT_LANGUAGE_LIB)
-tree_sitter_swift = lib.tree_sitter_swift
-tree_sitter_swift.restype = ctypes.c_void_p
 
-# Create Language from pointer (tree-sitter 0.25+ API)
-SWIFT = Language(tree_sitter_swift())
+def get_swift_language():
+    """Load the Swift grammar (kept for older imports)."""
+    return load_language("swift")
 
-parser = Parser()
-parser.language = SWIFT
 
-def extract_code_chunks(file_path: str) -> List[Dict]:
+def has_code_chunker(file_path: str) -> bool:
+    """True if the file's language has a registered, loadable grammar."""
+    spec = get_language_spec(file_path)
+    return spec is not None and load_language(spec.name) is not None
+
+
+def extract_code_chunks(file_path: str, language: Optional[str] = None) -> List[Dict]:
     """
-    Extracts Swift code chunks (classes, structs, functions) using Tree-sitter,
-    and returns them in the unified RACAG schema.
+    Extracts code chunks (classes, structs, functions, methods, ...) using
+    Tree-sitter, and returns them in the unified RACAG schema.
+
+    Args:
+        file_path: Source file to chunk
+        language: Registry language name; detected from the extension if omitted
     """
     path = Path(file_path)
+    spec: Optional[LanguageSpec] = get_language_spec(language or path.suffix)
+    if spec is None:
+        raise ValueError(f"No code chunker registered for {file_path}")
+
+    source = read_source(path)
+    tree = get_parser(spec.name).parse(source)
+    return chunks_from_tree(path, spec, source, tree)
+
+
+def read_source(path: Path) -> bytes:
+    """Read a source file as UTF-8 bytes, replacing stray invalid bytes."""
     try:
         code = path.read_text(encoding="utf-8")
     except UnicodeDecodeError:
         # Fallback for files with stray non-UTF8 bytes
         code = path.read_text(encoding="utf-8", errors="replace")
-        print(f"⚠️ Non-UTF8 bytes replaced in {file_path}")
-    tree = parser.parse(bytes(code, "utf8"))
-    root_node = tree.root_node
-
-    chunks = []
-
-    def get_text(node):
-        return code[node.start_byte:node.end_byte]
-
-    def recurse(node, depth=0):
-        if node.type in ["class_declaration", "struct_declaration", "function_declaration"]:
-
-            chunk_text = get_text(node)
-            chunk_id = f"{path.name}::{node.type}_{node.start_point[0]}"
-            start_line = node.start_point[0] + 1  # Tree-sitter is zero-based
-            end_line = node.end_point[0] + 1
-            chunk_type = node.type.replace("_declaration", "")
-
-            chunks.append({
-                "chunk_id": chunk_id,
-                "chunk_text": chunk_text,
-                "language": "swift",
-                "framework": "swiftui",
-                "module": path.stem,
-                "function": None,
-                "file_path": str(path),
-                "start_line": start_line,
-                "end_line": end_line,
-                "tags": [chunk_type],
-                "lines": f"{start_line}-{end_line}",
-            })
-
-        for child in node.children:
-            recurse(child, depth + 1)
-
-    recurse(root_node)
-    return chunks
\ No newline at end of file
+        print(f"⚠️ Non-UTF8 bytes replaced in {path}")
+    return bytes(code, "utf8")
+
+
+def chunk_nodes(spec: LanguageSpec, tree) -> List:
+    """Declaration nodes of a parsed tree, in document (pre-)order."""
+    query = get_chunk_query(spec.name)
+    if query is None:
+        return []
+
+    # The query walks the tree in C; only matching nodes come back. Sort
+    # them into document order: outer declarations before inner ones.
+    nodes = {(n.start_byte, n.end_byte, n.type): n for n in query_captures(query, tree.root_node)}
+    return sorted(nodes.values(), key=lambda n: (n.start_byte, -n.end_byte))
+
+
+def chunk_from_node(path: Path, spec: LanguageSpec, source: bytes, node) -> Dict:
+    """Build the RACAG chunk dict for one declaration node."""
+    # Byte offsets: slice the encoded source, not the str
+    chunk_text = source[node.start_byte:node.end_byte].decode("utf-8", errors="replace")
+    symbol = symbol_path(node, spec, source)
+    chunk_id = f"{path.name}::{symbol}"
+    start_line = node.start_point[0] + 1  # Tree-sitter is zero-based
+    end_line = node.end_point[0] + 1
+
+    return {
+        "chunk_id": chunk_id,
+        "chunk_text": chunk_text,
+        "language": spec.name,
+        "framework": spec.framework,
+        "module": path.stem,
+        "function": None,
+        "file_path": str(path),
+        "start_line": start_line,
+        "end_line": end_line,
+        "tags": [_chunk_kind(node, spec)],
+        "lines": f"{start_line}-{end_line}",
+        "symbol": symbol,
+    }
+
+
+def chunks_from_tree(path: Path, spec: LanguageSpec, source: bytes, tree) -> List[Dict]:
+    """All chunks of a parsed file."""
+    return [chunk_from_node(path, spec, source, node) for node in chunk_nodes(spec, tree)]
+
+
+def _node_name(node, source: bytes) -> str:
+    name = node.child_by_field_name("name")
+    if name is None:
+        return node.type
+    return source[name.start_byte:name.end_byte].decode("utf-8", errors="replace")
+
+
+def symbol_path(node, spec: LanguageSpec, source: bytes) -> str:
+    """
+    Structural key of a declaration: the names of it and its enclosing
+    declarations, e.g. `ContentView.body` (independent of line numbers).
+    """
+    chunk_types = spec.chunk_node_types
+    names = []
+    while node is not None:
+        if node.type in chunk_types:
+            names.append(_node_name(node, source))
+        node = node.parent
+    return ".".join(reversed(names))
+
+
+def _chunk_kind(node, spec: LanguageSpec) -> str:
+    """Tag for a chunk node: its declaration keyword when the grammar names one."""
+    if spec.kind_field:
+        kind = node.child_by_field_name(spec.kind_field)
+        if kind is not None:
+            return kind.type
+    return node.type.replace("_declaration", "").replace("_definition", "")
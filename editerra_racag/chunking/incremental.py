@@ -0,0 +1,207 @@
+"""
+Incremental re-chunking for watcher-driven edits.
+
+The watcher sees one file saved over and over. Instead of reparsing it from
+scratch each time, IncrementalChunker keeps the previous source and Tree of
+recently edited files in a small LRU. On the next save it:
+
+1. diffs the old and new bytes (common prefix / common suffix) into a
+   single edit,
+2. applies it with `tree.edit()` and reparses with the old tree, so
+   tree-sitter reuses every untouched subtree,
+3. re-emits only the chunks whose nodes intersect the changed ranges.
+
+Editing the body of one function in a large SwiftUI view re-emits that
+function, not every declaration in the file.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from editerra_racag.chunking.code_chunker import (
+    chunk_from_node,
+    chunk_nodes,
+    chunks_from_tree,
+    read_source,
+)
+from editerra_racag.chunking.languages import get_language_spec, get_parser
+
+ByteRange = Tuple[int, int]
+
+
+class _ParsedFile(NamedTuple):
+    language: str
+    source: bytes
+    tree: object
+
+
+def _point(source: bytes, offset: int) -> Tuple[int, int]:
+    """(row, byte column) of a byte offset, as tree-sitter expects."""
+    row = source.count(b"\n", 0, offset)
+    line_start = source.rfind(b"\n", 0, offset) + 1
+    return row, offset - line_start
+
+
+# Bytes compared per step while skipping the unchanged head and tail
+_DIFF_BLOCK = 4096
+
+
+def _common_prefix(old: bytes, new: bytes, limit: int) -> int:
+    """Length of the common prefix, at most `limit`."""
+    start = 0
+    # Skip equal blocks with C-level slice comparisons ...
+    while start + _DIFF_BLOCK <= limit and old[start:start + _DIFF_BLOCK] == new[start:start + _DIFF_BLOCK]:
+        start += _DIFF_BLOCK
+    # ... then bisect inside the first block that differs
+    lo, hi = start, min(start + _DIFF_BLOCK, limit)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[lo:mid] == new[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(old: bytes, new: bytes, limit: int) -> int:
+    """Length of the common suffix, at most `limit`."""
+    n, m = len(old), len(new)
+    size = 0
+    while size + _DIFF_BLOCK <= limit and old[n - size - _DIFF_BLOCK:n - size] == new[m - size - _DIFF_BLOCK:m - size]:
+        size += _DIFF_BLOCK
+    lo, hi = size, min(size + _DIFF_BLOCK, limit)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[n - mid:n - lo] == new[m - mid:m - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def diff_bytes(old: bytes, new: bytes) -> Optional[Tuple[int, int, int]]:
+    """
+    Smallest single edit turning `old` into `new`.
+
+    Returns:
+        (start_byte, old_end_byte, new_end_byte), or None if identical
+    """
+    if old == new:
+        return None
+    limit = min(len(old), len(new))
+    start = _common_prefix(old, new, limit)
+    # The common suffix must not overlap the common prefix
+    suffix = _common_suffix(old, new, limit - start)
+    return start, len(old) - suffix, len(new) - suffix
+
+
+def _intersects(node, start: int, end: int) -> bool:
+    if start == end:
+        # Pure deletion: the chunk(s) around the cut point changed
+        return node.start_byte <= start <= node.end_byte
+    return node.start_byte < end and start < node.end_byte
+
+
+def _contains(node, start: int, end: int) -> bool:
+    return node.start_byte <= start and end <= node.end_byte
+
+
+def select_changed_nodes(nodes: List, ranges: List[ByteRange]) -> List:
+    """
+    Chunk nodes touched by the changed byte ranges.
+
+    For each range, the innermost declaration containing it is selected
+    (its enclosing declarations are not), together with any declarations
+    that only partly overlap it or lie inside it.
+    """
+    selected = {}
+    for start, end in ranges:
+        touched = [n for n in nodes if _intersects(n, start, end)]
+        containing = [n for n in touched if _contains(n, start, end)]
+        if containing:
+            innermost = min(containing, key=lambda n: n.end_byte - n.start_byte)
+            selected[(innermost.start_byte, innermost.end_byte, innermost.type)] = innermost
+        for n in touched:
+            if not _contains(n, start, end):
+                selected[(n.start_byte, n.end_byte, n.type)] = n
+    return sorted(selected.values(), key=lambda n: (n.start_byte, -n.end_byte))
+
+
+class IncrementalChunker:
+    """Re-chunks edited files, reusing the previous parse tree of each."""
+
+    def __init__(self, max_files: int = 32):
+        """
+        Args:
+            max_files: How many files' trees to keep (least recently edited
+                files are evicted and fully reparsed on their next save)
+        """
+        self.max_files = max_files
+        self._files: "OrderedDict[str, _ParsedFile]" = OrderedDict()
+
+    def forget(self, file_path: str):
+        """Drop the cached tree of a file (e.g. after it was deleted)."""
+        self._files.pop(str(Path(file_path).resolve()), None)
+
+    def update(self, file_path: str) -> Tuple[List[Dict], bool]:
+        """
+        Reparse a file and return its changed chunks.
+
+        Args:
+            file_path: Saved source file
+
+        Returns:
+            (chunks, incremental): incremental is False when the file had no
+            cached tree and every chunk was returned
+        """
+        path = Path(file_path)
+        spec = get_language_spec(path.suffix)
+        if spec is None:
+            raise ValueError(f"No code chunker registered for {file_path}")
+
+        key = str(path.resolve())
+        source = read_source(path)
+        parser = get_parser(spec.name)
+        previous = self._files.pop(key, None)
+        if previous is not None and previous.language != spec.name:
+            previous = None
+
+        if previous is None:
+            tree = parser.parse(source)
+            self._remember(key, _ParsedFile(spec.name, source, tree))
+            return chunks_from_tree(path, spec, source, tree), False
+
+        edit = diff_bytes(previous.source, source)
+        if edit is None:
+            self._remember(key, previous)
+            return [], True
+
+        start, old_end, new_end = edit
+        old_tree = previous.tree
+        old_tree.edit(
+            start_byte=start,
+            old_end_byte=old_end,
+            new_end_byte=new_end,
+            start_point=_point(previous.source, start),
+            old_end_point=_point(previous.source, old_end),
+            new_end_point=_point(source, new_end),
+        )
+        tree = parser.parse(source, old_tree)
+        self._remember(key, _ParsedFile(spec.name, source, tree))
+
+        # The edited span itself plus whatever tree-sitter reports as
+        # structurally different (e.g. a brace that re-nested a block).
+        ranges = [(start, new_end)]
+        ranges.extend((r.start_byte, r.end_byte) for r in old_tree.changed_ranges(tree))
+
+        nodes = select_changed_nodes(chunk_nodes(spec, tree), ranges)
+        return [chunk_from_node(path, spec, source, node) for node in nodes], True
+
+    def _remember(self, key: str, parsed: _ParsedFile):
+        self._files[key] = parsed
+        self._files.move_to_end(key)
+        while len(self._files) > self.max_files:
+            self._files.popitem(last=False)
@@ -1,84 +1,253 @@
-from pathlib import Path
+"""
+Streaming JSON chunker.
+
+Large fixture and localization files are never parsed into Python objects.
+The file is read in blocks and scanned by a small lexer that only tracks
+what chunking needs: string state, nesting depth, the key/index path and
+line numbers. Chunks are raw slices of the file, so their text and line
+spans match the source exactly:
+
+- members of the top-level object/array are grouped until a chunk holds at
+  least MIN_CHUNK_BYTES, then cut after the next top-level member
+- a member that grows past MAX_CHUNK_BYTES is cut at the next comma at any
+  depth (tagged `json_fragment`)
+- a string longer than MAX_CHUNK_BYTES is cut inside the string once the
+  chunk passes MAX_CHUNK_BYTES, on a UTF-8 character boundary outside
+  escapes, so memory stays bounded however long the string is
+
+Each chunk is tagged with the JSON path (e.g. `json_path:$.en.buttons`) of
+its first member.
+"""
+
 import json
-from typing import List, Dict, Any
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
 
-def chunk_json(file_path: str) -> List[Dict[str, Any]]:
+READ_BLOCK_BYTES = 1 << 20
+MIN_CHUNK_BYTES = 1024
+MAX_CHUNK_BYTES = 4096
+
+# Outside strings only structural bytes and whole strings matter; a lone
+# quote is a string that continues in the next block. The string pattern is
+# unrolled so a long string is matched without per-character backtracking.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\],:"]', re.DOTALL)
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_ESCAPE = re.compile(rb'\\(?:u[0-9a-fA-F]{4}|.)', re.DOTALL)
+_LEADING = re.compile(rb"[\s,]*")
+
+
+def _json_path(stack: List[list]) -> str:
+    parts = ["$"]
+    for kind, key, _ in stack:
+        if kind == b"{":
+            if key is not None:
+                parts.append(f".{key}")
+        else:
+            parts.append(f"[{key}]")
+    return "".join(parts)
+
+
+def _decode_key(raw: bytes) -> str:
+    try:
+        return json.loads(b'"' + raw + b'"')
+    except ValueError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def _string_cut(buf: bytearray, start: int, target: int) -> int:
     """
-    Chunk JSON files by extracting top-level keys as semantic chunks.
-    Each chunk contains:
-        - chunk_id
-        - text
-        - language
-        - file_path
-        - type
-        - start_line
-        - end_line
-        - content_hash
+    Last position at or before `target` that splits no escape and no UTF-8
+    character of string content beginning at `start`.
     """
+    cut = target
+    for m in _ESCAPE.finditer(buf, start, target + 6):
+        if m.start() >= target:
+            break
+        if m.end() > target:
+            cut = m.start()
+            break
+    while cut > start and 0x80 <= buf[cut] < 0xC0:
+        cut -= 1
+    return cut
 
+
+def iter_json_chunks(
+    file_path: str,
+    min_bytes: int = MIN_CHUNK_BYTES,
+    max_bytes: int = MAX_CHUNK_BYTES,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the chunks of a JSON file.
+
+    Args:
+        file_path: JSON file to chunk
+        min_bytes: Group top-level members until a chunk reaches this size
+        max_bytes: Cut inside a member once a chunk grows past this size
+
+    Yields:
+        Chunks in the unified RACAG schema, in file order
+    """
     path = Path(file_path)
-    raw = path.read_text(encoding="utf-8")
 
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        total_lines = len(raw.splitlines())
-        return [
-            {
-                "chunk_id": f"{path.name}::full_json",
-                "chunk_text": raw,
+    buf = bytearray()
+    pos = 0                  # Scan position in buf
+    buf_line = 1             # Line number of buf[0]
+    buf_offset = 0           # File offset of buf[0]
+    # Open containers: [b"{" or b"[", current key / index, expecting a key]
+    stack: List[list] = []
+    in_string = False
+    string_start = 0
+    string_is_key = False
+    chunk_path: Optional[str] = None
+    fragment = False
+    # buf starts inside a string that was cut; its text is kept verbatim
+    mid_string = False
+
+    def flush(end: int, in_string: bool = False) -> Optional[Dict[str, Any]]:
+        nonlocal buf, pos, buf_line, buf_offset, chunk_path, fragment, mid_string
+        raw = bytes(buf[:end])
+        lead = 0 if mid_string else _LEADING.match(raw).end()
+        body = raw[lead:] if in_string else raw[lead:].rstrip(b" \t\r\n,")
+        start_line = buf_line + raw.count(b"\n", 0, lead)
+        end_line = start_line + body.count(b"\n")
+
+        chunk = None
+        if body:
+            json_path = chunk_path or _json_path(stack)
+            tags = ["json", f"json_path:{json_path}"]
+            if fragment:
+                tags.append("json_fragment")
+            chunk = {
+                "chunk_id": f"{path.name}::json_{buf_offset + lead}",
+                "chunk_text": body.decode("utf-8", errors="replace"),
                 "language": "json",
                 "framework": "generic",
                 "module": path.stem,
                 "function": None,
                 "file_path": str(path),
-                "start_line": 1,
-                "end_line": total_lines,
-                "tags": ["json_document"],
-                "lines": f"1-{total_lines}",
+                "start_line": start_line,
+                "end_line": end_line,
+                "tags": tags,
+                "lines": f"{start_line}-{end_line}",
+                "symbol": json_path,
             }
-        ]
-
-    chunks = []
-    lines = raw.splitlines()
-    total_lines = len(lines)
-
-    # For each top-level key, extract text slice if possible
-    if isinstance(data, dict):
-        for key, value in data.items():
-            # Convert each entry back to pretty-printed JSON
-            sub_json = json.dumps({key: value}, indent=2)
-
-            chunk_id = f"{path.name}::key::{key}"
-            chunks.append({
-                "chunk_id": chunk_id,
-                "chunk_text": sub_json,
-                "language": "json",
-                "framework": "generic",
-                "module": path.stem,
-                "function": None,
-                "file_path": str(path),
-                "start_line": 1,
-                "end_line": total_lines,
-                "tags": ["json_key", f"key:{key}"],
-                "lines": f"1-{total_lines}",
-            })
-
-    else:
-        # If it's a JSON array or primitive
-        sub_json = json.dumps(data, indent=2)
-        chunks.append({
-            "chunk_id": f"{path.name}::array_or_value",
-            "chunk_text": sub_json,
-            "language": "json",
-            "framework": "generic",
-            "module": path.stem,
-            "function": None,
-            "file_path": str(path),
-            "start_line": 1,
-            "end_line": total_lines,
-            "tags": ["json_array_or_value"],
-            "lines": f"1-{total_lines}",
-        })
-
-    return chunks
\ No newline at end of file
+
+        buf_line += raw.count(b"\n")
+        buf_offset += end
+        del buf[:end]
+        pos -= end
+        mid_string = in_string
+        if in_string:
+            chunk_path = _json_path(stack)
+            fragment = True
+        else:
+            # Inside an array the next element's index is already known
+            chunk_path = _json_path(stack) if stack and stack[-1][0] == b"[" else None
+            fragment = len(stack) > 1
+        return chunk
+
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(READ_BLOCK_BYTES)
+            if not block:
+                break
+            buf += block
+
+            while True:
+                if in_string:
+                    m = _STRING_SPECIAL.search(buf, pos)
+                    end = m.start() if m is not None else len(buf)
+                    if end > max_bytes and end - string_start > max_bytes:
+                        # A string longer than a chunk: cut it at max_bytes
+                        content = string_start + 1
+                        cut = _string_cut(buf, content, max(max_bytes, content))
+                        if cut > 0:
+                            fragment = True
+                            pos = max(pos, cut)
+                            chunk = flush(cut, in_string=True)
+                            # The string (a cut key keeps its tail) now starts
+                            # before buf
+                            string_start = -1
+                            if chunk is not None:
+                                yield chunk
+                            continue
+                    if m is None:
+                        pos = len(buf)
+                        break
+                    if m.group() == b"\\":
+                        # \uXXXX is skipped whole, so pos never splits an escape
+                        width = 5 if buf[m.end():m.end() + 1] == b"u" else 1
+                        if m.end() + width > len(buf):
+                            # Escaped bytes are in the next block
+                            pos = m.start()
+                            break
+                        pos = m.end() + width
+                        continue
+                    in_string = False
+                    pos = m.end()
+                    if string_is_key:
+                        stack[-1][1] = _decode_key(bytes(buf[string_start + 1:m.start()]))
+                        if chunk_path is None:
+                            chunk_path = _json_path(stack)
+                    continue
+
+                m = _TOKEN.search(buf, pos)
+                if m is None:
+                    pos = len(buf)
+                    break
+                c = m.group()
+                pos = m.end()
+
+                if c[0] == 0x22:  # '"'
+                    string_is_key = bool(stack) and stack[-1][0] == b"{" and stack[-1][2]
+                    if len(c) == 1 or len(c) > max_bytes:
+                        # Unterminated in this block, or long enough to be
+                        # cut: scan it incrementally
+                        in_string = True
+                        string_start = m.start()
+                        pos = string_start + 1
+                        continue
+                    if string_is_key:
+                        stack[-1][1] = _decode_key(c[1:-1])
+                        if chunk_path is None:
+                            chunk_path = _json_path(stack)
+                elif c == b":":
+                    if stack:
+                        stack[-1][2] = False
+                elif c == b"{":
+                    stack.append([c, None, True])
+                elif c == b"[":
+                    stack.append([c, 0, False])
+                    if chunk_path is None and len(stack) == 1:
+                        chunk_path = _json_path(stack)
+                elif c in (b"}", b"]"):
+                    if stack:
+                        stack.pop()
+                elif c == b",":
+                    if not stack:
+                        continue
+                    top = stack[-1]
+                    if top[0] == b"{":
+                        top[2] = True
+                    else:
+                        top[1] += 1
+                    if (len(stack) == 1 and pos >= min_bytes) or pos >= max_bytes:
+                        chunk = flush(pos)
+                        if chunk is not None:
+                            yield chunk
+
+    if buf:
+        chunk = flush(len(buf))
+        if chunk is not None:
+            yield chunk
+
+
+def chunk_json(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Chunk a JSON file into raw-text slices with accurate line spans.
+
+    See iter_json_chunks(); the file is streamed, never parsed as a whole,
+    but the chunks are collected. The chunking pipeline uses the iterator.
+    """
+    return list(iter_json_chunks(file_path))
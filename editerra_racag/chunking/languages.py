@@ -0,0 +1,285 @@
+"""
+Tree-sitter language registry for the code chunker.
+
+Each supported language is described by a LanguageSpec: the file extensions
+it owns, the syntax node types that become chunks, and where its grammar
+can be loaded from. Grammars are loaded lazily, the first time a file of
+that language is chunked, and cached per process (parallel chunking workers
+each build their own parsers).
+
+Chunks are found with a compiled tree-sitter query per language, so the tree
+is walked in C and only matching declaration nodes reach Python.
+
+Grammar sources, in order:
+    1. the bundled shared library (tree_sitter_languages/build/my-languages.so)
+    2. the per-language wheel (e.g. `pip install tree-sitter-python`)
+
+A language whose grammar cannot be found is reported once and its files fall
+back to whole-file chunks.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import importlib
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from tree_sitter import Language, Parser, Query
+
+try:
+    from tree_sitter import QueryCursor  # tree-sitter >= 0.25
+except ImportError:
+    QueryCursor = None
+
+from editerra_racag.paths import get_tree_sitter_lib_path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LanguageSpec:
+    """How to load and chunk one tree-sitter language."""
+
+    name: str
+    extensions: Tuple[str, ...]
+    chunk_node_types: Tuple[str, ...]
+    framework: Optional[str] = None   # None: detected from the path by normalize
+    symbol: Optional[str] = None      # C symbol in the bundled shared library
+    module: Optional[str] = None      # Python grammar package
+    module_attr: str = "language"     # Function of that package returning the grammar
+    kind_field: Optional[str] = None  # Child field naming the declaration kind (e.g. "struct")
+
+
+LANGUAGES: Dict[str, LanguageSpec] = {
+    spec.name: spec
+    for spec in (
+        LanguageSpec(
+            name="swift",
+            extensions=(".swift",),
+            # Newer grammars fold struct/enum/extension/actor into
+            # class_declaration and tell them apart by `declaration_kind`;
+            # node types a grammar does not know are dropped from the query.
+            chunk_node_types=(
+                "class_declaration", "struct_declaration", "extension_declaration",
+                "protocol_declaration", "function_declaration",
+            ),
+            framework="swiftui",
+            symbol="tree_sitter_swift",
+            module="tree_sitter_swift",
+            kind_field="declaration_kind",
+        ),
+        LanguageSpec(
+            name="python",
+            extensions=(".py",),
+            chunk_node_types=("class_definition", "function_definition"),
+            symbol="tree_sitter_python",
+            module="tree_sitter_python",
+        ),
+        LanguageSpec(
+            name="javascript",
+            extensions=(".js", ".jsx", ".mjs", ".cjs"),
+            chunk_node_types=(
+                "class_declaration", "function_declaration",
+                "generator_function_declaration", "method_definition",
+            ),
+            symbol="tree_sitter_javascript",
+            module="tree_sitter_javascript",
+        ),
+        LanguageSpec(
+            name="typescript",
+            extensions=(".ts",),
+            chunk_node_types=(
+                "class_declaration", "abstract_class_declaration", "interface_declaration",
+                "enum_declaration", "function_declaration", "generator_function_declaration",
+                "method_definition",
+            ),
+            symbol="tree_sitter_typescript",
+            module="tree_sitter_typescript",
+            module_attr="language_typescript",
+        ),
+        LanguageSpec(
+            name="tsx",
+            extensions=(".tsx",),
+            chunk_node_types=(
+                "class_declaration", "abstract_class_declaration", "interface_declaration",
+                "enum_declaration", "function_declaration", "generator_function_declaration",
+                "method_definition",
+            ),
+            framework="react",
+            symbol="tree_sitter_tsx",
+            module="tree_sitter_typescript",
+            module_attr="language_tsx",
+        ),
+        LanguageSpec(
+            name="kotlin",
+            extensions=(".kt", ".kts"),
+            chunk_node_types=("class_declaration", "object_declaration", "function_declaration"),
+            symbol="tree_sitter_kotlin",
+            module="tree_sitter_kotlin",
+        ),
+        LanguageSpec(
+            name="java",
+            extensions=(".java",),
+            chunk_node_types=(
+                "class_declaration", "interface_declaration", "enum_declaration",
+                "record_declaration", "method_declaration", "constructor_declaration",
+            ),
+            symbol="tree_sitter_java",
+            module="tree_sitter_java",
+        ),
+    )
+}
+
+EXTENSION_MAP: Dict[str, LanguageSpec] = {
+    ext: spec for spec in LANGUAGES.values() for ext in spec.extensions
+}
+
+
+def get_language_spec(path_or_ext: str) -> Optional[LanguageSpec]:
+    """Look up the spec for a file path, an extension or a language name."""
+    if path_or_ext in LANGUAGES:
+        return LANGUAGES[path_or_ext]
+    ext = path_or_ext if path_or_ext.startswith(".") else Path(path_or_ext).suffix
+    return EXTENSION_MAP.get(ext.lower())
+
+
+# ============================================================
+# LAZY, PER-PROCESS GRAMMAR & PARSER CACHE
+# ============================================================
+
+_languages: Dict[str, Optional[Language]] = {}
+_parsers: Dict[str, Parser] = {}
+_queries: Dict[str, Optional[Query]] = {}
+_cache_pid: Optional[int] = None
+_bundled_lib = None
+
+
+def _check_pid():
+    """Drop parsers inherited through fork(); each process builds its own."""
+    global _cache_pid, _bundled_lib
+    if _cache_pid != os.getpid():
+        _parsers.clear()
+        _queries.clear()
+        _languages.clear()
+        _bundled_lib = None
+        _cache_pid = os.getpid()
+
+
+def _load_bundled(symbol: str) -> Optional[Language]:
+    global _bundled_lib
+    lib_path = get_tree_sitter_lib_path()
+    if not lib_path.exists():
+        return None
+    if _bundled_lib is None:
+        _bundled_lib = ctypes.CDLL(str(lib_path))
+    try:
+        func = getattr(_bundled_lib, symbol)
+    except AttributeError:
+        return None
+    func.restype = ctypes.c_void_p
+    # Create Language from pointer (tree-sitter 0.25+ API)
+    return Language(func())
+
+
+def _load_module(module: str, attr: str) -> Optional[Language]:
+    try:
+        grammar = importlib.import_module(module)
+    except ImportError:
+        return None
+    return Language(getattr(grammar, attr)())
+
+
+def load_language(name: str) -> Optional[Language]:
+    """Return the grammar for a language, loading it on first use (None if unavailable)."""
+    _check_pid()
+    if name in _languages:
+        return _languages[name]
+
+    spec = LANGUAGES[name]
+    language = None
+    errors = []
+    loaders = []
+    if spec.symbol:
+        loaders.append(lambda: _load_bundled(spec.symbol))
+    if spec.module:
+        loaders.append(lambda: _load_module(spec.module, spec.module_attr))
+    for loader in loaders:
+        try:
+            language = loader()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        if language is not None:
+            break
+
+    if language is None:
+        detail = f" ({'; '.join(errors)})" if errors else ""
+        logger.warning(
+            f"No tree-sitter grammar for {name}{detail}; "
+            f"install {spec.module.replace('_', '-') if spec.module else 'it'} "
+            f"to chunk {', '.join(spec.extensions)} files by declaration"
+        )
+    _languages[name] = language
+    return language
+
+
+def get_parser(name: str = "swift") -> Parser:
+    """Return this process's parser for a language, creating it on first use."""
+    _check_pid()
+    parser = _parsers.get(name)
+    if parser is None:
+        language = load_language(name)
+        if language is None:
+            raise RuntimeError(f"Tree-sitter grammar for '{name}' is not available")
+        parser = Parser()
+        parser.language = language
+        _parsers[name] = parser
+    return parser
+
+
+def get_chunk_query(name: str) -> Optional[Query]:
+    """
+    Return this process's compiled chunk query for a language.
+
+    The query captures every node of the spec's chunk_node_types as `@chunk`.
+
+    Returns:
+        The compiled query, or None if the grammar knows none of the node types
+
+    Raises:
+        RuntimeError: If the grammar is not available
+    """
+    _check_pid()
+    if name in _queries:
+        return _queries[name]
+
+    language = load_language(name)
+    if language is None:
+        raise RuntimeError(f"Tree-sitter grammar for '{name}' is not available")
+
+    node_types = [
+        node_type for node_type in LANGUAGES[name].chunk_node_types
+        if language.id_for_node_kind(node_type, True) is not None
+    ]
+    query = None
+    if node_types:
+        source = " ".join(f"({node_type}) @chunk" for node_type in node_types)
+        query = Query(language, source)
+    _queries[name] = query
+    return query
+
+
+def query_captures(query: Query, node) -> list:
+    """Nodes captured by `query` under `node`, across tree-sitter versions."""
+    if QueryCursor is not None:
+        captures = QueryCursor(query).captures(node)
+    else:
+        captures = query.captures(node)
+    if isinstance(captures, dict):
+        return [n for nodes in captures.values() for n in nodes]
+    # tree-sitter < 0.23: list of (node, capture_name)
+    return [n for n, _ in captures]
@@ -19,6 +19,7 @@ def chunk_markdown(file_path: str) -> List[Dict]:
 
     current_text = []
     current_start = 0
+    current_heading = "(preamble)"
 
     for i, line in enumerate(lines):
         if re.match(r"^(##|###)\s", line):
@@ -38,9 +39,11 @@ def chunk_markdown(file_path: str) -> List[Dict]:
                     "end_line": end_line,
                     "tags": ["markdown"],
                     "lines": f"{start_line}-{end_line}",
+                    "symbol": current_heading,
                 })
             current_text = [line]
             current_start = i
+            current_heading = line.lstrip("#").strip()
         else:
             current_text.append(line)
 
@@ -60,6 +63,7 @@ def chunk_markdown(file_path: str) -> List[Dict]:
             "end_line": end_line,
             "tags": ["markdown"],
             "lines": f"{start_line}-{end_line}",
+            "symbol": current_heading,
         })
 
     return chunks
\ No newline at end of file
@@ -1,6 +1,9 @@
 import hashlib
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Legacy hard cap on chunk text; the token balancer replaces it when enabled
+MAX_CHUNK_CHARS = 5000
 
 # ---------------------------------------------------
 # INTERNAL UTILITIES
@@ -19,7 +22,9 @@ def detect_language(filepath: str) -> str:
         ".py": "python",
         ".swift": "swift",
         ".js": "javascript",
+        ".jsx": "javascript",
         ".ts": "typescript",
+        ".tsx": "typescript",
         ".kt": "kotlin",
         ".java": "java",
         ".md": "markdown",
@@ -47,13 +52,48 @@ def detect_module(filepath: str) -> str:
     return Path(filepath).stem
 
 
-def generate_chunk_id(text: str, filepath: str, start: int, end: int) -> str:
-    """Deterministic ID: ensures deduplication across runs."""
-    h = hashlib.md5(f"{filepath}:{start}:{end}:{text}".encode("utf-8")).hexdigest()[:12]
+def content_hash(text: str) -> str:
+    """SHA-256 of the chunk text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def generate_chunk_id(text: str, filepath: str, symbol: str = "") -> str:
+    """
+    Deterministic, content-addressed ID: file + symbol path + content hash.
+
+    Line numbers are deliberately not part of the ID, so a chunk that only
+    moved (lines inserted above it) keeps its identity and its embedding.
+    """
+    h = hashlib.md5(f"{filepath}:{symbol}:{content_hash(text)}".encode("utf-8")).hexdigest()[:12]
     file_id = Path(filepath).name
     return f"{file_id}::{h}"
 
 
+def iter_assign_chunk_ids(chunks: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Make symbols unique within one file's chunks and (re)compute their IDs.
+
+    Repeated symbols (overloads, duplicate headings) get an occurrence
+    suffix (`name#2`), which depends on order but not on line numbers.
+    """
+    seen: Dict[str, int] = {}
+    for c in chunks:
+        symbol = c.get("symbol") or ""
+        count = seen.get(symbol, 0) + 1
+        seen[symbol] = count
+        if count > 1:
+            symbol = f"{symbol}#{count}"
+            c["symbol"] = symbol
+        c["content_hash"] = content_hash(c["chunk_text"])
+        c["chunk_id"] = generate_chunk_id(c["chunk_text"], c.get("file_path", "unknown"), symbol)
+        yield c
+
+
+def assign_chunk_ids(chunks: List[Dict]) -> List[Dict]:
+    """List form of iter_assign_chunk_ids()."""
+    return list(iter_assign_chunk_ids(chunks))
+
+
 def sanitize_text(text: str) -> str:
     """Strip weird characters and null bytes."""
     if not isinstance(text, str):
@@ -65,10 +105,15 @@ def sanitize_text(text: str) -> str:
 # MAIN NORMALIZATION FUNCTION
 # ---------------------------------------------------
 
-def normalize_chunks(raw_chunks: List[Dict]) -> List[Dict]:
+def normalize_chunks(raw_chunks: List[Dict], max_chars: Optional[int] = MAX_CHUNK_CHARS) -> List[Dict]:
     """
     Main unifier for all chunkers.
     Ensures ALL chunks follow the unified RACAG schema.
+
+    Args:
+        raw_chunks: Chunks in any of the chunkers' shapes
+        max_chars: Truncate chunk text beyond this length (None keeps it whole,
+            e.g. when the chunk balancer splits oversized chunks afterwards)
     """
 
     normalized = []
@@ -95,10 +140,10 @@ def normalize_chunks(raw_chunks: List[Dict]) -> List[Dict]:
             start_line = int(c.get("start_line", 0))
             end_line = int(c.get("end_line", 0))
 
-            chunk_id = generate_chunk_id(text, file_path, start_line, end_line)
+            symbol = safe_str(c.get("symbol"))
 
             item = {
-                "chunk_id": chunk_id,
+                "chunk_id": "",
                 "chunk_text": text,
                 "description": safe_str(c.get("description", "")),
                 "file_path": file_path,
@@ -109,10 +154,15 @@ def normalize_chunks(raw_chunks: List[Dict]) -> List[Dict]:
                 "tags": c.get("tags") or [],
                 "start_line": start_line,
                 "end_line": end_line,
+                "symbol": symbol,
+                "content_hash": "",
             }
 
-            if len(item["chunk_text"]) > 5000:
-                item["chunk_text"] = item["chunk_text"][:5000] + "\n[...] TRUNCATED"
+            if max_chars is not None and len(item["chunk_text"]) > max_chars:
+                item["chunk_text"] = item["chunk_text"][:max_chars] + "\n[...] TRUNCATED"
+
+            item["content_hash"] = content_hash(item["chunk_text"])
+            item["chunk_id"] = generate_chunk_id(item["chunk_text"], file_path, symbol)
 
             normalized.append(item)
 
@@ -127,7 +177,7 @@ def normalize_chunks(raw_chunks: List[Dict]) -> List[Dict]:
 # COMPAT WRAPPER
 # ---------------------------------------------------
 
-def normalize_chunk(c: Dict):
+def normalize_chunk(c: Dict, max_chars: Optional[int] = MAX_CHUNK_CHARS):
     """Normalize a single chunk dict."""
-    result = normalize_chunks([c])
+    result = normalize_chunks([c], max_chars)
     return result[0] if result else None
\ No newline at end of file
@@ -1,18 +1,29 @@
 import json
+import os
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
 
-from editerra_racag.chunking.code_chunker import extract_code_chunks
+from editerra_racag.chunking.balancer import ChunkBudget, iter_balanced_chunks
+from editerra_racag.chunking.chunk_cache import ChunkCache
+from editerra_racag.chunking.code_chunker import extract_code_chunks, has_code_chunker
 from editerra_racag.chunking.markdown_chunker import chunk_markdown
-from editerra_racag.chunking.json_chunker import chunk_json
-from editerra_racag.chunking.normalize import normalize_chunk
+from editerra_racag.chunking.json_chunker import iter_json_chunks
+from editerra_racag.chunking.normalize import iter_assign_chunk_ids, normalize_chunk
+from editerra_racag.file_inventory import FileEntry, iter_repo_files
+
+# Bump whenever a chunker's output changes so cached chunk lists are discarded.
+CHUNKER_VERSION = "5"
 
 # ============================================================
 # OPTION B — SMART PROJECT‑LEVEL FILTER
 # ============================================================
 
 ALLOWED_EXTS = {
-    ".py", ".swift", ".md", ".json", ".ts", ".js", ".yaml", ".yml", ".sh", ".txt"
+    ".py", ".swift", ".md", ".json", ".ts", ".tsx", ".js", ".jsx", ".kt", ".java",
+    ".yaml", ".yml", ".sh", ".txt"
 }
 
 EXCLUDED_DIRS = {
@@ -28,7 +39,10 @@ EXCLUDED_DIRS = {
     "Tools", "plugins", ".cache", ".mypy_cache", ".pytest_cache",
 
     # Very large vendor deps
-    "tree_sitter_languages"
+    "tree_sitter_languages",
+
+    # Our own index, cache and output
+    ".editerra-racag"
 }
 
 EXCLUDED_FILE_PATTERNS = {
@@ -80,7 +94,9 @@ def validate_chunk(chunk: dict) -> dict | None:
         "file_path": "unknown",
         "start_line": 0,
         "end_line": 0,
-        "tags": []
+        "tags": [],
+        "symbol": "",
+        "content_hash": ""
     }
 
     fixed = {k: chunk.get(k, v) for k, v in required.items()}
@@ -89,87 +105,326 @@ def validate_chunk(chunk: dict) -> dict | None:
 
 # ============================================================
 
-def run_chunkers(repo_root: Path):
+def _raw_chunks(path: Path) -> Iterable[dict]:
+    """The chunker output for one file (lazy for JSON)."""
+    # Languages with a tree-sitter grammar are chunked per declaration;
+    # the grammar is loaded the first time this process sees the language.
+    if has_code_chunker(path.suffix):
+        return extract_code_chunks(str(path))
+    if path.suffix == ".md":
+        return chunk_markdown(str(path))
+    if path.suffix == ".json":
+        return iter_json_chunks(str(path))
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    return [{
+        "chunk_id": f"{path.name}::all",
+        "chunk_text": text,
+        "start_line": 0,
+        "end_line": len(text.splitlines()),
+        "file_path": str(path),
+        "symbol": "(file)"
+    }]
+
+
+def iter_file_chunks(path: Path, budget: Optional[ChunkBudget] = None) -> Iterator[dict]:
+    """
+    Chunk, normalize and validate a single file, one chunk at a time.
+
+    Args:
+        path: File to chunk
+        budget: Token window to balance the file's chunks towards (None keeps
+            the chunkers' own boundaries and truncates overlong chunks)
+
+    Yields:
+        Validated chunks, in document order
+
+    Raises:
+        Whatever the chunker raises, possibly after some chunks were yielded
+    """
+    chunks = _raw_chunks(path)
+    if budget is None:
+        normalized = (normalize_chunk(c) for c in chunks)
+    else:
+        normalized = (n for n in (normalize_chunk(c, max_chars=None) for c in chunks) if n)
+        normalized = iter_balanced_chunks(normalized, budget)
+    # Content-addressed IDs, unique within the file
+    for norm in iter_assign_chunk_ids(n for n in normalized if n):
+        validated = validate_chunk(norm)
+        if validated:
+            yield validated
+
+
+def chunk_file(path: Path, budget: Optional[ChunkBudget] = None) -> Tuple[List[dict], Optional[str]]:
+    """
+    Chunk, normalize and validate a single file.
+
+    Runs in the parent process for sequential runs and inside pool workers
+    for parallel runs, so errors are returned rather than printed.
+
+    Args:
+        path: File to chunk
+        budget: Token window to balance the file's chunks towards (None keeps
+            the chunkers' own boundaries and truncates overlong chunks)
+
+    Returns:
+        (validated chunks, error message or None)
+    """
+    try:
+        return list(iter_file_chunks(path, budget)), None
+    except Exception as e:
+        return [], f"{path}: {e}"
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Map the --jobs setting to a worker count (0 or less = all cores)."""
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _chunk_files(
+    paths: List[Path],
+    budget: Optional[ChunkBudget] = None
+) -> List[Tuple[List[dict], Optional[str]]]:
+    """Pool task: chunk a small batch of files (amortizes IPC overhead)."""
+    return [chunk_file(path, budget) for path in paths]
+
+
+# Files per pool task, and pool tasks in flight per worker
+_TASK_BATCH = 16
+_TASKS_PER_WORKER = 4
+
+# JSON files from this size on are chunked lazily in the parent process and
+# written straight through, never held as one list (pool result or cache row)
+STREAM_JSON_BYTES = 8 * 1024 * 1024
+
+# Where a file's chunks came from
+_CHUNKED, _CACHED, _STREAMED = "chunked", "cached", "streamed"
+
+
+def _streams(entry: FileEntry) -> bool:
+    return entry.path.suffix == ".json" and entry.size >= STREAM_JSON_BYTES
+
+
+def _iter_file_results(
+    entries: Iterable[FileEntry],
+    jobs: int,
+    cache: Optional[ChunkCache] = None,
+    budget: Optional[ChunkBudget] = None
+) -> Iterator[Tuple[FileEntry, Iterable[dict], Optional[str], str]]:
+    """
+    Yield (entry, chunks, error, source) for every file, in discovery order.
+
+    Cache hits are served directly; misses are chunked in-process or, with
+    jobs > 1, on a process pool. Large JSON files are returned as a lazy
+    iterator (source _STREAMED) that the caller consumes. Only a bounded
+    window of files is in flight at any time, so memory use does not grow
+    with the size of the repo.
+    """
+    pool = None
+    if jobs > 1:
+        # Workers build their tree-sitter parsers lazily, once per language.
+        pool = ProcessPoolExecutor(max_workers=jobs)
+    window = jobs * _TASK_BATCH * _TASKS_PER_WORKER
+
+    # Each pending item is [entry, cached chunks or None, slot]; a slot is
+    # filled with (future, index) once the file's batch has been submitted,
+    # and is None for streamed files.
+    pending = deque()
+    batch: List[Tuple[FileEntry, list]] = []
+
+    def submit_batch():
+        if batch:
+            future = pool.submit(_chunk_files, [e.path for e, _ in batch], budget)
+            for i, (_, slot) in enumerate(batch):
+                slot.extend((future, i))
+            batch.clear()
+
+    def resolve(item):
+        entry, cached, slot = item
+        if cached is not None:
+            return entry, cached, None, _CACHED
+        if slot is None:
+            return entry, iter_file_chunks(entry.path, budget), None, _STREAMED
+        if pool is None:
+            chunks, error = chunk_file(entry.path, budget)
+        else:
+            if not slot:
+                submit_batch()
+            future, i = slot
+            # Waiting in submission order keeps the output deterministic
+            # regardless of which worker finishes first.
+            chunks, error = future.result()[i]
+        return entry, chunks, error, _CHUNKED
+
+    try:
+        for entry in entries:
+            if _streams(entry):
+                pending.append((entry, None, None))
+                continue
+            cached = None
+            if cache is not None:
+                cached = cache.get(entry.rel_path, entry.mtime_ns, entry.size)
+            slot: list = []
+            pending.append((entry, cached, slot))
+            if cached is None and pool is not None:
+                batch.append((entry, slot))
+                if len(batch) >= _TASK_BATCH:
+                    submit_batch()
+            while len(pending) > window:
+                yield resolve(pending.popleft())
+
+        while pending:
+            yield resolve(pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_chunks(
+    repo_root: Path,
+    jobs: Optional[int] = 1,
+    cache: Optional[ChunkCache] = None,
+    discovery: str = "auto",
+    errors: Optional[List[str]] = None,
+    budget: Optional[ChunkBudget] = None
+) -> Iterator[dict]:
+    """
+    Stream the validated chunks of every eligible file under repo_root.
+
+    Args:
+        repo_root: Repository root to scan
+        jobs: Number of worker processes (1 = in-process, 0 = all cores)
+        cache: Optional chunk cache; unchanged files are served from it and
+            freshly chunked files are written back
+        discovery: File discovery mode ("auto", "git" or "walk"), see
+            file_inventory.iter_repo_files
+        errors: Optional list that collects per-file error messages
+        budget: Optional token window; each file's chunks are merged/split
+            towards it (see chunking/balancer.py)
+
+    Yields:
+        Chunk dicts in deterministic (discovery) order
+    """
+    jobs = resolve_jobs(jobs)
+    if errors is None:
+        errors = []
+
     safe_print("🚀 RACAG chunking pipeline running")
     safe_print(f"📂 Repository: {repo_root}")
-
-    all_chunks = []
-    error_log = []
+    if jobs > 1:
+        safe_print(f"🧵 Worker processes: {jobs}")
 
     scanned = 0
+    total_chunks = 0
+    seen: Set[str] = set()
     start = time.time()
 
-    for path in repo_root.rglob("*"):
-        if not should_process(path):
-            continue
+    # Discovery prunes excluded and ignored directories up front and
+    # already carries size/mtime for the cache lookup.
+    files = iter_repo_files(repo_root, discovery, EXCLUDED_DIRS, ALLOWED_EXTS, EXCLUDED_FILE_PATTERNS)
 
+    for entry, chunks, error, source in _iter_file_results(files, jobs, cache, budget):
+        seen.add(entry.rel_path)
         scanned += 1
         if scanned % 200 == 0:
             safe_print(f"   → Scanned {scanned:,} files...")
 
-        try:
-            if path.suffix == ".swift":
-                chunks = extract_code_chunks(str(path))
-            elif path.suffix == ".md":
-                chunks = chunk_markdown(str(path))
-            elif path.suffix == ".json":
-                chunks = chunk_json(str(path))
-            else:
-                text = path.read_text(encoding="utf-8", errors="ignore")
-                chunks = [{
-                    "chunk_id": f"{path.name}::all",
-                    "chunk_text": text,
-                    "start_line": 0,
-                    "end_line": len(text.splitlines()),
-                    "file_path": str(path)
-                }]
-        except Exception as e:
-            msg = f"{path}: {e}"
-            safe_print(f"⚠️ Error chunking {msg}")
-            error_log.append(msg)
+        if source == _STREAMED:
+            # Written through as they are produced; not cached
+            try:
+                for chunk in chunks:
+                    total_chunks += 1
+                    yield chunk
+            except Exception as e:
+                error = f"{entry.path}: {e}"
+        if error:
+            safe_print(f"⚠️ Error chunking {error}")
+            errors.append(error)
+            continue
+        if source == _STREAMED:
             continue
 
-        for c in chunks:
-            norm = normalize_chunk(c)
-            validated = validate_chunk(norm)
-            if validated:
-                all_chunks.append(validated)
+        if cache is not None and source == _CHUNKED:
+            cache.put(entry.rel_path, entry.mtime_ns, entry.size, chunks)
+
+        total_chunks += len(chunks)
+        yield from chunks
+
+    if cache is not None:
+        removed = cache.prune(seen)
+        cache.commit()
+        safe_print(f"🗃 Chunk cache: {cache.hits:,} hits, {cache.misses:,} misses, {removed:,} pruned")
 
     elapsed = time.time() - start
     safe_print(f"⏱ Total scan time: {elapsed:.2f}s")
-    safe_print(f"🔢 Total chunk count: {len(all_chunks):,}")
-    safe_print(f"❗ Errors encountered: {len(error_log)}")
+    safe_print(f"🔢 Total chunk count: {total_chunks:,}")
+    safe_print(f"❗ Errors encountered: {len(errors)}")
+
+
+def run_chunkers(
+    repo_root: Path,
+    jobs: Optional[int] = 1,
+    cache: Optional[ChunkCache] = None,
+    discovery: str = "auto",
+    budget: Optional[ChunkBudget] = None
+):
+    """
+    Chunk every eligible file under repo_root into an in-memory list.
+
+    Prefer iter_chunks() + write_outputs() for large repositories.
 
+    Returns:
+        (all_chunks, error_log)
+    """
+    error_log: List[str] = []
+    all_chunks = list(iter_chunks(repo_root, jobs, cache, discovery, error_log, budget))
     return all_chunks, error_log
 
 
 # ============================================================
 
-def save_outputs(chunks, errors, out_dir: Path = None):
-    chunks = [c for c in chunks if c is not None]
+def write_outputs(chunks: Iterable[dict], errors: List[str], out_dir: Path = None) -> dict:
+    """
+    Stream chunks into chunks.jsonl and write meta_summary.json / errors.jsonl.
 
+    Chunks are serialized as they arrive and the summary counters are updated
+    on the fly, so memory stays flat however many chunks there are. `errors`
+    is read only after `chunks` is exhausted, so it may be filled by the
+    generator that produces them.
+
+    Returns:
+        The summary written to meta_summary.json
+    """
     if out_dir is None:
         out_dir = Path(".editerra-racag/output")
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Save chunks.jsonl
-    chunks_path = out_dir / "chunks.jsonl"
-    with open(chunks_path, "w", encoding="utf-8") as f:
-        for c in chunks:
-            f.write(json.dumps(c, ensure_ascii=False) + "\n")
-
-    # Summary
     meta = {
-        "total_chunks": len(chunks),
+        "total_chunks": 0,
         "languages": {},
         "frameworks": {}
     }
+    languages = meta["languages"]
+    frameworks = meta["frameworks"]
+
+    # Save chunks.jsonl (atomically, so readers never see a partial file)
+    chunks_path = out_dir / "chunks.jsonl"
+    tmp_path = out_dir / "chunks.jsonl.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for c in chunks:
+            if c is None:
+                continue
+            f.write(json.dumps(c, ensure_ascii=False) + "\n")
 
-    for c in chunks:
-        lang = c.get("language", "unknown")
-        fw = c.get("framework", "unknown")
-        meta["languages"][lang] = meta["languages"].get(lang, 0) + 1
-        meta["frameworks"][fw] = meta["frameworks"].get(fw, 0) + 1
+            meta["total_chunks"] += 1
+            lang = c.get("language", "unknown")
+            fw = c.get("framework", "unknown")
+            languages[lang] = languages.get(lang, 0) + 1
+            frameworks[fw] = frameworks.get(fw, 0) + 1
+    os.replace(tmp_path, chunks_path)
 
     meta_path = out_dir / "meta_summary.json"
     with open(meta_path, "w", encoding="utf-8") as f:
@@ -185,16 +440,36 @@ def save_outputs(chunks, errors, out_dir: Path = None):
     safe_print(f"📊 Summary:      {meta_path}")
     safe_print(f"⚠️ Error log:     {err_path}")
 
+    return meta
+
+
+def save_outputs(chunks, errors, out_dir: Path = None):
+    """Compatibility wrapper around write_outputs() for in-memory chunk lists."""
+    write_outputs(chunks, errors, out_dir)
+
 
 # ============================================================
 
-def run_chunking_pipeline(workspace_root: str, output_dir: str) -> dict:
+def run_chunking_pipeline(
+    workspace_root: str,
+    output_dir: str,
+    jobs: Optional[int] = 1,
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True,
+    discovery: str = "auto",
+    budget: Optional[ChunkBudget] = None
+) -> dict:
     """
     Main entry point for chunking pipeline (used by EditerraEngine).
     
     Args:
         workspace_root: Path to workspace root
         output_dir: Path to output directory
+        jobs: Number of chunking worker processes (1 = in-process, 0 = all cores)
+        cache_dir: Directory for the persistent chunk cache (None disables it)
+        use_cache: If False, ignore cached entries but still refresh the cache
+        discovery: File discovery mode ("auto", "git" or "walk")
+        budget: Optional token window chunks are balanced towards
     
     Returns:
         Statistics about chunking operation
@@ -202,19 +477,45 @@ def run_chunking_pipeline(workspace_root: str, output_dir: str) -> dict:
     repo = Path(workspace_root)
     out_dir = Path(output_dir)
     
-    chunks, errors = run_chunkers(repo)
-    save_outputs(chunks, errors, out_dir)
+    cache = None
+    if cache_dir is not None:
+        # Balanced chunks depend on the budget, so it is part of the version
+        version = CHUNKER_VERSION if budget is None else f"{CHUNKER_VERSION}+{budget.key}"
+        cache = ChunkCache(Path(cache_dir), version=version, repo_root=repo)
+        if not use_cache:
+            cache.clear()
+    
+    errors: List[str] = []
+    try:
+        chunks = iter_chunks(repo, jobs=jobs, cache=cache, discovery=discovery, errors=errors, budget=budget)
+        meta = write_outputs(chunks, errors, out_dir)
+    finally:
+        if cache is not None:
+            cache.close()
     
     # Return stats
     return {
-        "total_chunks": len(chunks),
+        "total_chunks": meta["total_chunks"],
         "errors": len(errors),
+        "cached_files": cache.hits if cache is not None else 0,
         "output_dir": str(out_dir)
     }
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Chunk the repository into chunks.jsonl")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes for chunking (0 = all cores).",
+    )
+    args = parser.parse_args()
+
     repo = Path(__file__).resolve().parents[2]
-    chunks, errors = run_chunkers(repo)
-    save_outputs(chunks, errors)
+    errors = []
+    write_outputs(iter_chunks(repo, jobs=args.jobs, errors=errors), errors)
     safe_print("🎉 Chunking complete.")
@@ -38,7 +38,7 @@ def cli():
 @click.option(
     "--provider",
     "-p",
-    type=click.Choice(["openai", "ollama", "anthropic", "azure"], case_sensitive=False),
+    type=click.Choice(["openai", "ollama", "local", "anthropic", "azure"], case_sensitive=False),
     default="openai",
     help="LLM provider to use"
 )
@@ -69,6 +69,8 @@ def init(workspace: Path, provider: str):
         elif provider.lower() == "ollama":
             click.echo("  2. Install Ollama from https://ollama.ai")
             click.echo("  3. Run: ollama pull nomic-embed-text && ollama pull llama3.1:8b")
+        elif provider.lower() == "local":
+            click.echo("  2. Nothing to install: embeddings are computed offline")
         
         click.echo(f"  4. Run: editerra-racag index")
         
@@ -85,7 +87,19 @@ def init(workspace: Path, provider: str):
     default=Path.cwd(),
     help="Workspace directory"
 )
-def index(workspace: Path):
+@click.option(
+    "--jobs",
+    "-j",
+    type=int,
+    default=None,
+    help="Worker processes for chunking (0 = all cores, default: chunking_jobs from config)"
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue an interrupted embedding run where it stopped"
+)
+def index(workspace: Path, jobs: int, resume: bool):
     """
     Index the workspace (chunking + embedding).
     
@@ -106,7 +120,7 @@ def index(workspace: Path):
         
         # Run indexing
         click.echo("⚙️  Starting indexing pipeline...")
-        stats = engine.index()
+        stats = engine.index(jobs=jobs, resume=resume)
         
         # Display results
         click.echo()
@@ -116,6 +130,11 @@ def index(workspace: Path):
         click.echo(f"🔢 Total embeddings: {stats.get('embedding', {}).get('total_embedded', 0)}")
         click.echo(f"💾 Collection: {stats['collection']}")
         
+        failed = stats.get('embedding', {}).get('failed_batches', 0)
+        if failed:
+            click.echo()
+            click.echo(f"⚠️  {failed} embedding batches failed. Run: editerra-racag index --resume")
+        
     except Exception as e:
         click.echo(f"❌ Error: {e}", err=True)
         import traceback
@@ -328,6 +347,7 @@ def providers():
     providers_list = [
         ("openai", "OpenAI", "✅ Ready" if "openai" in available else "❌ Not available", "Requires API key"),
         ("ollama", "Ollama (Local)", "✅ Ready" if "ollama" in available else "❌ Not available", "Free, requires Ollama installation"),
+        ("local", "Local hashing (offline)", "✅ Ready" if "local" in available else "❌ Not available", "Free, deterministic, lexical matching only"),
         ("anthropic", "Anthropic Claude", "🚧 Coming Soon", "Requires API key"),
         ("azure", "Azure OpenAI", "🚧 Coming Soon", "Enterprise"),
         ("vertex", "Google Vertex AI", "🚧 Coming Soon", "Requires GCP"),
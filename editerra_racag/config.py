@@ -23,6 +23,12 @@ DEFAULT_CONFIG = {
     "output_path": ".editerra-racag/output",
     "cache_path": ".editerra-racag/cache",
     
+    # Vector store: "chroma" (persistent ChromaDB) or "flat" (in-process exact
+    # search over a memory-mapped float32 matrix, for up to a few million chunks)
+    "vector_backend": "chroma",
+    # Concurrent queries per store; writes are always serialized on one thread
+    "store_max_readers": 4,
+    
     # Indexing settings
     "watch_enabled": True,
     "watch_paths": ["src", "lib", "app"],
@@ -38,9 +44,17 @@ DEFAULT_CONFIG = {
         ".c", ".cpp", ".h", ".hpp",
         ".md", ".json", ".yaml", ".yml",
     ],
+    "chunking_jobs": 1,  # Worker processes for chunking (0 = all cores)
+    "chunk_cache": True,  # Reuse chunks of unchanged files (stored under cache_path)
+    "file_discovery": "auto",  # auto, git (git index + .gitignore), walk (directory walk)
+    "chunk_balancing": True,  # Merge small / split large chunks towards the token window below
+    "chunk_target_tokens": 400,
+    "chunk_min_tokens": 80,  # Smaller neighbouring chunks of a file are merged
+    "chunk_max_tokens": 800,  # Larger chunks are split at line boundaries
+    "chunk_overlap_tokens": 40,  # Repeated between the pieces of a split chunk
     
     # LLM Provider
-    "llm_provider": "openai",  # openai, anthropic, azure, ollama, vertex, cohere
+    "llm_provider": "openai",  # openai, anthropic, azure, ollama, local, vertex, cohere
     
     # OpenAI settings
     "openai": {
@@ -48,6 +62,10 @@ DEFAULT_CONFIG = {
         "embedding_model": "text-embedding-3-large",
         "rerank_model": "gpt-4o-mini",
         "embedding_dimensions": 1536,
+        "max_concurrency": 4,  # Embedding batches in flight
+        "requests_per_minute": 3000,  # Match your account's rate limits
+        "tokens_per_minute": 1000000,
+        "max_retries": 6,  # Per-batch retries (exponential backoff) on 429s and transient errors
     },
     
     # Anthropic settings
@@ -70,6 +88,17 @@ DEFAULT_CONFIG = {
         "base_url": "http://localhost:11434",
         "embedding_model": "nomic-embed-text",
         "rerank_model": "llama3.1:8b",
+        "max_concurrency": 2,  # Concurrent /api/embed requests (match OLLAMA_NUM_PARALLEL)
+        "max_retries": 6,
+        "keep_alive": "5m",  # How long Ollama keeps the model loaded between requests
+        "timeout": 120,  # Seconds per batched embedding request
+    },
+    
+    # Local hashing-trick embeddings (offline, deterministic, no model)
+    "local": {
+        "embedding_dimensions": 1024,
+        "ngram_max": 2,  # Word n-grams hashed alongside words and identifier parts
+        "max_concurrency": 1,
     },
     
     # Google Vertex AI settings
@@ -88,8 +117,26 @@ DEFAULT_CONFIG = {
     },
     
     # Embedding settings
-    "embedding_batch_size": 32,
-    "embedding_cache": True,
+    "embedding_batch_size": 256,  # Maximum chunks per embedding request
+    "embedding_batch_tokens": 32000,  # Token budget per embedding request
+    "embedding_max_input_tokens": None,  # Per-chunk limit (None = the model's context window)
+    "store_batch_size": 1000,  # Rows per vector-store write (embedded batches are coalesced)
+    
+    # Vector size. Prefer the provider's own `embedding_dimensions` where it
+    # supports it (OpenAI text-embedding-3: e.g. 512 or 1024); "pca" projects
+    # any provider's vectors to `projection_dimensions` with a PCA fitted at
+    # index time (its recall@10 is reported in index_stats.json).
+    "embedding_projection": None,  # None or "pca"
+    "projection_dimensions": 256,
+    "projection_sample_size": 2048,  # Chunks embedded to fit the projection
+    
+    # Quantized query index: "int8" (4x less vector memory) or "float16" (2x).
+    # Queries scan the compact codes, then rescore the top
+    # k * quantization_oversample candidates against float32 vectors on disk.
+    "vector_quantization": None,
+    "quantization_oversample": 4,
+    "embedding_cache": True,  # Reuse vectors of previously embedded text (stored under cache_path)
+    "embedding_cache_max_mb": 512,  # Least recently used vectors are evicted beyond this
     
     # Query settings
     "retrieve_k": 40,
@@ -20,11 +20,7 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple
 import re
 
-# Optional: for token estimation
-try:  # pragma: no cover - optional dependency
-    import tiktoken  # type: ignore
-except ImportError:  # pragma: no cover
-    tiktoken = None
+from editerra_racag.tokenizer import count_tokens
 
 
 # ============================================================
@@ -55,15 +51,7 @@ def estimate_tokens(text: str) -> int:
     heuristic (~4 chars per token).
     """
 
-    if tiktoken is not None:
-        try:
-            enc = tiktoken.get_encoding("cl100k_base")
-            return len(enc.encode(text))
-        except Exception:
-            # Fall back to heuristic if anything goes wrong
-            pass
-
-    return max(1, int(len(text) / 4))
+    return max(1, count_tokens(text))
 
 
 def clean_text(text: str) -> str:
@@ -1,3 +1,31 @@
-"""Database management for ChromaDB persistent storage."""
+"""Vector storage: the `VectorStore` interface and its backends."""
 
-__all__ = []
+import importlib
+
+from editerra_racag.db.base import VectorHit, VectorStore
+
+# Backend name -> "module:class"; a new backend is one more entry here
+VECTOR_BACKENDS = {
+    "chroma": "editerra_racag.db.chroma_store:ChromaStore",
+    "flat": "editerra_racag.db.flat_index:FlatStore",
+}
+
+
+def create_vector_store(db_path, collection_name: str, backend: str = "chroma", **options) -> VectorStore:
+    """
+    Open a collection with the configured backend.
+
+    Args:
+        db_path: Vector database directory
+        collection_name: Collection within it
+        backend: Key of VECTOR_BACKENDS (the `vector_backend` setting)
+        **options: Backend-specific options (e.g. `space` for Chroma)
+    """
+    if backend not in VECTOR_BACKENDS:
+        raise ValueError(f"Unknown vector backend: {backend} (expected one of {sorted(VECTOR_BACKENDS)})")
+    module_name, class_name = VECTOR_BACKENDS[backend].split(":")
+    store_class = getattr(importlib.import_module(module_name), class_name)
+    return store_class(str(db_path), collection_name, **options)
+
+
+__all__ = ["VECTOR_BACKENDS", "VectorHit", "VectorStore", "create_vector_store"]
@@ -0,0 +1,264 @@
+"""
+Vector store interface.
+
+Every read and write of embedded chunks goes through a `VectorStore`:
+the embedding pipeline, the semantic retriever, the query engine and
+index deletion. Backends are selected by the `vector_backend` setting and
+created with `editerra_racag.db.create_vector_store`, so they can be
+swapped (and benchmarked side by side) without touching callers.
+
+Query results are `VectorHit`s. `distance` is whatever the backend's
+metric returns (smaller is closer); `score` is `1 - distance`, the
+similarity the retriever has always reported.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+_PAGE_SIZE = 1000
+_DEFAULT_INCLUDE = ("documents", "metadatas")
+
+
+@dataclass
+class VectorHit:
+    """One stored chunk returned by a store."""
+
+    id: str
+    distance: Optional[float] = None
+    document: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    embedding: Optional[List[float]] = None
+
+    @property
+    def score(self) -> float:
+        return 1.0 - self.distance if self.distance is not None else 0.0
+
+
+class VectorStore(ABC):
+    """A collection of embedded chunks (id, vector, document, metadata)."""
+
+    #: Backend name, as used in the `vector_backend` setting
+    backend: str = ""
+
+    #: Whether reads may run while a write is in progress (see db.executor)
+    reads_during_writes: bool = False
+
+    def __init__(self, db_path: str, collection_name: str):
+        """
+        Args:
+            db_path: Vector database directory
+            collection_name: Collection within it
+        """
+        self.db_path = str(db_path)
+        self.collection_name = collection_name
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+
+    @abstractmethod
+    def add(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+        documents: Optional[Sequence[str]] = None,
+    ):
+        """Insert new rows."""
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+        documents: Optional[Sequence[str]] = None,
+    ):
+        """Insert rows, replacing existing ids."""
+
+    @abstractmethod
+    def update(self, ids: Sequence[str], metadatas: Sequence[Dict[str, Any]]):
+        """Replace the metadata of existing rows (vectors are unchanged)."""
+
+    @abstractmethod
+    def delete(self, ids: Sequence[str]):
+        """Remove rows by id (unknown ids are ignored)."""
+
+    @abstractmethod
+    def reset(self):
+        """Drop every row, e.g. when the embedding dimensionality changed."""
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored rows."""
+
+    @abstractmethod
+    def get(self, ids: Sequence[str], include: Sequence[str] = _DEFAULT_INCLUDE) -> List[VectorHit]:
+        """
+        Rows by id, in the given order (missing ids are skipped).
+
+        Args:
+            ids: Ids to fetch
+            include: Any of "documents", "metadatas", "embeddings"
+        """
+
+    @abstractmethod
+    def batch_query(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        k: int,
+        include: Sequence[str] = _DEFAULT_INCLUDE,
+    ) -> List[List[VectorHit]]:
+        """
+        Nearest neighbours of several query vectors at once.
+
+        Args:
+            embeddings: Query vectors
+            k: Neighbours per query
+            include: Any of "documents", "metadatas", "embeddings"
+                (distances are always returned)
+
+        Returns:
+            One list of hits per query, closest first
+        """
+
+    def query(
+        self,
+        embedding: Sequence[float],
+        k: int,
+        include: Sequence[str] = _DEFAULT_INCLUDE,
+    ) -> List[VectorHit]:
+        """Nearest neighbours of one query vector, closest first."""
+        return self.batch_query([embedding], k, include)[0]
+
+    @abstractmethod
+    def snapshot(
+        self,
+        include: Sequence[str] = ("metadatas",),
+        page_size: int = _PAGE_SIZE,
+    ) -> Iterator[List[VectorHit]]:
+        """
+        Page through every stored row (used to rebuild local indexes and to
+        copy a collection between backends).
+        """
+
+    def dimensions(self) -> int:
+        """Dimensionality of the stored vectors (0 when empty)."""
+        for page in self.snapshot(include=("embeddings",), page_size=1):
+            if page and page[0].embedding is not None:
+                return len(page[0].embedding)
+        return 0
+
+    def close(self):
+        """Release resources held by the store."""
+
+    def __enter__(self) -> "VectorStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CollectionStore(VectorStore):
+    """
+    Store backed by an object with the Chroma collection API.
+
+    Subclasses provide the client (anything with `get_or_create_collection`
+    and `delete_collection`); results are converted to `VectorHit`s here.
+    """
+
+    def __init__(self, db_path: str, collection_name: str):
+        super().__init__(db_path, collection_name)
+        self.client = self._open_client()
+        self.collection = self._open_collection()
+
+    @abstractmethod
+    def _open_client(self):
+        """Client owning the collection."""
+
+    def _open_collection(self):
+        return self.client.get_or_create_collection(name=self.collection_name)
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+
+    def add(self, ids, embeddings, metadatas=None, documents=None):
+        self.collection.add(ids=list(ids), embeddings=list(embeddings), metadatas=metadatas, documents=documents)
+
+    def upsert(self, ids, embeddings, metadatas=None, documents=None):
+        self.collection.upsert(ids=list(ids), embeddings=list(embeddings), metadatas=metadatas, documents=documents)
+
+    def update(self, ids, metadatas):
+        self.collection.update(ids=list(ids), metadatas=list(metadatas))
+
+    def delete(self, ids):
+        if len(ids):
+            self.collection.delete(ids=list(ids))
+
+    def reset(self):
+        self.client.delete_collection(name=self.collection_name)
+        self.collection = self._open_collection()
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    @staticmethod
+    def _hits(result: Dict[str, Any], include: Sequence[str], distances=None) -> List[VectorHit]:
+        ids = result.get("ids") or []
+        documents = result.get("documents") if "documents" in include else None
+        metadatas = result.get("metadatas") if "metadatas" in include else None
+        embeddings = result.get("embeddings") if "embeddings" in include else None
+        return [
+            VectorHit(
+                id=cid,
+                distance=float(distances[i]) if distances is not None else None,
+                document=documents[i] if documents is not None else None,
+                metadata=(metadatas[i] or {}) if metadatas is not None else {},
+                embedding=list(embeddings[i]) if embeddings is not None else None,
+            )
+            for i, cid in enumerate(ids)
+        ]
+
+    def get(self, ids, include=_DEFAULT_INCLUDE):
+        if not len(ids):
+            return []
+        result = self.collection.get(ids=list(ids), include=list(include))
+        by_id = {hit.id: hit for hit in self._hits(result, include)}
+        return [by_id[cid] for cid in ids if cid in by_id]
+
+    def batch_query(self, embeddings, k, include=_DEFAULT_INCLUDE):
+        if not len(embeddings):
+            return []
+        result = self.collection.query(
+            query_embeddings=[list(e) for e in embeddings],
+            n_results=k,
+            include=[*include, "distances"],
+        )
+        hits = []
+        for i in range(len(embeddings)):
+            per_query = {
+                key: (result.get(key) or [[]] * len(embeddings))[i]
+                for key in ("ids", "documents", "metadatas", "embeddings")
+                if result.get(key) is not None
+            }
+            hits.append(self._hits(per_query, include, result["distances"][i]))
+        return hits
+
+    def snapshot(self, include=("metadatas",), page_size=_PAGE_SIZE):
+        total = self.count()
+        for offset in range(0, total, page_size):
+            page = self.collection.get(include=list(include), limit=page_size, offset=offset)
+            if page.get("ids"):
+                yield self._hits(page, include)
@@ -0,0 +1,36 @@
+"""ChromaDB implementation of the vector store interface."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from editerra_racag.db.base import CollectionStore
+
+
+class ChromaStore(CollectionStore):
+    """Collection in a persistent ChromaDB database."""
+
+    backend = "chroma"
+
+    def __init__(self, db_path: str, collection_name: str, space: Optional[str] = None):
+        """
+        Args:
+            db_path: ChromaDB directory
+            collection_name: Collection within it
+            space: HNSW distance ("l2", "cosine", "ip") for a newly created
+                collection (None = Chroma's default, l2)
+        """
+        self.space = space
+        super().__init__(db_path, collection_name)
+
+    def _open_client(self):
+        import chromadb
+        from chromadb.config import Settings
+        return chromadb.PersistentClient(path=self.db_path, settings=Settings(anonymized_telemetry=False))
+
+    def _open_collection(self):
+        if self.space:
+            return self.client.get_or_create_collection(
+                name=self.collection_name, metadata={"hnsw:space": self.space}
+            )
+        return self.client.get_or_create_collection(name=self.collection_name)
@@ -0,0 +1,308 @@
+"""
+Single-writer, multi-reader access to a vector store.
+
+ChromaDB 0.4 is not safe under concurrent operations (newer releases
+segfault outright, hence the pin), yet the API server, the indexer and
+the watcher's reindex runs can all reach the same database at once.
+`StoreExecutor` enforces one discipline for every store:
+
+- writes run one at a time, in submission order, on a single writer thread
+- reads run on a bounded pool of reader threads; callers block (back
+  pressure) once too many reads are pending
+- for stores that cannot read during a write (Chroma), a readers-writer
+  lock keeps reads and writes apart, and is mirrored by `flock`s on
+  `<db_path>/.store.lock` so a write in another process (a reindex
+  started by the watcher) also waits for in-flight queries, and vice versa;
+  stores that can (the flat backend) only exclude readers for `reset`
+
+`SerializedStore` wraps a store so that each of its calls goes through
+an executor; the store registry hands these out, so callers keep using
+the plain `VectorStore` interface.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from editerra_racag.db.base import VectorStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_READERS = 4
+LOCK_FILENAME = ".store.lock"
+# Held by a process that is about to write; readers pass through it
+INTENT_FILENAME = ".store.intent"
+
+# Pending reads allowed per reader thread before callers block
+_PENDING_PER_READER = 16
+
+
+class _ReadWriteLock:
+    """
+    Shared reads, exclusive writes; a waiting writer holds back new readers.
+
+    With a lock file, the lock also holds across processes. Every read and
+    write takes its own `flock` through a per-thread file handle (locks of
+    one handle would be shared by all threads). A writer first takes the
+    intent file exclusively, then the lock file; readers take the intent
+    file shared just long enough to get the lock file shared, so no new
+    reader gets in while another process's writer is waiting.
+    """
+
+    def __init__(self, lock_path: Optional[Path] = None):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+        self._lock_path = None
+        if lock_path is not None and fcntl is not None:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            self._lock_path = lock_path
+            self._intent_path = lock_path.with_name(INTENT_FILENAME)
+        self._local = threading.local()
+        self._handles = []
+        self._handles_lock = threading.Lock()
+
+    def _files(self):
+        """This thread's (intent, lock) file handles."""
+        files = getattr(self._local, "files", None)
+        if files is None:
+            files = (open(self._intent_path, "a+"), open(self._lock_path, "a+"))
+            self._local.files = files
+            with self._handles_lock:
+                self._handles.extend(files)
+        return files
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        if self._lock_path is not None:
+            intent, lock = self._files()
+            try:
+                fcntl.flock(intent, fcntl.LOCK_SH)
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_SH)
+                finally:
+                    fcntl.flock(intent, fcntl.LOCK_UN)
+            except BaseException:
+                self._leave_read()
+                raise
+
+    def release_read(self):
+        if self._lock_path is not None:
+            fcntl.flock(self._files()[1], fcntl.LOCK_UN)
+        self._leave_read()
+
+    def _leave_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        if self._lock_path is not None:
+            intent, lock = self._files()
+            try:
+                fcntl.flock(intent, fcntl.LOCK_EX)
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                finally:
+                    fcntl.flock(intent, fcntl.LOCK_UN)
+            except BaseException:
+                self._leave_write()
+                raise
+
+    def release_write(self):
+        if self._lock_path is not None:
+            fcntl.flock(self._files()[1], fcntl.LOCK_UN)
+        self._leave_write()
+
+    def _leave_write(self):
+        with self._cond:
+            self._writing = False
+            self._cond.notify_all()
+
+    def close(self):
+        with self._handles_lock:
+            handles, self._handles = self._handles, []
+        for handle in handles:
+            handle.close()
+
+
+class StoreExecutor:
+    """One writer thread and a bounded reader pool in front of a store."""
+
+    def __init__(self, store: VectorStore, max_readers: int = DEFAULT_MAX_READERS):
+        """
+        Args:
+            store: Store to guard
+            max_readers: Reader threads (concurrent queries)
+        """
+        self.store = store
+        self.max_readers = max(1, max_readers)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store-writer")
+        self._readers = ThreadPoolExecutor(max_workers=self.max_readers, thread_name_prefix="store-reader")
+        self._pending = threading.BoundedSemaphore(self.max_readers * _PENDING_PER_READER)
+        self._shared_writes = store.reads_during_writes
+        lock_path = None if self._shared_writes else Path(store.db_path) / LOCK_FILENAME
+        self._lock = _ReadWriteLock(lock_path)
+        # Marks the executor's own threads, whose nested calls run inline
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.reads = 0
+        self.writes = 0
+
+    # ------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------
+
+    def _run_read(self, fn: Callable, args, kwargs):
+        self._local.active = True
+        self._lock.acquire_read()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._lock.release_read()
+            self._local.active = False
+
+    def _run_write(self, fn: Callable, args, kwargs, exclusive: bool):
+        self._local.active = True
+        locked = exclusive or not self._shared_writes
+        if locked:
+            self._lock.acquire_write()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if locked:
+                self._lock.release_write()
+            self._local.active = False
+
+    def submit_read(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run `fn(*args, **kwargs)` on the reader pool."""
+        self._pending.acquire()  # blocks while the pool is saturated
+        try:
+            future = self._readers.submit(self._run_read, fn, args, kwargs)
+        except BaseException:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        with self._stats_lock:
+            self.reads += 1
+        return future
+
+    def submit_write(self, fn: Callable, *args, exclusive: bool = False, **kwargs) -> Future:
+        """
+        Queue `fn(*args, **kwargs)` for the writer thread (FIFO).
+
+        Args:
+            exclusive: Wait for in-flight reads even on stores that allow
+                reads during writes (e.g. when the collection is replaced)
+        """
+        with self._stats_lock:
+            self.writes += 1
+        return self._writer.submit(self._run_write, fn, args, kwargs, exclusive)
+
+    def read(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a read and wait for its result."""
+        if getattr(self._local, "active", False):
+            return fn(*args, **kwargs)
+        return self.submit_read(fn, *args, **kwargs).result()
+
+    def write(self, fn: Callable, *args, exclusive: bool = False, **kwargs) -> Any:
+        """Run a write and wait for it to be applied."""
+        if getattr(self._local, "active", False):
+            return fn(*args, **kwargs)
+        return self.submit_write(fn, *args, exclusive=exclusive, **kwargs).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            reads, writes = self.reads, self.writes
+        return {
+            "max_readers": self.max_readers,
+            "reads": reads,
+            "writes": writes,
+            "exclusive_writes": not self._shared_writes,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Finish queued writes (and reads), then stop the threads."""
+        self._writer.shutdown(wait=wait)
+        self._readers.shutdown(wait=wait)
+        self._lock.close()
+
+
+class SerializedStore(VectorStore):
+    """A store whose every call goes through a `StoreExecutor`."""
+
+    def __init__(self, executor: StoreExecutor):
+        inner = executor.store
+        super().__init__(inner.db_path, inner.collection_name)
+        self.executor = executor
+        self.inner = inner
+        self.backend = inner.backend
+        self.reads_during_writes = inner.reads_during_writes
+
+    # ------------------------------------------------------------
+    # Writing (writer thread)
+    # ------------------------------------------------------------
+
+    def add(self, ids, embeddings, metadatas=None, documents=None):
+        self.executor.write(self.inner.add, ids, embeddings, metadatas, documents)
+
+    def upsert(self, ids, embeddings, metadatas=None, documents=None):
+        self.executor.write(self.inner.upsert, ids, embeddings, metadatas, documents)
+
+    def update(self, ids, metadatas):
+        self.executor.write(self.inner.update, ids, metadatas)
+
+    def delete(self, ids):
+        self.executor.write(self.inner.delete, ids)
+
+    def reset(self):
+        self.executor.write(self.inner.reset, exclusive=True)
+
+    # ------------------------------------------------------------
+    # Reading (reader pool)
+    # ------------------------------------------------------------
+
+    def count(self):
+        return self.executor.read(self.inner.count)
+
+    def get(self, ids, include=("documents", "metadatas")):
+        return self.executor.read(self.inner.get, ids, include)
+
+    def batch_query(self, embeddings, k, include=("documents", "metadatas")):
+        return self.executor.read(self.inner.batch_query, embeddings, k, include)
+
+    def snapshot(self, include=("metadatas",), page_size=1000):
+        pages = self.inner.snapshot(include, page_size)
+        # Each page is fetched as its own read, so writes can interleave
+        while True:
+            page = self.executor.read(next, pages, None)
+            if page is None:
+                return
+            yield page
+
+    def dimensions(self):
+        return self.executor.read(self.inner.dimensions)
+
+    def close(self):
+        self.executor.shutdown()
+        self.inner.close()
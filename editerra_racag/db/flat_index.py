@@ -0,0 +1,425 @@
+"""
+In-process flat (brute-force) vector index.
+
+For collections up to a few million chunks an exact scan is fast enough,
+and cheaper than Chroma's per-query overhead: every query is one
+`matrix @ q` over pre-normalized float32 vectors plus an `argpartition`.
+There is no server, no HNSW graph to maintain, and reads from several
+threads are safe.
+
+A collection is a directory holding:
+
+- `vectors.npy`: float32 unit vectors, memory-mapped (the page cache keeps
+  hot rows in memory), grown by doubling. Rows are append-only: a replaced
+  vector goes to a new row and the old one is marked dead, so a query can
+  scan the rows that existed when it started without holding the lock
+- `store.sqlite`: row number, id, document and JSON metadata per chunk
+
+`FlatCollection` answers the Chroma collection calls (`count`, `add`,
+`upsert`, `update`, `delete`, `get`, `query`) and `FlatClient` the client
+calls, so `FlatStore` shares the Chroma adapter of `CollectionStore`. It is
+selected with `vector_backend: flat`. Query distances are cosine distances
+(1 - cosine similarity).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from editerra_racag.db.base import CollectionStore
+from editerra_racag.db.quantization import normalize
+
+logger = logging.getLogger(__name__)
+
+STORE_FILENAME = "store.sqlite"
+VECTORS_FILENAME = "vectors.npy"
+
+# Compact once this share of rows are dead (deleted or replaced)
+_COMPACT_RATIO = 0.25
+_MIN_CAPACITY = 1024
+_DEFAULT_GET_INCLUDE = ("metadatas", "documents")
+_DEFAULT_QUERY_INCLUDE = ("metadatas", "documents", "distances")
+
+
+class FlatCollection:
+    """Exact-search collection over a memory-mapped float32 matrix."""
+
+    def __init__(self, directory: Path, name: Optional[str] = None):
+        """
+        Open (or create) a collection directory.
+
+        Args:
+            directory: Where the collection files live
+            name: Collection name (defaults to the directory name)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.name = name or self.directory.name
+
+        self._lock = threading.RLock()
+        # Written by the store writer thread, read by request threads
+        self._conn = sqlite3.connect(str(self.directory / STORE_FILENAME), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rows (
+                row INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                document TEXT,
+                metadata TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._load()
+
+    # ------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / VECTORS_FILENAME
+
+    def _load(self):
+        """Read ids and map the vectors (also after another process wrote)."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dims'").fetchone()
+        self.dims = int(row[0]) if row else 0
+        (n,) = self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM rows").fetchone()
+        self._ids: List[Optional[str]] = [None] * n
+        for r, cid in self._conn.execute("SELECT row, id FROM rows"):
+            self._ids[r] = cid
+        self._rows: Dict[str, int] = {cid: r for r, cid in enumerate(self._ids) if cid is not None}
+        self._vectors: Optional[np.memmap] = None
+        self._live = np.zeros(0, dtype=bool)
+        if self._vectors_path.exists():
+            self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+            self._live = np.zeros(len(self._vectors), dtype=bool)
+            self._live[:n] = [cid is not None for cid in self._ids]
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _refresh(self):
+        # data_version only changes when another connection committed
+        (version,) = self._conn.execute("PRAGMA data_version").fetchone()
+        if version != self._data_version:
+            self._load()
+
+    def _commit(self):
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._conn.commit()
+
+    def _reserve(self, rows: int):
+        """Grow the vectors file (by doubling) to hold at least `rows` rows."""
+        capacity = len(self._vectors) if self._vectors is not None else 0
+        if rows > capacity:
+            self._resize(max(rows, capacity * 2, _MIN_CAPACITY), np.arange(len(self._ids)))
+
+    def _resize(self, capacity: int, keep: np.ndarray):
+        """Rewrite the vectors file with `capacity` rows, keeping rows `keep` in order."""
+        tmp = self._vectors_path.with_name("vectors.tmp.npy")
+        grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=(capacity, self.dims))
+        if len(keep):
+            grown[:len(keep)] = self._vectors[keep]
+        grown.flush()
+        del grown
+        live = np.zeros(capacity, dtype=bool)
+        live[:len(keep)] = self._live[keep]
+        # Readers still holding the old map keep a valid (unlinked) file
+        tmp.replace(self._vectors_path)
+        self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+        self._live = live
+
+    def _place(self, ids: Sequence[str]) -> np.ndarray:
+        """Append a row for each id, retiring the row it had (see module docs)."""
+        self._reserve(len(self._ids) + len(ids))
+        rows = []
+        for cid in ids:
+            old = self._rows.get(cid)
+            if old is not None:
+                self._ids[old] = None
+                self._live[old] = False
+            self._rows[cid] = len(self._ids)
+            rows.append(len(self._ids))
+            self._ids.append(cid)
+        return np.array(rows, dtype=np.int64)
+
+    def _maybe_compact(self):
+        n = len(self._ids)
+        if n and (n - len(self._rows)) / n > _COMPACT_RATIO:
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self._live[:len(self._ids)])
+        logger.info(f"Compacting flat index {self.name}: {len(self._ids)} -> {len(keep)} rows")
+        self._resize(max(len(keep), _MIN_CAPACITY), keep)
+        self._ids = [self._ids[r] for r in keep]
+        self._rows = {cid: r for r, cid in enumerate(self._ids)}
+        # Offset first so the new row numbers never collide with old ones
+        self._conn.execute("UPDATE rows SET row = -row - 1")
+        self._conn.executemany(
+            "UPDATE rows SET row = ? WHERE id = ?", [(r, cid) for r, cid in enumerate(self._ids)]
+        )
+
+    def clear(self):
+        """Drop every vector."""
+        with self._lock:
+            self._conn.execute("DELETE FROM rows")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.commit()
+            self._vectors = None
+            self._vectors_path.unlink(missing_ok=True)
+            self._load()
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+        documents: Optional[Sequence[str]] = None,
+    ):
+        """Insert or replace rows by id."""
+        if not len(ids):
+            return
+        matrix = normalize(embeddings)
+        metadatas = metadatas if metadatas is not None else [None] * len(ids)
+        documents = documents if documents is not None else [None] * len(ids)
+        with self._lock:
+            self._refresh()
+            if not self.dims:
+                self.dims = matrix.shape[1]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('dims', ?)", (str(self.dims),)
+                )
+            elif matrix.shape[1] != self.dims:
+                raise ValueError(f"Embedding dimension {matrix.shape[1]} != collection dimension {self.dims}")
+
+            # Last occurrence wins for ids repeated within one call
+            latest = {cid: i for i, cid in enumerate(ids)}
+            rows = self._place(list(latest))
+            self._vectors[rows] = matrix[list(latest.values())]
+            self._live[rows] = True
+            # REPLACE drops the retired row through the unique id
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rows (row, id, document, metadata) VALUES (?, ?, ?, ?)",
+                [
+                    (self._rows[cid], cid, documents[i], json.dumps(metadatas[i]) if metadatas[i] is not None else None)
+                    for cid, i in latest.items()
+                ],
+            )
+            self._maybe_compact()
+            self._commit()
+
+    add = upsert
+
+    def update(
+        self,
+        ids: Sequence[str],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None,
+        documents: Optional[Sequence[str]] = None,
+        embeddings: Optional[Sequence[Sequence[float]]] = None,
+    ):
+        """Update fields of existing rows (unknown ids are ignored)."""
+        with self._lock:
+            self._refresh()
+            known = [i for i, cid in enumerate(ids) if cid in self._rows]
+            if embeddings is not None and known:
+                rows = self._place([ids[i] for i in known])
+                self._vectors[rows] = normalize(embeddings)[known]
+                self._live[rows] = True
+                self._conn.executemany(
+                    "UPDATE rows SET row = ? WHERE id = ?",
+                    [(int(r), ids[i]) for r, i in zip(rows, known)],
+                )
+            if metadatas is not None:
+                self._conn.executemany(
+                    "UPDATE rows SET metadata = ? WHERE id = ?",
+                    [(json.dumps(metadatas[i]), ids[i]) for i in known],
+                )
+            if documents is not None:
+                self._conn.executemany(
+                    "UPDATE rows SET document = ? WHERE id = ?",
+                    [(documents[i], ids[i]) for i in known],
+                )
+            self._maybe_compact()
+            self._commit()
+
+    def delete(self, ids: Sequence[str]):
+        with self._lock:
+            self._refresh()
+            gone = [cid for cid in ids if cid in self._rows]
+            for cid in gone:
+                row = self._rows.pop(cid)
+                self._ids[row] = None
+                self._live[row] = False
+            self._conn.executemany("DELETE FROM rows WHERE id = ?", [(cid,) for cid in gone])
+            self._maybe_compact()
+            self._commit()
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def _fetch(self, ids: Sequence[str], include: Sequence[str]) -> Dict[str, List[Any]]:
+        """Documents / metadatas / embeddings of ids (which must exist), in order."""
+        result: Dict[str, List[Any]] = {"ids": list(ids)}
+        if "documents" in include or "metadatas" in include:
+            stored: Dict[str, Any] = {}
+            # Bounded IN lists keep under SQLite's variable limit
+            for start in range(0, len(ids), 500):
+                part = ids[start:start + 500]
+                marks = ",".join("?" * len(part))
+                for cid, doc, meta in self._conn.execute(
+                    f"SELECT id, document, metadata FROM rows WHERE id IN ({marks})", part
+                ):
+                    stored[cid] = (doc, json.loads(meta) if meta else None)
+            if "documents" in include:
+                result["documents"] = [stored[cid][0] for cid in ids]
+            if "metadatas" in include:
+                result["metadatas"] = [stored[cid][1] for cid in ids]
+        if "embeddings" in include:
+            result["embeddings"] = [self._vectors[self._rows[cid]].tolist() for cid in ids]
+        return result
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, List[Any]]:
+        """Rows by id, or a page of all rows in storage order."""
+        include = include if include is not None else _DEFAULT_GET_INCLUDE
+        with self._lock:
+            self._refresh()
+            if ids is not None:
+                selected = [cid for cid in ids if cid in self._rows]
+            else:
+                selected = [cid for cid in self._ids if cid is not None]
+            selected = selected[offset:offset + limit] if limit is not None else selected[offset:]
+            return self._fetch(selected, include)
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 10,
+        include: Optional[Sequence[str]] = None,
+    ) -> Dict[str, List[List[Any]]]:
+        """
+        Exact nearest neighbours of each query embedding.
+
+        All queries are scored in one matrix product against the stored
+        unit vectors.
+        """
+        include = include if include is not None else _DEFAULT_QUERY_INCLUDE
+        with self._lock:
+            self._refresh()
+            n = len(self._ids)
+            live_count = len(self._rows)
+            # Rows below n are never rewritten, so they can be scanned
+            # unlocked; the live mask is copied since writers retire rows
+            vectors, live, ids = self._vectors, self._live[:n].copy(), list(self._ids)
+
+        queries = normalize(query_embeddings)
+        result: Dict[str, List[List[Any]]] = {key: [] for key in ("ids", *include)}
+        k = min(n_results, live_count)
+        if k <= 0:
+            for key in result:
+                result[key] = [[] for _ in queries]
+            return result
+
+        # Rows appended after the snapshot are beyond n and not scanned
+        scores = queries @ vectors[:n].T
+        scores[:, ~live] = -np.inf
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        for q_scores, q_top in zip(scores, top):
+            q_top = q_top[np.argsort(-q_scores[q_top])]
+            hit_ids = [ids[r] for r in q_top]
+            with self._lock:
+                fetched = self._fetch([cid for cid in hit_ids if cid in self._rows], include)
+            if len(fetched["ids"]) != len(hit_ids):
+                # Deleted while this query ran
+                found = set(fetched["ids"])
+                q_top = q_top[[i for i, cid in enumerate(hit_ids) if cid in found]]
+            result["ids"].append(fetched["ids"])
+            for key in include:
+                if key == "distances":
+                    result[key].append((1.0 - q_scores[q_top]).tolist())
+                else:
+                    result[key].append(fetched[key])
+        return result
+
+
+class FlatClient:
+    """Client for flat collections stored under one database directory."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._collections: Dict[str, FlatCollection] = {}
+        self._lock = threading.Lock()
+
+    def _directory(self, name: str) -> Path:
+        return flat_index_path(self.path, name)
+
+    def get_or_create_collection(self, name: str, **_) -> FlatCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = FlatCollection(self._directory(name), name)
+            return self._collections[name]
+
+    def get_collection(self, name: str, **_) -> FlatCollection:
+        if name not in self._collections and not (self._directory(name) / STORE_FILENAME).exists():
+            raise ValueError(f"Collection {name} does not exist.")
+        return self.get_or_create_collection(name)
+
+    def delete_collection(self, name: str):
+        with self._lock:
+            collection = self._collections.pop(name, None)
+            if collection is not None:
+                collection.close()
+            shutil.rmtree(self._directory(name), ignore_errors=True)
+
+
+def flat_index_path(db_path: Path, collection_name: str) -> Path:
+    """Directory of a flat collection."""
+    return Path(db_path) / "flat" / collection_name
+
+
+class FlatStore(CollectionStore):
+    """Vector store over a `FlatCollection`."""
+
+    backend = "flat"
+    # FlatCollection locks its own state, so queries need not wait for upserts
+    reads_during_writes = True
+
+    def _open_client(self):
+        return FlatClient(self.db_path)
+
+    def close(self):
+        self.collection.close()
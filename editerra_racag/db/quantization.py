@@ -0,0 +1,438 @@
+"""
+Scalar-quantized vector search with float32 rescoring.
+
+A `QuantizedIndex` keeps a compact copy of every stored embedding in
+memory and the full-precision vectors on disk:
+
+- int8 codes with one float32 scale per vector (4x smaller than float32)
+  or float16 codes (2x smaller)
+- float32 vectors in a memory-mapped `.npy` file, only read for the
+  candidates of a query
+
+A query scans the codes for the top `k * oversample` candidates, then
+rescores those exactly against their float32 vectors. Vectors are
+L2-normalized, so scores are cosine similarities.
+
+The index is a sidecar of a collection: it is written alongside the
+vector store and rebuilt from it whenever the two disagree.
+
+Saves are atomic for readers in other processes. Data files are
+versioned (`codes.<n>.npy`, `scales.<n>.npy`, `vectors.<n>.npy`) and
+`index.json`, written last and swapped in with one rename, names the
+files of its version. The writer never changes rows a published
+`index.json` refers to: replaced vectors are appended and the old row
+is tombstoned, and growing or compacting writes a new vectors file.
+Files no longer referenced are removed after the swap. Query-side
+instances open the index read-only.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CODECS = ("int8", "float16")
+DEFAULT_OVERSAMPLE = 4
+
+# Rows scored per block, bounding the float32 temporaries of a scan
+_BLOCK_ROWS = 2048
+# Compact on save once this share of rows are deleted
+_COMPACT_RATIO = 0.25
+_PAGE_SIZE = 1000
+# A reader racing a save may find its files already replaced; it retries
+_LOAD_ATTEMPTS = 3
+# Data files of indexes saved before files were versioned
+_LEGACY_FILES = {"vectors": "vectors.npy", "codes": "codes.npy", "scales": "scales.npy"}
+
+
+def normalize(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    """(n, d) float32 rows scaled to unit length (zero rows stay zero)."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def encode(vectors: np.ndarray, codec: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize (n, d) float32 vectors.
+
+    Returns:
+        (codes, scales): int8 codes with per-vector scale max|x| / 127, or
+        float16 codes with unit scales
+    """
+    if codec == "float16":
+        return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+    if codec != "int8":
+        raise ValueError(f"Unknown quantization codec: {codec} (expected one of {CODECS})")
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def approximate_scores(codes: np.ndarray, scales: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Dot products of a float32 query with quantized rows, scanned blockwise."""
+    scores = np.empty(len(codes), dtype=np.float32)
+    for start in range(0, len(codes), _BLOCK_ROWS):
+        block = codes[start:start + _BLOCK_ROWS].astype(np.float32)
+        scores[start:start + len(block)] = (block @ query) * scales[start:start + len(block)]
+    return scores
+
+
+class QuantizedIndex:
+    """Quantized codes in memory, float32 vectors memory-mapped for rescoring."""
+
+    def __init__(self, directory: Path, codec: str = "int8", read_only: bool = False):
+        """
+        Open (or create) an index directory.
+
+        Args:
+            directory: Where the index files live
+            codec: "int8" or "float16"; an index stored with another codec
+                is re-encoded on load
+            read_only: Map the vectors read-only and refuse writes (query
+                side); only the indexing process writes
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown quantization codec: {codec} (expected one of {CODECS})")
+        self.directory = Path(directory)
+        self.codec = codec
+        self.read_only = read_only
+        self.dims = 0
+        # Version of the saved index.json, and the writer's vectors file
+        self._version = 0
+        self._vectors_name: Optional[str] = None
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._codes: Optional[np.ndarray] = None
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        # Rows beyond len(self._ids) are spare capacity
+        self._vectors: Optional[np.memmap] = None
+        self._dirty = False
+        self._load()
+
+    # ------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / "index.json"
+
+    def _load(self):
+        for attempt in range(_LOAD_ATTEMPTS):
+            try:
+                return self._load_files()
+            except FileNotFoundError:
+                if attempt == _LOAD_ATTEMPTS - 1:
+                    raise
+                time.sleep(0.05)
+
+    def _load_files(self):
+        if not self._meta_path.exists():
+            return
+        meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+        files = meta.get("files", _LEGACY_FILES)
+        self._version = meta.get("version", 0)
+        self.dims = meta["dims"]
+        self._ids = meta["ids"]
+        n = len(self._ids)
+        self._rows = {cid: row for row, cid in enumerate(self._ids) if cid is not None}
+        self._vectors_name = files["vectors"]
+        if self._vectors_name is None:
+            return  # saved empty
+        mode = "r" if self.read_only else "r+"
+        self._vectors = np.load(self.directory / self._vectors_name, mmap_mode=mode)
+        if meta["codec"] == self.codec:
+            codes = np.load(self.directory / files["codes"])
+            scales = np.load(self.directory / files["scales"])
+        else:
+            logger.info(f"Re-encoding quantized index from {meta['codec']} to {self.codec}")
+            codes, scales = self._encode_rows(0, n)
+            self._dirty = True
+        # In-memory arrays share the capacity of the vectors file
+        capacity = len(self._vectors)
+        self._codes = np.zeros((capacity, self.dims), dtype=codes.dtype)
+        self._codes[:n] = codes
+        self._scales = np.zeros(capacity, dtype=np.float32)
+        self._scales[:n] = scales
+        self._live = np.zeros(capacity, dtype=bool)
+        self._live[:n] = [cid is not None for cid in self._ids]
+
+    def _encode_rows(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        parts = [
+            encode(np.asarray(self._vectors[i:min(i + _BLOCK_ROWS, end)]), self.codec)
+            for i in range(start, end, _BLOCK_ROWS)
+        ]
+        if not parts:
+            return encode(np.zeros((0, self.dims), dtype=np.float32), self.codec)
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def _check_writable(self):
+        if self.read_only:
+            raise ValueError(f"Quantized index {self.directory} is open read-only")
+
+    def save(self):
+        """
+        Persist codes and ids (compacting deleted rows first if worthwhile).
+
+        New data files are written first; replacing index.json publishes
+        them in one step, after which the previous version's files are
+        removed.
+        """
+        self._check_writable()
+        if not self._dirty:
+            return
+        n = len(self._ids)
+        if n and (n - self.count()) / n > _COMPACT_RATIO:
+            self._compact()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        n = len(self._ids)
+        version = self._version + 1
+        files = {"vectors": self._vectors_name, "codes": None, "scales": None}
+        if self._vectors is not None:
+            self._vectors.flush()
+            files["codes"] = f"codes.{version}.npy"
+            files["scales"] = f"scales.{version}.npy"
+            np.save(self.directory / files["codes"], self._codes[:n])
+            np.save(self.directory / files["scales"], self._scales[:n])
+        tmp = self._meta_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({
+                "version": version,
+                "dims": self.dims,
+                "codec": self.codec,
+                "files": files,
+                "ids": self._ids,
+            }),
+            encoding="utf-8",
+        )
+        tmp.replace(self._meta_path)
+        self._version = version
+        self._dirty = False
+
+        # Readers that already mapped older files keep them until they reload
+        referenced = set(files.values())
+        for path in self.directory.glob("*.npy"):
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+
+    def _compact(self):
+        keep = np.flatnonzero(self._live[:len(self._ids)])
+        self._resize(max(len(keep), 1), keep)
+        self._ids = [self._ids[row] for row in keep]
+        self._rows = {cid: row for row, cid in enumerate(self._ids)}
+
+    def _reserve(self, rows: int):
+        """Grow storage (by doubling) to hold at least `rows` rows."""
+        capacity = len(self._vectors) if self._vectors is not None else 0
+        if rows > capacity:
+            self._resize(max(rows, capacity * 2, 1024), np.arange(len(self._ids)))
+
+    def _resize(self, capacity: int, keep: np.ndarray):
+        """Copy every array to `capacity` rows, keeping rows `keep` in order."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # A new file: the published one may be mapped by readers
+        name = f"vectors.{self._version + 1}.npy"
+        tmp = self.directory / "vectors.tmp.npy"
+        grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=(capacity, self.dims))
+        for start in range(0, len(keep), _BLOCK_ROWS):
+            rows = keep[start:start + _BLOCK_ROWS]
+            grown[start:start + len(rows)] = self._vectors[rows]
+        grown.flush()
+        del grown
+        self._vectors = None
+        tmp.replace(self.directory / name)
+        self._vectors_name = name
+        self._vectors = np.load(self.directory / name, mmap_mode="r+")
+
+        dtype = np.int8 if self.codec == "int8" else np.float16
+        codes = np.zeros((capacity, self.dims), dtype=dtype)
+        scales = np.zeros(capacity, dtype=np.float32)
+        live = np.zeros(capacity, dtype=bool)
+        if self._codes is not None:
+            codes[:len(keep)] = self._codes[keep]
+            scales[:len(keep)] = self._scales[keep]
+            live[:len(keep)] = self._live[keep]
+        self._codes, self._scales, self._live = codes, scales, live
+
+    def clear(self):
+        """
+        Drop every vector (e.g. after the collection was reset).
+
+        Readers keep seeing the saved index until the next save.
+        """
+        self._check_writable()
+        self.dims = 0
+        self._ids = []
+        self._rows = {}
+        self._codes = None
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        self._vectors = None
+        self._vectors_name = None
+        self._dirty = True
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+
+    def upsert(self, ids: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """
+        Insert or replace vectors by id.
+
+        Replaced vectors get a new row (the old one is tombstoned), so rows
+        of the saved index are never rewritten under its readers.
+        """
+        self._check_writable()
+        if not len(ids):
+            return
+        matrix = normalize(vectors)
+        if not self.dims:
+            self.dims = matrix.shape[1]
+        elif matrix.shape[1] != self.dims:
+            raise ValueError(f"Vector dimension {matrix.shape[1]} != index dimension {self.dims}")
+        codes, scales = encode(matrix, self.codec)
+
+        self.delete(ids)
+        # Last occurrence wins for ids repeated within one call
+        fresh = list({cid: i for i, cid in enumerate(ids)}.values())
+        start = len(self._ids)
+        end = start + len(fresh)
+        added = np.array(fresh)
+        self._reserve(end)
+        self._vectors[start:end] = matrix[added]
+        self._codes[start:end] = codes[added]
+        self._scales[start:end] = scales[added]
+        self._live[start:end] = True
+        for offset, i in enumerate(fresh):
+            self._ids.append(ids[i])
+            self._rows[ids[i]] = start + offset
+        self._dirty = True
+
+    def delete(self, ids: Iterable[str]):
+        self._check_writable()
+        for cid in ids:
+            row = self._rows.pop(cid, None)
+            if row is not None:
+                self._ids[row] = None
+                self._live[row] = False
+                self._dirty = True
+
+    def sync_with(self, store) -> bool:
+        """
+        Rebuild from the vector store's embeddings if the counts differ.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        stored = store.count()
+        if stored == self.count():
+            return False
+        logger.info(f"Rebuilding quantized index ({stored} vectors)")
+        self._check_writable()
+        self.clear()
+        for page in store.snapshot(include=["embeddings"], page_size=_PAGE_SIZE):
+            self.upsert([hit.id for hit in page], [hit.embedding for hit in page])
+        self.save()
+        return True
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    def count(self) -> int:
+        return len(self._rows)
+
+    def memory_bytes(self) -> int:
+        """Bytes of the in-memory codes and scales (vectors stay on disk)."""
+        if self._codes is None:
+            return 0
+        n = len(self._ids)
+        return int(self._codes[:n].nbytes + self._scales[:n].nbytes)
+
+    def vectors(self, ids: Sequence[str]) -> List[Optional[List[float]]]:
+        """Full-precision (normalized) vectors of the given ids."""
+        return [
+            self._vectors[self._rows[cid]].tolist() if cid in self._rows else None
+            for cid in ids
+        ]
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        oversample: int = DEFAULT_OVERSAMPLE,
+        rescore: bool = True,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k ids by cosine similarity.
+
+        Args:
+            query: Query embedding
+            k: Results to return
+            oversample: Candidates rescored per result
+            rescore: Rescore candidates against float32 vectors (False returns
+                the approximate ranking)
+
+        Returns:
+            [(id, score)] best first
+        """
+        if not self.count() or k <= 0:
+            return []
+        n = len(self._ids)
+        q = normalize(query)[0]
+        approx = approximate_scores(self._codes[:n], self._scales[:n], q)
+        approx[~self._live[:n]] = -np.inf
+
+        n_candidates = min(self.count(), k * max(1, oversample) if rescore else k)
+        candidates = np.argpartition(-approx, n_candidates - 1)[:n_candidates]
+        if rescore:
+            rows = np.sort(candidates)  # sequential reads from the memmap
+            scores = np.asarray(self._vectors[rows]) @ q
+        else:
+            rows, scores = candidates, approx[candidates]
+        order = np.argsort(-scores)[:k]
+        return [(self._ids[rows[i]], float(scores[i])) for i in order]
+
+    def exact_search(self, query: Sequence[float], k: int) -> List[Tuple[str, float]]:
+        """Top-k by a full float32 scan (the baseline recall is measured against)."""
+        if not self.count() or k <= 0:
+            return []
+        q = normalize(query)[0]
+        n = len(self._ids)
+        scores = np.empty(n, dtype=np.float32)
+        for start in range(0, n, _BLOCK_ROWS):
+            block = np.asarray(self._vectors[start:min(start + _BLOCK_ROWS, n)])
+            scores[start:start + len(block)] = block @ q
+        scores[~self._live[:len(self._ids)]] = -np.inf
+        k = min(k, self.count())
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[row], float(scores[row])) for row in top]
+
+    def recall(self, queries: Sequence[Sequence[float]], k: int = 10, oversample: int = DEFAULT_OVERSAMPLE) -> float:
+        """Share of exact top-k ids that the quantized search returns."""
+        hits = total = 0
+        for query in queries:
+            truth = {cid for cid, _ in self.exact_search(query, k)}
+            found = {cid for cid, _ in self.search(query, k, oversample)}
+            hits += len(truth & found)
+            total += len(truth)
+        return hits / total if total else 1.0
+
+
+def quantized_index_path(db_path: Path, collection_name: str) -> Path:
+    """Directory of a collection's quantized sidecar index."""
+    return Path(db_path) / "quantized" / collection_name
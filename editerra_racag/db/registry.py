@@ -0,0 +1,191 @@
+"""
+Process-wide registry of open vector stores.
+
+Opening a store (a Chroma `PersistentClient`, a flat index's SQLite
+connection and memory map) costs milliseconds and file handles, so it
+should happen once per process, not once per query. Every caller that
+needs a store - the query engine, the retriever, the embedding pipeline,
+the runtime and the API servers - asks the shared registry, which opens
+each (db_path, collection, backend) lazily and hands out the same
+instance afterwards.
+
+Stores are handed out as `SerializedStore`s: writes go through one writer
+thread and reads through a bounded reader pool (see
+`editerra_racag.db.executor`), so a server answering parallel queries and
+an indexer upserting into the same store never touch it concurrently in
+ways the backend cannot handle. `max_readers` (the `store_max_readers`
+setting) sizes the reader pool of stores opened afterwards.
+
+`warm_up` opens a store ahead of the first request and runs one probe
+query so index files are loaded into memory; `health_check` reports
+every open store for health endpoints.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from editerra_racag.db import create_vector_store
+from editerra_racag.db.base import VectorStore
+from editerra_racag.db.executor import DEFAULT_MAX_READERS, SerializedStore, StoreExecutor
+from editerra_racag.db.quantization import QuantizedIndex, quantized_index_path
+
+logger = logging.getLogger(__name__)
+
+StoreKey = Tuple[str, str, str]
+
+
+def _key(db_path, collection_name: str, backend: str) -> StoreKey:
+    return (str(Path(db_path).resolve()), collection_name, backend)
+
+
+class StoreRegistry:
+    """Lazily opened, shared vector stores and quantized indexes."""
+
+    def __init__(self, max_readers: int = DEFAULT_MAX_READERS):
+        self.max_readers = max_readers
+        self._lock = threading.Lock()
+        self._stores: Dict[StoreKey, VectorStore] = {}
+        # (db_path, collection, codec) -> (index.json mtime, index)
+        self._quantized: Dict[StoreKey, Tuple[float, QuantizedIndex]] = {}
+
+    def get(self, db_path, collection_name: str, backend: str = "chroma", **options) -> VectorStore:
+        """
+        The shared store of a collection, opened on first use.
+
+        Args:
+            db_path: Vector database directory
+            collection_name: Collection within it
+            backend: Vector store backend ("chroma" or "flat")
+            **options: Backend options, only used when the store is opened
+        """
+        key = _key(db_path, collection_name, backend)
+        store = self._stores.get(key)
+        if store is not None:
+            return store
+        with self._lock:
+            if key not in self._stores:
+                logger.debug(f"Opening {backend} store {collection_name} at {key[0]}")
+                store = create_vector_store(db_path, collection_name, backend, **options)
+                self._stores[key] = SerializedStore(StoreExecutor(store, self.max_readers))
+            return self._stores[key]
+
+    def get_quantized(self, db_path, collection_name: str, codec: str) -> Optional[QuantizedIndex]:
+        """
+        The quantized sidecar index of a collection, or None if there is none.
+
+        The index is reloaded when indexing has saved a newer one.
+        """
+        meta = quantized_index_path(Path(db_path), collection_name) / "index.json"
+        try:
+            mtime = meta.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        key = _key(db_path, collection_name, codec)
+        cached = self._quantized.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with self._lock:
+            cached = self._quantized.get(key)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, QuantizedIndex(meta.parent, codec, read_only=True))
+                self._quantized[key] = cached
+            return cached[1]
+
+    def warm_up(
+        self,
+        db_path,
+        collection_name: str,
+        backend: str = "chroma",
+        quantization: Optional[str] = None,
+        **options,
+    ) -> Dict[str, Any]:
+        """
+        Open a store and run one probe query.
+
+        The probe loads the index queries will use before the first real
+        request: the quantized sidecar when `quantization` is set and one
+        exists (the store's own vector index, e.g. Chroma's HNSW, then stays
+        on disk), otherwise the backend's index.
+
+        Returns:
+            {"collection", "backend", "quantization", "count", "dimensions",
+            "latency_ms"}
+        """
+        start = time.perf_counter()
+        store = self.get(db_path, collection_name, backend, **options)
+        count = store.count()
+        index = self.get_quantized(db_path, collection_name, quantization) if quantization else None
+        if index is not None and index.count():
+            dims = index.dims
+            index.search([1.0] + [0.0] * (dims - 1), 1)
+        else:
+            index = None
+            dims = store.dimensions() if count else 0
+            if dims:
+                store.query([1.0] + [0.0] * (dims - 1), 1, include=())
+        latency = (time.perf_counter() - start) * 1000
+        logger.info(f"Warmed up {backend} store {collection_name}: {count} vectors in {latency:.0f} ms")
+        return {
+            "collection": collection_name,
+            "backend": backend,
+            "quantization": quantization if index is not None else None,
+            "count": count,
+            "dimensions": dims,
+            "latency_ms": round(latency, 1),
+        }
+
+    def health_check(self) -> Dict[str, Any]:
+        """
+        Check every open store.
+
+        Returns:
+            {"ok": all stores answered, "stores": [{"db_path", "collection",
+            "backend", "ok", "count" or "error", "latency_ms", "executor"}]}
+        """
+        with self._lock:
+            stores = list(self._stores.items())
+        report = []
+        for (db_path, collection_name, backend), store in stores:
+            entry: Dict[str, Any] = {"db_path": db_path, "collection": collection_name, "backend": backend}
+            start = time.perf_counter()
+            try:
+                entry["count"] = store.count()
+                entry["ok"] = True
+            except Exception as e:
+                entry["error"] = str(e)
+                entry["ok"] = False
+            entry["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            if isinstance(store, SerializedStore):
+                entry["executor"] = store.executor.stats()
+            report.append(entry)
+        return {"ok": all(entry["ok"] for entry in report), "stores": report}
+
+    def close_all(self):
+        """Close every open store (e.g. on server shutdown), after pending writes."""
+        with self._lock:
+            stores = list(self._stores.values())
+            self._stores.clear()
+            self._quantized.clear()
+        for store in stores:
+            try:
+                store.close()
+            except Exception as e:
+                logger.warning(f"Could not close store {store.collection_name}: {e}")
+
+
+registry = StoreRegistry()
+
+
+def get_store(db_path, collection_name: str, backend: str = "chroma", **options) -> VectorStore:
+    """Shared store from the process-wide registry."""
+    return registry.get(db_path, collection_name, backend, **options)
+
+
+def get_quantized_index(db_path, collection_name: str, codec: str) -> Optional[QuantizedIndex]:
+    """Shared quantized sidecar index from the process-wide registry."""
+    return registry.get_quantized(db_path, collection_name, codec)
@@ -1,6 +1,8 @@
 import re
 from pathlib import Path
 
+from editerra_racag.file_inventory import walk_files
+
 ALLOWED_EXTENSIONS = {
     ".py", ".swift", ".js", ".ts", ".jsx", ".tsx",
     ".java", ".kt", ".sh", ".yaml", ".yml", ".toml",
@@ -29,33 +31,21 @@ def is_binary_file(path: Path) -> bool:
     except:
         return True
 
-def should_skip_dir(path: Path) -> bool:
-    return any(part in BLOCKED_DIR_NAMES for part in path.parts)
-
-def should_skip_file(path: Path) -> bool:
-    if path.suffix.lower() in SKIP_EXTENSIONS:
-        return True
-    if is_binary_file(path):
-        return True
-    return False
-
 def scan_repo(repo_root: Path):
     results = []
-    for p in repo_root.rglob("*"):
-        if p.is_dir() and should_skip_dir(p):
-            continue
-        if not p.is_file():
-            continue
-        if should_skip_file(p):
+    # Blocked directories are pruned by the walker before descending, and
+    # skipped extensions are dropped before any file is opened.
+    for entry in walk_files(repo_root, BLOCKED_DIR_NAMES, excluded_exts=SKIP_EXTENSIONS):
+        if is_binary_file(entry.path):
             continue
 
-        ext = p.suffix.lower()
+        ext = entry.path.suffix.lower()
         results.append({
-            "path": str(p),
+            "path": str(entry.path),
             "ext": ext,
             "is_code": ext in {".py", ".swift", ".js", ".ts", ".jsx", ".tsx", ".java", ".kt"},
             "is_markdown": ext in {".md", ".markdown", ".txt"},
             "is_json": ext == ".json",
-            "size": p.stat().st_size
+            "size": entry.size
         })
     return results
@@ -0,0 +1,269 @@
+"""
+Asynchronous, concurrency-bounded embedding executor.
+
+Sending one batch at a time leaves indexing bound by network latency. The
+executor keeps up to `max_concurrency` batches in flight on a private event
+loop, paces them with the provider's RPM/TPM token buckets, and backs off on
+429 responses (honouring Retry-After) by pausing every pending request.
+Other transient failures (timeouts, dropped connections, 5xx, empty vectors)
+are retried per batch with exponential backoff.
+
+Results always come back in submission order, so callers can store them as
+if the batches had been embedded one after another.
+
+    with EmbeddingExecutor(provider, max_concurrency=8, tokens_per_minute=1e6) as ex:
+        for texts, vectors in zip(batches, ex.imap(batches)):
+            ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import random
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from editerra_racag.embedding.embedding_cache import EmbeddingCache, provider_namespace, text_hash
+from editerra_racag.embedding.rate_limit import RateLimiter
+from editerra_racag.tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 6
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 60.0
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Seconds to wait if `exc` is a rate-limit (HTTP 429) error, else None.
+
+    Works with the OpenAI SDK (RateLimitError / APIStatusError) and with
+    requests' HTTPError, which both expose the HTTP response.
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429 and type(exc).__name__ != "RateLimitError":
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after") or headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+_TRANSIENT_ERRORS = {
+    "APIConnectionError", "APITimeoutError", "InternalServerError",
+    "ConnectionError", "Timeout", "ReadTimeout", "ConnectTimeout",
+}
+
+
+class EmptyEmbeddingError(RuntimeError):
+    """The provider returned no vector for some inputs (it logged why)."""
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """True if a failed request is worth retrying (network, timeout, 5xx)."""
+    if isinstance(exc, (ConnectionError, TimeoutError, EmptyEmbeddingError)):
+        return True
+    if type(exc).__name__ in _TRANSIENT_ERRORS:
+        return True
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    return isinstance(status, int) and status >= 500
+
+
+class EmbeddingExecutor:
+    """Runs provider.embed() calls concurrently within rate limits."""
+
+    def __init__(
+        self,
+        llm_provider,
+        max_concurrency: int = 1,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        embedding_cache: Optional[EmbeddingCache] = None,
+    ):
+        """
+        Args:
+            llm_provider: LLMProvider whose embed() is called
+            max_concurrency: Batches in flight at once
+            requests_per_minute: Provider RPM quota (None = unlimited)
+            tokens_per_minute: Provider TPM quota (None = unlimited)
+            max_retries: Retries of a batch after 429s or transient errors
+            embedding_cache: Optional cache; only misses reach the provider
+        """
+        self.llm_provider = llm_provider
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.embedding_cache = embedding_cache
+        self.rate_limited = 0
+        self.retried = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            # +2 so cache lookups are not queued behind provider calls
+            max_workers=self.max_concurrency + 2, thread_name_prefix="embed"
+        )
+
+    @classmethod
+    def from_config(
+        cls,
+        llm_provider,
+        provider_config: Dict[str, Any],
+        embedding_cache: Optional[EmbeddingCache] = None,
+    ) -> "EmbeddingExecutor":
+        """Build an executor from a provider section of the config."""
+        return cls(
+            llm_provider,
+            max_concurrency=provider_config.get("max_concurrency", 1),
+            requests_per_minute=provider_config.get("requests_per_minute"),
+            tokens_per_minute=provider_config.get("tokens_per_minute"),
+            max_retries=provider_config.get("max_retries", DEFAULT_MAX_RETRIES),
+            embedding_cache=embedding_cache,
+        )
+
+    # ------------------------------------------------------------
+    # Event loop (one private loop on a daemon thread)
+    # ------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=loop.run_forever, name="embed-loop", daemon=True)
+            self._thread.start()
+            self._loop = loop
+        return self._loop
+
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        if self._semaphore is None:
+            # Created on the loop thread (binds to the running loop on 3.9)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+
+        cache = self.embedding_cache
+        found: Dict[str, List[float]] = {}
+        hashes: List[str] = []
+        namespace = None
+        if cache is not None:
+            namespace = provider_namespace(self.llm_provider)
+            hashes = [text_hash(t) for t in texts]
+            found = await loop.run_in_executor(self._pool, cache.get_many, namespace, hashes)
+            missing = list({h: t for h, t in zip(hashes, texts) if h not in found}.items())
+        else:
+            missing = list(enumerate(texts))
+        if not missing:
+            return [found[h] for h in hashes]
+
+        inputs = [t for _, t in missing]
+        tokens = sum(count_tokens(t) for t in inputs)
+        vectors = await self._call_with_backoff(inputs, tokens)
+
+        if cache is None:
+            return vectors
+        fresh = {h: v for (h, _), v in zip(missing, vectors)}
+        await loop.run_in_executor(self._pool, cache.put_many, namespace, list(fresh.items()))
+        found.update(fresh)
+        return [found[h] for h in hashes]
+
+    async def _call_with_backoff(self, texts: List[str], tokens: int) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                await self.limiter.acquire(tokens)
+                try:
+                    vectors = await loop.run_in_executor(self._pool, self.llm_provider.embed, texts)
+                    if len(vectors) != len(texts) or not all(len(v) for v in vectors):
+                        raise EmptyEmbeddingError(f"no embedding for some of {len(texts)} inputs")
+                    return vectors
+                except Exception as e:
+                    error = e
+                    retry_after = _retry_after(e)
+                    if attempt >= self.max_retries or (retry_after is None and not _is_transient(e)):
+                        raise
+            delay = max(retry_after or 0.0, min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** attempt))
+            delay *= 1 + random.random() * 0.25
+            if retry_after is not None:
+                # Rate limited: pause everyone, not just this batch
+                self.rate_limited += 1
+                logger.warning(f"Embedding rate limited; retrying in {delay:.1f}s")
+                self.limiter.pause(delay)
+            else:
+                self.retried += 1
+                logger.warning(f"Embedding batch failed ({error}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    # ------------------------------------------------------------
+    # Public, synchronous API
+    # ------------------------------------------------------------
+
+    def submit(self, texts: List[str]) -> concurrent.futures.Future:
+        """Schedule one batch; the future resolves to its vectors."""
+        return asyncio.run_coroutine_threadsafe(self._embed(list(texts)), self._ensure_loop())
+
+    def imap(self, batches: Iterable[List[str]], return_exceptions: bool = False) -> Iterator[Any]:
+        """
+        Embed batches concurrently, yielding results in input order.
+
+        Only a bounded window of batches is scheduled ahead of the consumer,
+        so `batches` may be a lazy iterator over a very large input.
+
+        Args:
+            batches: Embedding inputs of each batch
+            return_exceptions: Yield the exception of a batch that failed after
+                its retries instead of raising it (and abandoning the rest)
+        """
+        def result(future: concurrent.futures.Future):
+            if not return_exceptions:
+                return future.result()
+            try:
+                return future.result()
+            except Exception as e:
+                return e
+
+        window = self.max_concurrency * 2
+        pending: deque = deque()
+        try:
+            for texts in batches:
+                pending.append(self.submit(texts))
+                if len(pending) >= window:
+                    yield result(pending.popleft())
+            while pending:
+                yield result(pending.popleft())
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def embed_batches(self, batches: Iterable[List[str]]) -> List[List[List[float]]]:
+        """Embed every batch and return the results in input order."""
+        return list(self.imap(batches))
+
+    async def _cancel_pending(self):
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._cancel_pending(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "EmbeddingExecutor":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
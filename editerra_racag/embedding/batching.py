@@ -0,0 +1,92 @@
+"""
+Token-aware packing of embedding requests.
+
+A fixed item count makes batches of large chunks overflow the provider's
+per-request token ceiling and batches of tiny chunks pay request overhead
+for a handful of tokens. Instead, batches are packed greedily, in order,
+up to a token budget and an item cap. Inputs longer than the embedding
+model's context window are truncated before they reach the API (chunking
+already splits oversized chunks when balancing is enabled, so this is a
+last-resort guard).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from editerra_racag.tokenizer import count_tokens, truncate_to_tokens
+
+# Maximum input tokens per text, by embedding model
+MODEL_CONTEXT_TOKENS: Dict[str, int] = {
+    "text-embedding-3-large": 8191,
+    "text-embedding-3-small": 8191,
+    "text-embedding-ada-002": 8191,
+    "nomic-embed-text": 2048,      # Ollama's default context for the model
+    "mxbai-embed-large": 512,
+    "all-minilm": 256,
+    "voyage-3": 32000,
+    "text-embedding-004": 2048,
+    "embed-english-v3.0": 512,
+}
+DEFAULT_CONTEXT_TOKENS = 2048
+
+
+def model_context_tokens(model: Optional[str], override: Optional[int] = None) -> int:
+    """Input token limit for an embedding model (override wins)."""
+    if override:
+        return int(override)
+    if model:
+        # Ollama tags: "nomic-embed-text:latest"
+        base = model.split(":", 1)[0]
+        if base in MODEL_CONTEXT_TOKENS:
+            return MODEL_CONTEXT_TOKENS[base]
+    return DEFAULT_CONTEXT_TOKENS
+
+
+def prepare_inputs(texts: Sequence[str], max_input_tokens: int) -> Tuple[List[str], List[int], int]:
+    """
+    Truncate over-long inputs to the model's context window.
+
+    Returns:
+        (inputs, token count of each input, number of truncated inputs)
+    """
+    inputs: List[str] = []
+    counts: List[int] = []
+    truncated = 0
+    for text in texts:
+        tokens = count_tokens(text)
+        if tokens > max_input_tokens:
+            text = truncate_to_tokens(text, max_input_tokens)
+            tokens = count_tokens(text)
+            truncated += 1
+        inputs.append(text)
+        counts.append(max(1, tokens))
+    return inputs, counts, truncated
+
+
+def pack_batches(token_counts: Sequence[int], max_tokens: int, max_items: int) -> List[Tuple[int, int]]:
+    """
+    Group consecutive inputs into batches.
+
+    Args:
+        token_counts: Token count of each input, in order
+        max_tokens: Token budget per request
+        max_items: Maximum inputs per request
+
+    Returns:
+        [start, end) index ranges covering every input, in order. An input
+        larger than max_tokens on its own gets a batch to itself.
+    """
+    max_items = max(1, max_items)
+    batches: List[Tuple[int, int]] = []
+    start = 0
+    total = 0
+    for i, tokens in enumerate(token_counts):
+        if i > start and (total + tokens > max_tokens or i - start >= max_items):
+            batches.append((start, i))
+            start = i
+            total = 0
+        total += tokens
+    if start < len(token_counts):
+        batches.append((start, len(token_counts)))
+    return batches
@@ -1,11 +1,26 @@
 import json
-from typing import Any, Dict, List, Set
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 
-from chromadb import PersistentClient
+from editerra_racag.db.base import VectorStore
+from editerra_racag.db.registry import get_store
+from editerra_racag.db.quantization import QuantizedIndex, quantized_index_path
 
 from editerra_racag.chunking.normalize import normalize_chunk
 from editerra_racag.embedding.embedder import embed_chunk as embed_document
+from editerra_racag.embedding.async_executor import EmbeddingExecutor
+from editerra_racag.embedding.batching import model_context_tokens, pack_batches, prepare_inputs
+from editerra_racag.embedding.embedding_cache import EmbeddingCache
+from editerra_racag.embedding.index_manifest import IndexManifest, ManifestDiff
+from editerra_racag.embedding.job_journal import JobJournal
+from editerra_racag.embedding.store_writer import DEFAULT_WRITE_BATCH_SIZE, StoreWriter
 from editerra_racag.paths import resolve_db_path, resolve_collection_name, resolve_output_path
+
+logger = logging.getLogger(__name__)
+
+# Dimensionality of the legacy embedder (text-embedding-3-small); the engine
+# pipeline checks against the provider's configured embedding_dimensions
 EXPECTED_EMBEDDING_DIM = 1536
 
 
@@ -36,25 +51,32 @@ def build_metadata(chunk: Dict[str, Any]) -> Dict[str, Any]:
         "lines": f"{chunk.get('start_line', '?')}-{chunk.get('end_line', '?')}",
         "module": chunk.get("module", "unknown"),
         "tags": tags_value,
+        "symbol": chunk.get("symbol") or "",
+        "content_hash": chunk.get("content_hash") or "",
     }
 
 
-def _extract_embedding_dim(sample: Dict[str, Any]) -> int:
-    embeddings = sample.get("embeddings")
-    if embeddings is None or (isinstance(embeddings, (list, tuple)) and len(embeddings) == 0):
-        return 0
-
-    first = embeddings[0]
-    if isinstance(first, list):
-        return len(first)
+def _ensure_dimensions(store: VectorStore, dims: int) -> bool:
+    """
+    Empty the store if it holds vectors of a different dimensionality.
 
-    if hasattr(first, "__len__"):
-        try:
-            return len(first)  # type: ignore[arg-type]
-        except TypeError:
-            return 0
+    Happens when `embedding_dimensions`, the model or the projection changed;
+    every chunk then has to be embedded again.
 
-    return 0
+    Returns:
+        True if the store was reset
+    """
+    if not dims or not store.count():
+        return False
+    sample_dim = store.dimensions()
+    if not sample_dim or sample_dim == dims:
+        return False
+    logger.warning(
+        f"Existing embeddings have {sample_dim} dimensions, expected {dims}. "
+        f"Resetting collection {store.collection_name}."
+    )
+    store.reset()
+    return True
 
 
 def embed_all_chunks(
@@ -67,106 +89,149 @@ def embed_all_chunks(
     db_path = db_path or resolve_db_path()
     collection_name = collection_name or resolve_collection_name()
     
-    client = PersistentClient(path=db_path)
+    store = get_store(db_path, collection_name)
 
     if reset:
-        try:
-            client.delete_collection(name=collection_name)
-            print("🧹 Existing collection dropped (reset requested).")
-        except Exception:
-            print("ℹ️ No existing collection to drop.")
-
-    collection = client.get_or_create_collection(name=collection_name)
+        store.reset()
+        print("🧹 Existing collection dropped (reset requested).")
 
     existing_ids: Set[str] = set()
-
-    current_count = collection.count()
-    if current_count:
-        sample = collection.get(limit=1, include=["embeddings"])
-        sample_dim = _extract_embedding_dim(sample)
-
-        if sample_dim and sample_dim != EXPECTED_EMBEDDING_DIM:
-            print(
-                f"⚠️ Existing embeddings dimension {sample_dim} "
-                f"!= expected {EXPECTED_EMBEDDING_DIM}. Resetting collection." 
-            )
-            client.delete_collection(name=COLLECTION_NAME)
-            collection = client.get_or_create_collection(name=COLLECTION_NAME)
-        else:
-            page_size = 1000
-            for offset in range(0, current_count, page_size):
-                batch = collection.get(include=[], limit=page_size, offset=offset)
-                batch_ids = batch.get("ids", [])
-                if batch_ids:
-                    existing_ids.update(batch_ids)
-
-    def chunk_id(chunk: Dict[str, Any]) -> str:
-        return chunk["chunk_id"]
-
-    remaining = [c for c in chunks if chunk_id(c) not in existing_ids]
-
-    print(f"🔍 Total chunks loaded: {len(chunks)}")
-    print(f"🧠 Already embedded: {len(existing_ids)}")
-    print(f"➡️  Remaining to embed: {len(remaining)}")
-
-    BATCH = 32
-    for i in range(0, len(remaining), BATCH):
-        batch = remaining[i:i + BATCH]
-        ids: List[str] = []
-        docs: List[str] = []
-        metas: List[Dict[str, Any]] = []
-        embs: List[List[float]] = []
-
-        for c in batch:
-            ids.append(chunk_id(c))
-            docs.append(c.get("chunk_text", ""))
-            metas.append(build_metadata(c))
-
-            embedded = embed_document(c)
-            embs.append(embedded["embedding"])
-
-        try:
-            collection.add(
-                ids=ids,
-                documents=docs,
-                embeddings=embs,
-                metadatas=metas
-            )
-        except Exception as e:
-            print("❌ Batch error:", e)
-            print("→ IDs:", ids)
-
-        pct = round(((i + len(batch)) / len(remaining)) * 100, 2)
-        print(f"🟦 Batch {i//BATCH + 1}: {i+len(batch)}/{len(remaining)} ({pct}%)")
-
-    final_count = collection.count()
+    with IndexManifest(Path(db_path), collection_name) as manifest:
+        if _ensure_dimensions(store, EXPECTED_EMBEDDING_DIM):
+            print("⚠️ Existing embeddings had a different dimension. Collection reset.")
+            manifest.clear()
+        elif store.count():
+            # The manifest only pages through the collection when it is out of step
+            manifest.sync_with(store)
+            existing_ids = manifest.ids()
+
+        def chunk_id(chunk: Dict[str, Any]) -> str:
+            return chunk["chunk_id"]
+
+        remaining = [c for c in chunks if chunk_id(c) not in existing_ids]
+
+        print(f"🔍 Total chunks loaded: {len(chunks)}")
+        print(f"🧠 Already embedded: {len(existing_ids)}")
+        print(f"➡️  Remaining to embed: {len(remaining)}")
+
+        BATCH = 32
+        for i in range(0, len(remaining), BATCH):
+            batch = remaining[i:i + BATCH]
+            ids: List[str] = []
+            docs: List[str] = []
+            metas: List[Dict[str, Any]] = []
+            embs: List[List[float]] = []
+
+            for c in batch:
+                ids.append(chunk_id(c))
+                docs.append(c.get("chunk_text", ""))
+                metas.append(build_metadata(c))
+
+                embedded = embed_document(c)
+                embs.append(embedded["embedding"])
+
+            try:
+                store.add(
+                    ids=ids,
+                    documents=docs,
+                    embeddings=embs,
+                    metadatas=metas
+                )
+                manifest.record(
+                    (cid, c.get("file_path"), c.get("content_hash"), meta)
+                    for cid, c, meta in zip(ids, batch, metas)
+                )
+                manifest.commit()
+            except Exception as e:
+                print("❌ Batch error:", e)
+                print("→ IDs:", ids)
+
+            pct = round(((i + len(batch)) / len(remaining)) * 100, 2)
+            print(f"🟦 Batch {i//BATCH + 1}: {i+len(batch)}/{len(remaining)} ({pct}%)")
+
+    final_count = store.count()
     print("🎉 Embedding run complete.")
     print(f"📦 Collection now holds {final_count} embeddings.")
 
 
+def _apply_diff(
+    store: VectorStore,
+    manifest: IndexManifest,
+    chunks: List[Dict[str, Any]],
+    batch_size: int,
+    sidecar: Optional[QuantizedIndex] = None
+) -> ManifestDiff:
+    """
+    Delete stale ids and update moved chunks; return the diff for the chunks to embed.
+    
+    The diff is taken against the local manifest instead of the collection:
+    chunk IDs are content-addressed (file + symbol + content hash), so a known
+    ID means the embedding is still valid and only its metadata may differ.
+    """
+    diff = manifest.diff(chunks, build_metadata)
+    
+    for i in range(0, len(diff.delete), batch_size):
+        batch_ids = diff.delete[i:i+batch_size]
+        store.delete(batch_ids)
+        if sidecar is not None:
+            sidecar.delete(batch_ids)
+        manifest.remove(batch_ids)
+        manifest.commit()
+    
+    for i in range(0, len(diff.update), batch_size):
+        batch = diff.update[i:i+batch_size]
+        metadatas = [build_metadata(chunk) for chunk in batch]
+        store.update([chunk["chunk_id"] for chunk in batch], metadatas)
+        manifest.record(
+            (chunk["chunk_id"], chunk.get("file_path"), chunk.get("content_hash"), meta)
+            for chunk, meta in zip(batch, metadatas)
+        )
+        manifest.commit()
+    return diff
+
+
 def embed_and_store_all(
     chunks_file: str,
     db_path: str,
     collection_name: str,
     llm_provider,
-    batch_size: int = 100
+    batch_size: int = 100,
+    embedding_cache: Optional[EmbeddingCache] = None,
+    executor: Optional[EmbeddingExecutor] = None,
+    batch_tokens: Optional[int] = None,
+    max_input_tokens: Optional[int] = None,
+    resume: bool = False,
+    write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+    quantization: Optional[str] = None,
+    vector_backend: str = "chroma"
 ) -> Dict[str, int]:
     """
     Main entry point for embedding pipeline (used by EditerraEngine).
     
     Args:
         chunks_file: Path to chunks.jsonl file
-        db_path: Path to ChromaDB storage
+        db_path: Vector database directory
         collection_name: Name of the collection
         llm_provider: LLM provider for embeddings
-        batch_size: Batch size for embedding
+        batch_size: Maximum chunks per embedding request
+        embedding_cache: Optional persistent cache; texts embedded before with
+            the same provider/model/dimensions are not sent again
+        executor: Optional embedding executor (concurrency and rate limits);
+            defaults to one batch at a time
+        batch_tokens: Token budget per embedding request (None = item count only)
+        max_input_tokens: Per-input token limit; longer inputs are truncated
+            (defaults to the provider model's context window)
+        resume: Continue the unfinished job of the collection, embedding only
+            the batches it had not stored yet (a normal run if there is none)
+        write_batch_size: Rows per vector-store upsert; embedded batches are
+            coalesced up to this size by a background writer
+        quantization: "int8" or "float16" to maintain a quantized sidecar
+            index of the collection for queries (None = off)
+        vector_backend: "chroma" or "flat" (memory-mapped exact search)
     
     Returns:
         Statistics about the embedding operation
     """
-    from pathlib import Path
-    import json
-    
     # Load chunks from file
     chunks = []
     with open(chunks_file, "r", encoding="utf-8") as f:
@@ -174,35 +239,110 @@ def embed_and_store_all(
             if line.strip():
                 chunks.append(json.loads(line))
     
-    # Embed using the llm_provider
-    client = PersistentClient(path=db_path)
-    collection = client.get_or_create_collection(name=collection_name)
+    for i, chunk in enumerate(chunks):
+        chunk.setdefault("chunk_id", f"chunk_{i}")
     
-    embedded_count = 0
-    for i in range(0, len(chunks), batch_size):
-        batch = chunks[i:i+batch_size]
-        texts = [chunk.get("content", "") for chunk in batch]
+    context = model_context_tokens(getattr(llm_provider, "embedding_model", None), max_input_tokens)
+    
+    # The shared store: readers in this process see the writes right away
+    store = get_store(db_path, collection_name, vector_backend)
+    
+    with IndexManifest(Path(db_path), collection_name) as manifest, \
+            JobJournal(Path(db_path), collection_name) as journal:
+        # Vectors must match the provider's (possibly reduced) dimensionality
+        reset_dims = _ensure_dimensions(store, llm_provider.embedding_dimensions)
+        sidecar = None
+        if quantization:
+            sidecar = QuantizedIndex(quantized_index_path(Path(db_path), collection_name), quantization)
+        if reset_dims:
+            manifest.clear()
+            journal.clear()
+            if sidecar is not None:
+                sidecar.clear()
+            resume = False
+        manifest.sync_with(store)
+        if sidecar is not None:
+            sidecar.sync_with(store)
         
-        # Get embeddings from provider
-        embeddings = llm_provider.embed(texts)
+        job = journal.unfinished() if resume else None
+        if job is not None:
+            # Pick up the recorded plan: only batches not stored yet
+            logger.info(f"Resuming embedding job {job.job_id} ({job.total_batches} batches)")
+            job_id = job.job_id
+            by_id = {chunk["chunk_id"]: chunk for chunk in chunks}
+            planned = journal.pending_batches(job_id)
+            missing = sum(1 for _, ids in planned for cid in ids if cid not in by_id)
+            if missing:
+                logger.warning(f"{missing} chunks of the resumed job are no longer in {chunks_file}")
+            pending = [(seq, [by_id[cid] for cid in ids if cid in by_id]) for seq, ids in planned]
+            diff = ManifestDiff(unchanged=len(chunks) - sum(len(batch) for _, batch in pending))
+            to_embed = [chunk for _, batch in pending for chunk in batch]
+        else:
+            diff = _apply_diff(store, manifest, chunks, batch_size, sidecar)
+            to_embed = diff.add
         
-        # Prepare for storage
-        ids = [chunk.get("id", f"chunk_{i+j}") for j, chunk in enumerate(batch)]
-        metadatas = [build_metadata(chunk) for chunk in batch]
-        documents = texts
+        # Embedding inputs fit the model's context; stored documents stay whole
+        inputs, token_counts, truncated = prepare_inputs(
+            [chunk.get("chunk_text", "") for chunk in to_embed], context
+        )
+        if job is None:
+            ranges = pack_batches(token_counts, batch_tokens or sum(token_counts) + 1, batch_size)
+            job_id = journal.start(
+                chunks_file, [[chunk["chunk_id"] for chunk in to_embed[start:end]] for start, end in ranges]
+            )
+            seqs = list(range(len(ranges)))
+        else:
+            offsets = [0]
+            for _, batch in pending:
+                offsets.append(offsets[-1] + len(batch))
+            ranges = list(zip(offsets, offsets[1:]))
+            seqs = [seq for seq, _ in pending]
         
-        # Store in ChromaDB
-        collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            metadatas=metadatas,
-            documents=documents
+        own_executor = executor is None
+        if own_executor:
+            executor = EmbeddingExecutor(llm_provider, embedding_cache=embedding_cache)
+        
+        # Embedding and storing overlap: results are handed to a single
+        # writer thread that coalesces them into larger upserts
+        writer = StoreWriter(
+            store, manifest, journal, job_id, build_metadata, write_batch_size, sidecar=sidecar
         )
+        failed = 0
+        try:
+            # Batches are embedded concurrently but come back in order; a batch
+            # that still fails after its retries is left for --resume
+            results = executor.imap((inputs[start:end] for start, end in ranges), return_exceptions=True)
+            for seq, (start, end), embeddings in zip(seqs, ranges, results):
+                if isinstance(embeddings, Exception):
+                    failed += 1
+                    logger.error(f"Embedding batch {seq} failed: {embeddings}")
+                    writer.fail(seq, embeddings)
+                else:
+                    writer.put(seq, to_embed[start:end], embeddings)
+        finally:
+            try:
+                writer.close()
+            finally:
+                if sidecar is not None:
+                    sidecar.save()
+                if own_executor:
+                    executor.close()
+        embedded_count = writer.written
         
-        embedded_count += len(batch)
+        if not failed:
+            journal.finish(job_id)
     
     return {
         "total_embedded": embedded_count,
+        "requests": len(ranges),
+        "store_writes": writer.writes,
+        "failed_batches": failed,
+        "resumed": job is not None,
+        "truncated_inputs": truncated,
+        "metadata_updated": len(diff.update),
+        "deleted": len(diff.delete),
+        "unchanged": diff.unchanged,
+        "cache_hits": embedding_cache.hits if embedding_cache is not None else 0,
         "collection": collection_name,
         "db_path": db_path
     }
@@ -5,23 +5,15 @@ from typing import List, Dict
 os.environ["CHROMA_TELEMETRY_ENABLED"] = "false"
 os.environ["ANONYMIZED_TELEMETRY"] = "false"
 
-from chromadb import PersistentClient
-from chromadb.config import Settings
 from openai import OpenAI
 
+from editerra_racag.db import create_vector_store
+
 # Load OpenAI key from env
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-# Set up local ChromaDB (telemetry OFF, duckdb+faiss backend)
-chroma_client = PersistentClient(
-    path="racag/db/chroma_store",
-    settings=Settings(anonymized_telemetry=False)
-)
-
-collection = chroma_client.get_or_create_collection(
-    name="kairos_chunks",
-    metadata={"hnsw:space": "cosine"}
-)
+# Set up local ChromaDB (telemetry OFF, cosine space)
+store = create_vector_store("racag/db/chroma_store", "kairos_chunks", space="cosine")
 
 def embed_text(text: str) -> List[float]:
     """Embed text using OpenAI's embedding-3-small model."""
@@ -51,7 +43,7 @@ def embed_and_store(chunks: List[Dict]):
         vector = embed_text(text)
         metadata = build_metadata(chunk)
 
-        collection.add(
+        store.add(
             ids=[chunk["chunk_id"]],
             embeddings=[vector],
             documents=[text],
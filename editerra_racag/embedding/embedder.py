@@ -5,11 +5,9 @@ from pathlib import Path
 from typing import Dict, Any
 
 import os
+from functools import lru_cache
 from openai import OpenAI
 
-# Initialize OpenAI client (requires OPENAI_API_KEY in env)
-oai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 EMBED_MODEL = "text-embedding-3-small"
 
 # Output file for embeddings
@@ -17,6 +15,12 @@ EMBEDDINGS_OUTPUT = Path("racag/logs/embeddings.jsonl")
 EMBEDDINGS_OUTPUT.parent.mkdir(parents=True, exist_ok=True)
 
 
+@lru_cache(maxsize=1)
+def _client() -> OpenAI:
+    """OpenAI client, created on first use (requires OPENAI_API_KEY in env)."""
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
 def _normalize_metadata(chunk: Dict) -> Dict[str, Any]:
     """
     Ensures metadata always exists and is well‑formed.
@@ -47,7 +51,7 @@ def embed_chunk(chunk: Dict) -> Dict:
         raise ValueError("Empty chunk_text in chunk")
 
     # Create embedding
-    response = oai.embeddings.create(
+    response = _client().embeddings.create(
         input=text,
         model=EMBED_MODEL
     )
@@ -0,0 +1,235 @@
+"""
+Persistent embedding cache.
+
+Embeddings are stored in an SQLite database under the workspace
+`cache_path`, keyed by (provider, model, dimensions, sha256 of the input
+text). Vectors are stored as float32 blobs. A reindex after `delete_index`,
+a branch switch or a chunking change then only pays the provider for text
+it has never embedded with that model.
+
+The cache is size-bounded: once the stored vectors exceed `max_bytes`, the
+least recently used entries are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CACHE_FILENAME = "embeddings.sqlite"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Evict down to this fraction of max_bytes, so eviction does not run on
+# every commit once the cache is full
+_EVICT_TARGET = 0.9
+# SQLite host-parameter limit is 999 on older builds
+_LOOKUP_BATCH = 500
+
+Namespace = Tuple[str, str, int]
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of an embedding input."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def provider_namespace(llm_provider) -> Namespace:
+    """(provider, model, dimensions) of an LLMProvider, the cache key prefix."""
+    return (
+        llm_provider.provider_name,
+        str(getattr(llm_provider, "embedding_model", "") or ""),
+        int(llm_provider.embedding_dimensions or 0),
+    )
+
+
+class EmbeddingCache:
+    """SQLite-backed, LRU-evicted cache of embedding vectors."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            max_bytes: Upper bound for the stored vectors (0 = unbounded)
+        """
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / CACHE_FILENAME
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # Embedding may run on worker threads; one connection, one lock.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                dims INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (provider, model, dims, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+
+    def get_many(self, namespace: Namespace, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors.
+
+        Args:
+            namespace: (provider, model, dimensions)
+            hashes: text_hash() of each input
+
+        Returns:
+            {hash: vector} for the hashes that are cached
+        """
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[i:i + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE provider = ? AND model = ? AND dims = ? AND text_hash IN ({placeholders})",
+                    (*namespace, *batch),
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32).tolist()
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? "
+                    "WHERE provider = ? AND model = ? AND dims = ? AND text_hash = ?",
+                    [(now, *namespace, h) for h in found],
+                )
+        self.hits += sum(1 for h in hashes if h in found)
+        self.misses += sum(1 for h in hashes if h not in found)
+        return found
+
+    def put_many(self, namespace: Namespace, items: Iterable[Tuple[str, Sequence[float]]]):
+        """Store (hash, vector) pairs; empty vectors (failed requests) are skipped."""
+        now = time.time()
+        rows = [
+            (*namespace, h, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for h, vector in items
+            if vector is not None and len(vector)
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(provider, model, dims, text_hash, vector, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def size_bytes(self) -> int:
+        """Total size of the stored vectors."""
+        with self._lock:
+            (total,) = self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+            ).fetchone()
+        return int(total)
+
+    def evict(self) -> int:
+        """Drop least recently used vectors until the cache fits max_bytes."""
+        if not self.max_bytes:
+            return 0
+        total = self.size_bytes()
+        if total <= self.max_bytes:
+            return 0
+
+        target = self.max_bytes * _EVICT_TARGET
+        removed = 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid, LENGTH(vector) FROM embeddings ORDER BY last_used"
+            )
+            stale = []
+            for rowid, size in rows:
+                if total <= target:
+                    break
+                stale.append((rowid,))
+                total -= size
+            self._conn.executemany("DELETE FROM embeddings WHERE rowid = ?", stale)
+            removed = len(stale)
+        return removed
+
+    def clear(self):
+        """Drop every cached vector."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM embeddings")
+
+    def commit(self):
+        """Evict if over budget, then persist pending writes."""
+        self.evict()
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        self.commit()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "EmbeddingCache":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def embed_with_cache(
+    llm_provider,
+    texts: List[str],
+    cache: Optional[EmbeddingCache] = None
+) -> List[List[float]]:
+    """
+    Embed texts, serving repeated inputs from the cache.
+
+    Only cache misses are sent to the provider (in one call, input order
+    preserved); their vectors are written back to the cache.
+
+    Args:
+        llm_provider: LLMProvider used for misses
+        texts: Embedding inputs
+        cache: Optional embedding cache (None calls the provider directly)
+
+    Returns:
+        One vector per input text
+    """
+    if cache is None or not texts:
+        return llm_provider.embed(texts)
+
+    namespace = provider_namespace(llm_provider)
+    hashes = [text_hash(t) for t in texts]
+    found = cache.get_many(namespace, hashes)
+
+    # Identical texts within the batch are embedded once
+    missing: Dict[str, str] = {}
+    for h, text in zip(hashes, texts):
+        if h not in found and h not in missing:
+            missing[h] = text
+    if missing:
+        vectors = llm_provider.embed(list(missing.values()))
+        fresh = dict(zip(missing.keys(), vectors))
+        cache.put_many(namespace, fresh.items())
+        found.update(fresh)
+
+    return [found[h] for h in hashes]
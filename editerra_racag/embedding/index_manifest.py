@@ -0,0 +1,206 @@
+"""
+Local manifest of what is stored in a vector collection.
+
+The manifest records, per collection, every stored chunk id with its file,
+content hash and a hash of its metadata. Indexing diffs the fresh chunk
+list against it instead of paging through the collection:
+
+- ids not in the manifest are embedded and upserted
+- ids whose metadata changed (e.g. the chunk moved down a few lines) get a
+  metadata-only update
+- manifest ids that no longer exist (edited or deleted files) are deleted
+
+so an incremental run touches the vector store only for what changed.
+
+The manifest lives next to the vector database. If it is missing or out of
+step with the collection (count mismatch), it is rebuilt once from the
+collection itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "index_manifest.sqlite"
+_PAGE_SIZE = 1000
+
+
+def metadata_hash(metadata: Dict[str, Any]) -> str:
+    """Stable hash of a metadata dict."""
+    payload = json.dumps(metadata, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ManifestDiff:
+    """Changes needed to bring a collection in line with a chunk list."""
+
+    add: List[Dict[str, Any]] = field(default_factory=list)
+    update: List[Dict[str, Any]] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.add or self.update or self.delete)
+
+
+class IndexManifest:
+    """SQLite record of the chunk ids stored in each collection."""
+
+    def __init__(self, db_path: Path, collection_name: str):
+        """
+        Open (or create) the manifest for a collection.
+
+        Args:
+            db_path: Vector database directory (the manifest is stored inside)
+            collection_name: Collection the manifest describes
+        """
+        db_path = Path(db_path)
+        db_path.mkdir(parents=True, exist_ok=True)
+        self.path = db_path / MANIFEST_FILENAME
+        self.collection_name = collection_name
+
+        # Stored batches are recorded by the store writer thread
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                collection TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                meta_hash TEXT NOT NULL,
+                PRIMARY KEY (collection, chunk_id)
+            )
+            """
+        )
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    def count(self) -> int:
+        (n,) = self._conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE collection = ?", (self.collection_name,)
+        ).fetchone()
+        return n
+
+    def ids(self) -> Set[str]:
+        return {
+            cid for (cid,) in self._conn.execute(
+                "SELECT chunk_id FROM entries WHERE collection = ?", (self.collection_name,)
+            )
+        }
+
+    def _meta_hashes(self) -> Dict[str, str]:
+        return dict(self._conn.execute(
+            "SELECT chunk_id, meta_hash FROM entries WHERE collection = ?",
+            (self.collection_name,),
+        ))
+
+    def diff(self, chunks: Iterable[Dict[str, Any]], build_metadata) -> ManifestDiff:
+        """
+        Compare a full chunk list against the manifest.
+
+        Args:
+            chunks: Every chunk that should be in the collection
+            build_metadata: Function turning a chunk into its stored metadata
+
+        Returns:
+            ManifestDiff of chunks to add / update and ids to delete
+        """
+        stored = self._meta_hashes()
+        result = ManifestDiff()
+        seen: Set[str] = set()
+        for chunk in chunks:
+            cid = chunk["chunk_id"]
+            if cid in seen:
+                continue
+            seen.add(cid)
+            previous = stored.get(cid)
+            if previous is None:
+                result.add.append(chunk)
+            elif previous != metadata_hash(build_metadata(chunk)):
+                result.update.append(chunk)
+            else:
+                result.unchanged += 1
+        result.delete = [cid for cid in stored if cid not in seen]
+        return result
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+
+    def record(self, entries: Iterable[Tuple[str, str, str, Dict[str, Any]]]):
+        """Record stored chunks as (chunk_id, file_path, content_hash, metadata)."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO entries "
+            "(collection, chunk_id, file_path, content_hash, meta_hash) VALUES (?, ?, ?, ?, ?)",
+            [
+                (self.collection_name, cid, file_path or "", chash or "", metadata_hash(meta))
+                for cid, file_path, chash, meta in entries
+            ],
+        )
+
+    def remove(self, chunk_ids: Iterable[str]):
+        self._conn.executemany(
+            "DELETE FROM entries WHERE collection = ? AND chunk_id = ?",
+            [(self.collection_name, cid) for cid in chunk_ids],
+        )
+
+    def clear(self):
+        """Forget every entry of this collection (e.g. after delete_index)."""
+        with self._conn:
+            self._conn.execute("DELETE FROM entries WHERE collection = ?", (self.collection_name,))
+
+    def sync_with(self, store) -> bool:
+        """
+        Rebuild the manifest from the vector store if the two disagree.
+
+        Only the counts are compared, which is cheap; a full page-through of
+        the collection happens only when they differ (first run, manifest
+        deleted, collection dropped or written by another tool).
+
+        Returns:
+            True if the manifest was rebuilt
+        """
+        stored = store.count()
+        if stored == self.count():
+            return False
+
+        logger.info(
+            f"Rebuilding index manifest for {self.collection_name} "
+            f"({stored} stored chunks)"
+        )
+        with self._conn:
+            self._conn.execute("DELETE FROM entries WHERE collection = ?", (self.collection_name,))
+            for page in store.snapshot(include=["metadatas"], page_size=_PAGE_SIZE):
+                self.record(
+                    (hit.id, hit.metadata.get("file_path", ""), hit.metadata.get("content_hash", ""), hit.metadata)
+                    for hit in page
+                )
+        return True
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "IndexManifest":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
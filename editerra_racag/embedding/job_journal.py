@@ -0,0 +1,173 @@
+"""
+Durable journal of embedding runs.
+
+Before any batch is sent, a run records its plan: the chunk ids of every
+embedding batch, in order. Each batch is marked done once its vectors are
+stored (or failed once its retries are exhausted). If the run crashes, is
+interrupted or gives up on rate limits, the job stays unfinished, and a
+resumed run (`editerra-racag index --resume`) embeds exactly the batches
+that are not done yet instead of starting over.
+
+The journal lives next to the vector database, beside the index manifest.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+JOURNAL_FILENAME = "embedding_jobs.sqlite"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class EmbeddingJob:
+    """An embedding run recorded in the journal."""
+
+    job_id: int
+    chunks_file: str
+    total_batches: int
+    started: float
+
+
+class JobJournal:
+    """SQLite journal of embedding jobs and their batches."""
+
+    def __init__(self, db_path: Path, collection_name: str):
+        """
+        Open (or create) the journal of a collection.
+
+        Args:
+            db_path: Vector database directory (the journal is stored inside)
+            collection_name: Collection the jobs write to
+        """
+        db_path = Path(db_path)
+        db_path.mkdir(parents=True, exist_ok=True)
+        self.path = db_path / JOURNAL_FILENAME
+        self.collection_name = collection_name
+
+        # Batches are marked by the store writer thread
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                collection TEXT NOT NULL,
+                chunks_file TEXT NOT NULL,
+                total_batches INTEGER NOT NULL,
+                started REAL NOT NULL,
+                finished REAL
+            );
+            CREATE TABLE IF NOT EXISTS batches (
+                job_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                chunk_ids TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                PRIMARY KEY (job_id, seq)
+            );
+            """
+        )
+
+    def unfinished(self) -> Optional[EmbeddingJob]:
+        """The latest job of this collection that did not complete, if any."""
+        row = self._conn.execute(
+            "SELECT job_id, chunks_file, total_batches, started FROM jobs "
+            "WHERE collection = ? AND finished IS NULL ORDER BY job_id DESC LIMIT 1",
+            (self.collection_name,),
+        ).fetchone()
+        return EmbeddingJob(*row) if row else None
+
+    def start(self, chunks_file: str, batches: Sequence[Sequence[str]]) -> int:
+        """
+        Record a new job and its batch plan.
+
+        Unfinished jobs of the collection are discarded: the new plan is
+        computed against the current index and supersedes them.
+
+        Args:
+            chunks_file: chunks.jsonl the batches refer to
+            batches: Chunk ids of each embedding batch, in order
+
+        Returns:
+            The job id
+        """
+        with self._conn:
+            self._discard_unfinished()
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (collection, chunks_file, total_batches, started) VALUES (?, ?, ?, ?)",
+                (self.collection_name, str(chunks_file), len(batches), time.time()),
+            )
+            job_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO batches (job_id, seq, chunk_ids, status) VALUES (?, ?, ?, ?)",
+                [(job_id, seq, json.dumps(list(ids)), PENDING) for seq, ids in enumerate(batches)],
+            )
+        return job_id
+
+    def pending_batches(self, job_id: int) -> List[Tuple[int, List[str]]]:
+        """(seq, chunk ids) of every batch of a job that is not done."""
+        return [
+            (seq, json.loads(ids))
+            for seq, ids in self._conn.execute(
+                "SELECT seq, chunk_ids FROM batches WHERE job_id = ? AND status != ? ORDER BY seq",
+                (job_id, DONE),
+            )
+        ]
+
+    def mark_done(self, job_id: int, seqs: Iterable[int]):
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE batches SET status = ?, attempts = attempts + 1, error = NULL "
+                "WHERE job_id = ? AND seq = ?",
+                [(DONE, job_id, seq) for seq in seqs],
+            )
+
+    def mark_failed(self, job_id: int, seq: int, error: str):
+        with self._conn:
+            self._conn.execute(
+                "UPDATE batches SET status = ?, attempts = attempts + 1, error = ? "
+                "WHERE job_id = ? AND seq = ?",
+                (FAILED, error, job_id, seq),
+            )
+
+    def finish(self, job_id: int):
+        """Mark a job complete and drop its batch plan."""
+        with self._conn:
+            self._conn.execute("UPDATE jobs SET finished = ? WHERE job_id = ?", (time.time(), job_id))
+            self._conn.execute("DELETE FROM batches WHERE job_id = ?", (job_id,))
+
+    def _discard_unfinished(self):
+        stale = [
+            job_id for (job_id,) in self._conn.execute(
+                "SELECT job_id FROM jobs WHERE collection = ? AND finished IS NULL",
+                (self.collection_name,),
+            )
+        ]
+        self._conn.executemany("DELETE FROM batches WHERE job_id = ?", [(j,) for j in stale])
+        self._conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(j,) for j in stale])
+
+    def clear(self):
+        """Forget every job of this collection (e.g. after delete_index)."""
+        with self._conn:
+            self._discard_unfinished()
+            self._conn.execute("DELETE FROM jobs WHERE collection = ?", (self.collection_name,))
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> "JobJournal":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,205 @@
+"""
+PCA projection of embedding vectors.
+
+Providers that cannot return shorter vectors themselves (OpenAI's
+text-embedding-3 models can, through `dimensions`) can still be stored at
+reduced dimensionality: a PCA projection is fitted at index time on a
+sample of chunk embeddings, saved next to the vector database and applied
+to every stored and query vector through `ProjectedProvider`.
+
+Fitting also measures what the reduction costs: recall@k of the
+projected nearest neighbours against the full-dimensional ones, over the
+sample itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from editerra_racag.embedding.embedding_cache import EmbeddingCache, embed_with_cache
+from editerra_racag.llm.base import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+PROJECTION_FILENAME = "projection.npz"
+
+
+class PCAProjection:
+    """Mean-centred linear projection onto the top principal components."""
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, recall: Optional[float] = None):
+        """
+        Args:
+            mean: (d,) mean of the fitting sample
+            components: (k, d) orthonormal principal axes
+            recall: Measured recall@10 of the projection on its sample
+        """
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self.recall = recall
+
+    @property
+    def input_dimensions(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def dimensions(self) -> int:
+        return int(self.components.shape[0])
+
+    @property
+    def fingerprint(self) -> str:
+        """Short hash identifying the fitted projection."""
+        digest = hashlib.sha1(self.mean.tobytes() + self.components.tobytes())
+        return digest.hexdigest()[:12]
+
+    @classmethod
+    def fit(cls, vectors: Sequence[Sequence[float]], dimensions: int) -> "PCAProjection":
+        """
+        Fit a projection on sample vectors.
+
+        Args:
+            vectors: (n, d) sample embeddings; n should be well above `dimensions`
+            dimensions: Target dimensionality k
+
+        Raises:
+            ValueError: If the sample cannot support k components
+        """
+        sample = np.asarray(vectors, dtype=np.float32)
+        n, d = sample.shape
+        if dimensions >= d:
+            raise ValueError(f"Projection to {dimensions} dims needs vectors wider than {d}")
+        if n < dimensions:
+            raise ValueError(f"Need at least {dimensions} sample vectors to fit, got {n}")
+
+        mean = sample.mean(axis=0)
+        # Rows of vt are the principal axes, strongest first
+        _, _, vt = np.linalg.svd(sample - mean, full_matrices=False)
+        projection = cls(mean, vt[:dimensions])
+        projection.recall = recall_at_k(sample, projection.transform(sample))
+        return projection
+
+    def transform(self, vectors: Sequence[Sequence[float]]) -> np.ndarray:
+        """Project (n, d) vectors to (n, k), L2-normalized."""
+        projected = (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+        norms = np.linalg.norm(projected, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return projected / norms
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            tmp,
+            mean=self.mean,
+            components=self.components,
+            recall=np.float32(-1 if self.recall is None else self.recall),
+        )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "PCAProjection":
+        with np.load(Path(path)) as data:
+            recall = float(data["recall"])
+            return cls(data["mean"], data["components"], None if recall < 0 else recall)
+
+
+def recall_at_k(full: np.ndarray, projected: np.ndarray, k: int = 10, queries: int = 200) -> float:
+    """
+    Share of true top-k cosine neighbours the projected vectors still find.
+
+    Uses up to `queries` sample vectors as queries against the whole sample.
+    """
+    n = len(full)
+    k = min(k, n - 1)
+    if k <= 0:
+        return 1.0
+    step = max(1, n // queries)
+    query_ids = np.arange(0, n, step)[:queries]
+
+    def top_k(matrix: np.ndarray) -> np.ndarray:
+        unit = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        scores = unit[query_ids] @ unit.T
+        scores[np.arange(len(query_ids)), query_ids] = -np.inf  # a query is not its own neighbour
+        return np.argpartition(-scores, k, axis=1)[:, :k]
+
+    truth, approx = top_k(full), top_k(projected)
+    hits = sum(len(np.intersect1d(t, a)) for t, a in zip(truth, approx))
+    return hits / (len(query_ids) * k)
+
+
+class ProjectedProvider(LLMProvider):
+    """LLMProvider whose embeddings pass through a PCA projection."""
+
+    def __init__(self, provider: LLMProvider, projection: PCAProjection):
+        super().__init__(provider.config)
+        self.provider = provider
+        self.projection = projection
+        # The projection is part of the embedding space (and cache key)
+        inner_model = getattr(provider, "embedding_model", "") or ""
+        self.embedding_model = f"{inner_model}+pca{projection.dimensions}-{projection.fingerprint}"
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.provider.embed(texts)
+        # Failed inputs stay empty so callers can retry them
+        ok = [i for i, v in enumerate(vectors) if len(v)]
+        result: List[List[float]] = [[] for _ in vectors]
+        if ok:
+            for i, v in zip(ok, self.projection.transform([vectors[i] for i in ok]).tolist()):
+                result[i] = v
+        return result
+
+    def embed_single(self, text: str) -> List[float]:
+        embeddings = self.embed([text])
+        return embeddings[0] if embeddings else []
+
+    def rerank(self, query: str, candidates: List[str]) -> List[float]:
+        return self.provider.rerank(query, candidates)
+
+    @property
+    def embedding_dimensions(self) -> int:
+        return self.projection.dimensions
+
+    @property
+    def provider_name(self) -> str:
+        return self.provider.provider_name
+
+
+def fit_projection(
+    llm_provider: LLMProvider,
+    texts: Sequence[str],
+    dimensions: int,
+    batch_size: int = 64,
+    embedding_cache: Optional[EmbeddingCache] = None,
+) -> PCAProjection:
+    """Embed sample texts with the unprojected provider and fit a projection."""
+    vectors: List[List[float]] = []
+    for i in range(0, len(texts), batch_size):
+        batch = embed_with_cache(llm_provider, list(texts[i:i + batch_size]), embedding_cache)
+        vectors.extend(v for v in batch if len(v))
+    projection = PCAProjection.fit(vectors, dimensions)
+    logger.info(
+        f"Fitted PCA projection {projection.input_dimensions} -> {projection.dimensions} dims "
+        f"on {len(vectors)} chunks (recall@10 {projection.recall:.3f})"
+    )
+    return projection
+
+
+def load_projection(db_path: Path) -> Optional[PCAProjection]:
+    """The projection saved next to a vector database, if any."""
+    path = Path(db_path) / PROJECTION_FILENAME
+    return PCAProjection.load(path) if path.exists() else None
+
+
+def projection_stats(projection: PCAProjection) -> Dict[str, float]:
+    return {
+        "input_dimensions": projection.input_dimensions,
+        "dimensions": projection.dimensions,
+        "memory_reduction": round(projection.input_dimensions / projection.dimensions, 2),
+        "recall_at_10": round(projection.recall, 4) if projection.recall is not None else None,
+    }
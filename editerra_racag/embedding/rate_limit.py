@@ -0,0 +1,92 @@
+"""
+Async token buckets for provider rate limits.
+
+Providers publish quotas as requests per minute (RPM) and tokens per minute
+(TPM). `RateLimiter` holds one bucket for each and makes a request wait
+until both have capacity, so sustained throughput converges on the quota
+instead of tripping 429s. After a 429, `pause()` holds back every request
+until the provider's retry-after has passed.
+
+All methods must be called from the same event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Continuously refilled bucket of `rate_per_minute` units per minute."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: Refill rate
+            capacity: Burst size (defaults to one minute's worth)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 = now)."""
+        self._refill()
+        # A request larger than the bucket only needs a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits of one provider."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        """
+        Args:
+            requests_per_minute: RPM quota (None = unlimited)
+            tokens_per_minute: TPM quota (None = unlimited)
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._resume_at = 0.0
+
+    def pause(self, seconds: float):
+        """Hold back all requests for `seconds` (e.g. after a 429)."""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def acquire(self, tokens: int = 0):
+        """Wait until one request of `tokens` tokens fits both quotas, then take it."""
+        while True:
+            wait = self._resume_at - time.monotonic()
+            if self.requests is not None:
+                wait = max(wait, self.requests.wait_time(1))
+            if self.tokens is not None and tokens:
+                wait = max(wait, self.tokens.wait_time(tokens))
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+
+        # No await between the check and the take: atomic within the loop
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None and tokens:
+            self.tokens.take(tokens)
@@ -0,0 +1,180 @@
+"""
+Background writer for embedded batches.
+
+Storing a batch (vector store upsert, manifest and journal writes) used to
+run between embedding requests, so the network idled while the store
+wrote and the store idled while requests were in flight. `StoreWriter` moves
+storage to one dedicated thread fed through a bounded queue: the embedding
+side keeps requests in flight while earlier results are written, and the
+queue bound applies backpressure when the store falls behind.
+
+The writer coalesces queued batches into larger upserts (up to
+`write_batch_size` rows), which stores (Chroma in particular) handle far
+more efficiently than many small ones. A single writer also keeps all vector-store writes on one
+thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from editerra_racag.db.base import VectorStore
+from editerra_racag.db.quantization import QuantizedIndex
+from editerra_racag.embedding.index_manifest import IndexManifest
+from editerra_racag.embedding.job_journal import JobJournal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_WRITE_BATCH_SIZE = 1000
+
+_STOP = object()
+
+
+class StoreWriter:
+    """Single thread writing embedded batches to a vector store."""
+
+    def __init__(
+        self,
+        store: VectorStore,
+        manifest: IndexManifest,
+        journal: JobJournal,
+        job_id: int,
+        build_metadata,
+        write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        sidecar: Optional[QuantizedIndex] = None,
+    ):
+        """
+        Args:
+            store: Vector store (upsert target)
+            manifest: Index manifest recording stored chunks
+            journal: Job journal; batches are marked done once written
+            job_id: Journal job the batches belong to
+            build_metadata: Function turning a chunk into its stored metadata
+            write_batch_size: Rows per coalesced upsert
+            queue_size: Embedded batches buffered ahead of the writer
+            sidecar: Optional quantized index written alongside the store
+        """
+        self.store = store
+        self.manifest = manifest
+        self.journal = journal
+        self.job_id = job_id
+        self.build_metadata = build_metadata
+        self.sidecar = sidecar
+        self.write_batch_size = max(1, write_batch_size)
+        self.written = 0
+        self.writes = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="store-writer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------
+
+    def _put(self, item):
+        # Blocks while the queue is full, but gives up if the writer died
+        while True:
+            self._raise_if_failed()
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def put(self, seq: int, chunks: Sequence[Dict[str, Any]], embeddings: Sequence[Sequence[float]]):
+        """Queue one embedded batch for writing."""
+        self._put((seq, list(chunks), list(embeddings), None))
+
+    def fail(self, seq: int, error: BaseException):
+        """Record a batch that could not be embedded (left for --resume)."""
+        self._put((seq, None, None, str(error)))
+
+    def close(self):
+        """Write everything queued, stop the thread and re-raise its error."""
+        if self._thread.is_alive():
+            self._put(_STOP)
+            self._thread.join()
+        self._raise_if_failed()
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise RuntimeError(f"Vector store write failed: {self._error}") from self._error
+
+    # ------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------
+
+    def _run(self):
+        try:
+            stop = False
+            while not stop:
+                pending = [self._queue.get()]
+                rows = len(pending[0][1] or ()) if pending[0] is not _STOP else 0
+                # Coalesce whatever else is already queued, up to one write batch
+                while rows < self.write_batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    pending.append(item)
+                    if item is not _STOP:
+                        rows += len(item[1] or ())
+                if pending[-1] is _STOP:
+                    pending.pop()
+                    stop = True
+                self._write(pending)
+        except BaseException as e:
+            logger.error(f"Store writer failed: {e}")
+            self._error = e
+            # Unblock producers waiting on a full queue
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _write(self, items: List[Tuple[int, Optional[list], Optional[list], Optional[str]]]):
+        ids: List[str] = []
+        texts: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        embeddings: List[Sequence[float]] = []
+        chunks: List[Dict[str, Any]] = []
+        done: List[int] = []
+        for seq, batch, vectors, error in items:
+            if error is not None:
+                self.journal.mark_failed(self.job_id, seq, error)
+                continue
+            done.append(seq)
+            for chunk, vector in zip(batch, vectors):
+                chunks.append(chunk)
+                ids.append(chunk["chunk_id"])
+                texts.append(chunk.get("chunk_text", ""))
+                metadatas.append(self.build_metadata(chunk))
+                embeddings.append(vector)
+
+        if ids:
+            # Upsert: an ID left behind by an interrupted run is simply overwritten
+            self.store.upsert(
+                ids=ids,
+                embeddings=embeddings,
+                metadatas=metadatas,
+                documents=texts
+            )
+            if self.sidecar is not None:
+                self.sidecar.upsert(ids, embeddings)
+            self.manifest.record(
+                (chunk["chunk_id"], chunk.get("file_path"), chunk.get("content_hash"), meta)
+                for chunk, meta in zip(chunks, metadatas)
+            )
+            self.manifest.commit()
+            self.written += len(ids)
+            self.writes += 1
+        if done:
+            self.journal.mark_done(self.job_id, done)
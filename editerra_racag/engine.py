@@ -5,14 +5,31 @@ Orchestrates chunking, embedding, indexing, and querying.
 """
 
 import logging
+import shutil
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 import json
 
 from editerra_racag.config import EditerraConfig, get_config
 from editerra_racag.llm.factory import get_provider
+from editerra_racag.chunking.balancer import ChunkBudget
 from editerra_racag.chunking.run_chunkers import run_chunking_pipeline
 from editerra_racag.embedding.embed_all import embed_and_store_all
+from editerra_racag.embedding.async_executor import EmbeddingExecutor
+from editerra_racag.embedding.embedding_cache import EmbeddingCache
+from editerra_racag.embedding.index_manifest import IndexManifest
+from editerra_racag.embedding.job_journal import JobJournal
+from editerra_racag.db.quantization import quantized_index_path
+from editerra_racag.db.registry import registry
+from editerra_racag.embedding.batching import model_context_tokens
+from editerra_racag.embedding.projection import (
+    PROJECTION_FILENAME,
+    ProjectedProvider,
+    fit_projection,
+    load_projection,
+    projection_stats,
+)
+from editerra_racag.tokenizer import truncate_to_tokens
 from editerra_racag.retrieval.semantic_retriever import SemanticRetriever
 from editerra_racag.reranker.rerank_engine import RerankEngine
 from editerra_racag.context.context_assembler import ContextAssembler
@@ -43,13 +60,20 @@ class EditerraEngine:
         """
         self.workspace = workspace
         self.config = config or get_config(workspace)
-        self.llm_provider = get_provider(self.config)
+        self.base_provider = get_provider(self.config)
+        self.llm_provider = self._projected(self.base_provider)
         
+        # Reader threads per shared store (writes always use a single thread)
+        registry.max_readers = self.config.get("store_max_readers", registry.max_readers)
+
         # Initialize components
         self.retriever = SemanticRetriever(
             db_path=str(self.config.db_path),
             collection_name=self.config.collection_name,
-            llm_provider=self.llm_provider
+            llm_provider=self.llm_provider,
+            quantization=self.config.get("vector_quantization"),
+            oversample=self.config.get("quantization_oversample", 4),
+            vector_backend=self.config.get("vector_backend", "chroma")
         )
         
         self.reranker = RerankEngine(llm_provider=self.llm_provider)
@@ -59,7 +83,68 @@ class EditerraEngine:
         logger.info(f"Provider: {self.config.llm_provider}")
         logger.info(f"Collection: {self.config.collection_name}")
     
-    def index(self, force: bool = False) -> Dict[str, Any]:
+    def _projected(self, provider):
+        """Wrap the provider in the saved PCA projection, if one is configured."""
+        if self.config.get("embedding_projection") != "pca":
+            return provider
+        projection = load_projection(self.config.db_path)
+        if projection is None:
+            return provider
+        return ProjectedProvider(provider, projection)
+    
+    def _fit_projection(self, chunks_file: Path, embedding_cache: Optional[EmbeddingCache]) -> Dict[str, Any]:
+        """
+        Fit (if needed) the PCA projection on a sample of chunks and switch to it.
+        
+        A saved projection is reused while its dimensions match the config, so
+        stored vectors stay comparable across runs.
+        """
+        dims = int(self.config.get("projection_dimensions", 256))
+        projection = load_projection(self.config.db_path)
+        if projection is None or projection.dimensions != dims \
+                or projection.input_dimensions != self.base_provider.embedding_dimensions:
+            # Evenly spaced sample across the repository: count the chunks,
+            # then read every n-th one, so only the sample is held in memory
+            size = int(self.config.get("projection_sample_size", 2048))
+            with open(chunks_file, "r", encoding="utf-8") as f:
+                total = sum(1 for line in f if line.strip())
+            step = max(1, total // size)
+            texts = []
+            with open(chunks_file, "r", encoding="utf-8") as f:
+                lines = (line for line in f if line.strip())
+                for i, line in enumerate(lines):
+                    if len(texts) >= size:
+                        break
+                    if i % step == 0:
+                        texts.append(json.loads(line).get("chunk_text", ""))
+            limit = model_context_tokens(
+                getattr(self.base_provider, "embedding_model", None),
+                self.config.get("embedding_max_input_tokens")
+            )
+            projection = fit_projection(
+                self.base_provider,
+                [truncate_to_tokens(t, limit) for t in texts],
+                dims,
+                embedding_cache=embedding_cache
+            )
+            projection.save(self.config.db_path / PROJECTION_FILENAME)
+        
+        self.llm_provider = ProjectedProvider(self.base_provider, projection)
+        self.retriever.llm_provider = self.llm_provider
+        return projection_stats(projection)
+    
+    def _chunk_budget(self) -> Optional[ChunkBudget]:
+        """Token window from config, or None when chunk balancing is off."""
+        if not self.config.get("chunk_balancing", True):
+            return None
+        return ChunkBudget(
+            target_tokens=self.config.get("chunk_target_tokens", 400),
+            min_tokens=self.config.get("chunk_min_tokens", 80),
+            max_tokens=self.config.get("chunk_max_tokens", 800),
+            overlap_tokens=self.config.get("chunk_overlap_tokens", 40),
+        )
+    
+    def index(self, force: bool = False, jobs: Optional[int] = None, resume: bool = False) -> Dict[str, Any]:
         """
         Index the workspace.
         
@@ -69,39 +154,90 @@ class EditerraEngine:
         3. Storing in vector database
         
         Args:
-            force: If True, rebuild index even if it exists
+            force: If True, rebuild index even if it exists (ignores the chunk cache)
+            jobs: Chunking worker processes (defaults to `chunking_jobs` in config,
+                0 = all cores)
+            resume: Continue an interrupted embedding run from its journal
+                (chunking is skipped and only unfinished batches are embedded)
         
         Returns:
             Statistics about the indexing operation
         """
         logger.info(f"Starting index of workspace: {self.workspace}")
         
-        # Step 1: Chunking
-        logger.info("Step 1/2: Chunking source files...")
-        chunk_stats = run_chunking_pipeline(
-            workspace_root=str(self.workspace),
-            output_dir=str(self.config.output_path)
-        )
+        if jobs is None:
+            jobs = self.config.get("chunking_jobs", 1)
         
         chunks_file = self.config.output_path / "chunks.jsonl"
+        if resume and not force:
+            with JobJournal(self.config.db_path, self.config.collection_name) as journal:
+                job = journal.unfinished()
+            resume = job is not None and Path(job.chunks_file) == chunks_file and chunks_file.exists()
+            if not resume:
+                logger.info("No interrupted embedding run to resume; indexing from scratch")
+        else:
+            resume = False
+        
+        # Step 1: Chunking (the resumed job's chunks.jsonl is reused as is)
+        if resume:
+            logger.info("Step 1/2: Resuming; reusing existing chunks")
+            chunk_stats = {"resumed": True}
+        else:
+            logger.info("Step 1/2: Chunking source files...")
+            chunk_stats = run_chunking_pipeline(
+                workspace_root=str(self.workspace),
+                output_dir=str(self.config.output_path),
+                jobs=jobs,
+                cache_dir=str(self.config.cache_path) if self.config.get("chunk_cache", True) else None,
+                use_cache=not force,
+                discovery=self.config.get("file_discovery", "auto"),
+                budget=self._chunk_budget()
+            )
+        
         if not chunks_file.exists():
             raise FileNotFoundError(f"Chunking failed: {chunks_file} not created")
         
         # Step 2: Embedding and storing
         logger.info("Step 2/2: Embedding and storing in vector database...")
-        embed_stats = embed_and_store_all(
-            chunks_file=str(chunks_file),
-            db_path=str(self.config.db_path),
-            collection_name=self.config.collection_name,
-            llm_provider=self.llm_provider,
-            batch_size=self.config.embedding_batch_size
+        embedding_cache = None
+        if self.config.get("embedding_cache", True):
+            embedding_cache = EmbeddingCache(
+                self.config.cache_path,
+                max_bytes=int(self.config.get("embedding_cache_max_mb", 512)) * 1024 * 1024
+            )
+        projection = None
+        if self.config.get("embedding_projection") == "pca":
+            projection = self._fit_projection(chunks_file, embedding_cache)
+        executor = EmbeddingExecutor.from_config(
+            self.llm_provider, self.config.get_provider_config(), embedding_cache
         )
+        try:
+            embed_stats = embed_and_store_all(
+                chunks_file=str(chunks_file),
+                db_path=str(self.config.db_path),
+                collection_name=self.config.collection_name,
+                llm_provider=self.llm_provider,
+                batch_size=self.config.get("embedding_batch_size", 256),
+                batch_tokens=self.config.get("embedding_batch_tokens"),
+                max_input_tokens=self.config.get("embedding_max_input_tokens"),
+                embedding_cache=embedding_cache,
+                executor=executor,
+                resume=resume,
+                write_batch_size=self.config.get("store_batch_size", 1000),
+                quantization=self.config.get("vector_quantization"),
+                vector_backend=self.config.get("vector_backend", "chroma")
+            )
+        finally:
+            executor.close()
+            if embedding_cache is not None:
+                embedding_cache.close()
         
         # Combine statistics
         stats = {
             "workspace": str(self.workspace),
             "chunking": chunk_stats,
             "embedding": embed_stats,
+            "projection": projection,
             "collection": self.config.collection_name,
             "provider": self.config.llm_provider
         }
@@ -180,8 +316,7 @@ class EditerraEngine:
         
         # Get collection stats
         try:
-            collection = self.retriever.collection
-            stats["total_chunks"] = collection.count()
+            stats["total_chunks"] = self.retriever.store.count()
             
             # Try to load index stats if available
             stats_file = self.config.output_path / "index_stats.json"
@@ -201,18 +336,27 @@ class EditerraEngine:
         """
         logger.info(f"Deleting index for collection: {self.config.collection_name}")
         
-        # Delete ChromaDB collection
+        # Empty the vector collection
         try:
-            import chromadb
-            client = chromadb.PersistentClient(path=str(self.config.db_path))
-            client.delete_collection(name=self.config.collection_name)
+            self.retriever.store.reset()
             logger.info("Collection deleted")
         except Exception as e:
             logger.warning(f"Could not delete collection: {e}")
         
+        with IndexManifest(self.config.db_path, self.config.collection_name) as manifest:
+            manifest.clear()
+        with JobJournal(self.config.db_path, self.config.collection_name) as journal:
+            journal.clear()
+        
+        shutil.rmtree(quantized_index_path(self.config.db_path, self.config.collection_name), ignore_errors=True)
+        
+        # Refit the projection on the next index
+        (self.config.db_path / PROJECTION_FILENAME).unlink(missing_ok=True)
+        self.llm_provider = self.base_provider
+        self.retriever.llm_provider = self.llm_provider
+        
         # Delete output files
         if self.config.output_path.exists():
-            import shutil
             shutil.rmtree(self.config.output_path)
             self.config.output_path.mkdir(parents=True, exist_ok=True)
             logger.info("Output directory cleared")
@@ -0,0 +1,247 @@
+"""
+File inventory for Editerra RAC-CAG.
+
+One shared repository walker for the chunking pipeline and the diagnostics
+scanner. It is built on os.scandir and:
+
+- prunes excluded directories *before* descending into them, so nothing
+  under node_modules, DerivedData, Pods, ... is ever listed or stat'ed
+- filters on file extension using the directory entry name alone
+- reuses the DirEntry stat result for size and mtime
+
+Entries are yielded in a deterministic (name-sorted, depth-first) order.
+
+`iter_repo_files` adds a git-aware discovery mode: tracked files come
+straight from .git/index (one stat each), and untracked files from
+`git ls-files --others --exclude-standard`. Without a git executable, a
+walk that prunes everything matched by .gitignore finds them instead,
+skipping tracked names before they are stat'ed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import stat
+import subprocess
+from pathlib import Path
+from typing import AbstractSet, Iterable, Iterator, List, NamedTuple, Optional
+
+from editerra_racag.git_index import GitIndexError, find_git_dir, read_git_index
+from editerra_racag.ignore_rules import IgnoreMatcher, IgnoreRules
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_MODES = ("auto", "git", "walk")
+
+# Project-specific ignore file, honoured in every discovery mode
+RACAG_IGNORE_FILE = ".racagignore"
+
+
+class FileEntry(NamedTuple):
+    """A file found by the inventory walker."""
+
+    path: Path       # root / rel_path
+    rel_path: str    # POSIX path relative to the walk root
+    size: int
+    mtime_ns: int
+
+
+def walk_files(
+    root: Path,
+    excluded_dirs: Iterable[str] = (),
+    allowed_exts: Optional[Iterable[str]] = None,
+    excluded_exts: Iterable[str] = (),
+    ignore: Optional[IgnoreMatcher] = None,
+    nested_ignore_file: Optional[str] = None,
+    skip_paths: AbstractSet[str] = frozenset(),
+) -> Iterator[FileEntry]:
+    """
+    Walk `root` and yield every matching regular file.
+
+    Args:
+        root: Directory to walk
+        excluded_dirs: Directory names that are never descended into
+        allowed_exts: Lower-case suffixes to keep (None keeps everything)
+        excluded_exts: Lower-case suffixes to drop
+        ignore: Optional ignore matcher; matched directories are pruned
+        nested_ignore_file: Name of per-directory ignore files to pick up
+            while descending (e.g. ".gitignore")
+        skip_paths: Relative paths to leave out (checked before any stat)
+
+    Yields:
+        FileEntry for each file, in sorted depth-first order
+    """
+    root = Path(root)
+    excluded_dirs = frozenset(excluded_dirs)
+    allowed = frozenset(allowed_exts) if allowed_exts is not None else None
+    excluded = frozenset(excluded_exts)
+
+    # Stack of (absolute dir path, relative prefix, matcher); popped LIFO, so
+    # subdirectories are pushed in reverse to keep the output sorted.
+    stack = [(str(root), "", ignore)]
+    while stack:
+        dir_path, prefix, matcher = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            # Unreadable or vanished directory: skip it like rglob would
+            continue
+
+        if nested_ignore_file and prefix:
+            for entry in entries:
+                if entry.name == nested_ignore_file:
+                    rules = IgnoreRules.from_file(Path(entry.path), base=prefix)
+                    matcher = (matcher or IgnoreMatcher()).with_rules(rules)
+                    break
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            try:
+                # Directory symlinks are not followed (avoids cycles)
+                if entry.is_dir(follow_symlinks=False):
+                    if name in excluded_dirs:
+                        continue
+                    if matcher and matcher.is_ignored(prefix + name, is_dir=True):
+                        continue
+                    subdirs.append((entry.path, prefix + name + "/", matcher))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            rel_path = prefix + name
+            if rel_path in skip_paths:
+                continue
+            ext = os.path.splitext(name)[1].lower()
+            if ext in excluded:
+                continue
+            if allowed is not None and ext not in allowed:
+                continue
+            if matcher and matcher.is_ignored(rel_path):
+                continue
+
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+
+            yield FileEntry(root / rel_path, rel_path, st.st_size, st.st_mtime_ns)
+
+        stack.extend(reversed(subdirs))
+
+
+def _ls_untracked(root: Path) -> Optional[List[str]]:
+    """Untracked, non-ignored paths from `git ls-files`, or None without git."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+            cwd=root,
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.debug(f"git ls-files unavailable, walking for untracked files: {e}")
+        return None
+    return [p.decode("utf-8", errors="surrogateescape") for p in result.stdout.split(b"\0") if p]
+
+
+def _git_files(
+    root: Path,
+    excluded_dirs: frozenset,
+    allowed: Optional[frozenset],
+    excluded: frozenset,
+    racag_ignore: IgnoreMatcher,
+) -> Iterator[FileEntry]:
+    """Tracked files from .git/index plus untracked files that are not ignored."""
+    tracked = read_git_index(root)
+
+    def entry_for(rel_path: str) -> Optional[FileEntry]:
+        parts = rel_path.split("/")
+        if any(part in excluded_dirs for part in parts[:-1]):
+            return None
+        ext = os.path.splitext(parts[-1])[1].lower()
+        if ext in excluded or (allowed is not None and ext not in allowed):
+            return None
+        if racag_ignore and racag_ignore.is_path_ignored(rel_path):
+            return None
+        path = root / rel_path
+        try:
+            st = os.stat(path)
+        except OSError:
+            # Deleted in the work tree but still staged
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return FileEntry(path, rel_path, st.st_size, st.st_mtime_ns)
+
+    entries = [entry for entry in map(entry_for, tracked) if entry is not None]
+
+    untracked = _ls_untracked(root)
+    if untracked is not None:
+        entries.extend(entry for entry in map(entry_for, untracked) if entry is not None)
+    else:
+        # No git executable: walk, pruning everything .gitignore excludes
+        ignore = IgnoreMatcher.for_repo(root, (".gitignore", RACAG_IGNORE_FILE))
+        entries.extend(walk_files(
+            root,
+            excluded_dirs | {".git"},
+            allowed,
+            excluded,
+            ignore=ignore,
+            nested_ignore_file=".gitignore",
+            skip_paths=frozenset(tracked),
+        ))
+
+    entries.sort(key=lambda e: e.rel_path)
+    yield from entries
+
+
+def iter_repo_files(
+    root: Path,
+    mode: str = "auto",
+    excluded_dirs: Iterable[str] = (),
+    allowed_exts: Optional[Iterable[str]] = None,
+    excluded_exts: Iterable[str] = (),
+) -> Iterator[FileEntry]:
+    """
+    Enumerate the files of a repository.
+
+    Args:
+        root: Repository root
+        mode: "git" (tracked + untracked-but-not-ignored files from the git
+            index), "walk" (scandir walk with excluded_dirs) or "auto" (git
+            when root is a git work tree, walk otherwise)
+        excluded_dirs: Directory names that are always skipped
+        allowed_exts: Lower-case suffixes to keep (None keeps everything)
+        excluded_exts: Lower-case suffixes to drop
+
+    Yields:
+        FileEntry for each file
+    """
+    if mode not in DISCOVERY_MODES:
+        raise ValueError(f"Unknown file discovery mode: {mode}. Use one of {DISCOVERY_MODES}")
+
+    root = Path(root)
+    excluded_dirs = frozenset(excluded_dirs)
+    allowed = frozenset(allowed_exts) if allowed_exts is not None else None
+    excluded = frozenset(excluded_exts)
+    racag_ignore = IgnoreMatcher()
+    if (root / RACAG_IGNORE_FILE).is_file():
+        racag_ignore = IgnoreMatcher([IgnoreRules.from_file(root / RACAG_IGNORE_FILE)])
+
+    if mode in ("auto", "git") and find_git_dir(root) is not None:
+        try:
+            yield from _git_files(root, excluded_dirs, allowed, excluded, racag_ignore)
+            return
+        except GitIndexError as e:
+            if mode == "git":
+                raise
+            logger.warning(f"Falling back to directory walk: {e}")
+    elif mode == "git":
+        raise GitIndexError(f"{root} is not a git work tree")
+
+    yield from walk_files(root, excluded_dirs, allowed, excluded, ignore=racag_ignore)
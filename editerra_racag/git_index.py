@@ -0,0 +1,142 @@
+"""
+Minimal reader for the git index (.git/index).
+
+Lists tracked file paths without spawning `git` and without touching the
+working tree. Supports index versions 2, 3 and 4 (path prefix compression).
+Submodule entries (gitlinks) and sparse-checkout directory entries are
+skipped; conflicted paths are reported once.
+"""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import List, Optional
+
+_HEADER = struct.Struct(">4sII")
+# ctime(s, ns) mtime(s, ns) dev ino mode uid gid size
+_STAT = struct.Struct(">10I")
+
+_MODE_TYPE_MASK = 0o170000
+_MODE_GITLINK = 0o160000
+_MODE_DIRECTORY = 0o040000
+
+_FLAG_EXTENDED = 0x4000
+_NAME_MASK = 0x0FFF
+
+
+class GitIndexError(ValueError):
+    """Raised when the index file is missing or cannot be parsed."""
+
+
+def find_git_dir(repo_root: Path) -> Optional[Path]:
+    """Return the git directory for a work tree (handles `.git` files of worktrees)."""
+    dot_git = Path(repo_root) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        try:
+            content = dot_git.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = (Path(repo_root) / git_dir).resolve()
+            return git_dir if git_dir.is_dir() else None
+    return None
+
+
+def _object_id_size(git_dir: Path) -> int:
+    """20 bytes for SHA-1 repositories, 32 for SHA-256 ones."""
+    config = git_dir / "config"
+    try:
+        text = config.read_text(encoding="utf-8", errors="replace").lower()
+    except OSError:
+        return 20
+    return 32 if "objectformat = sha256" in text else 20
+
+
+def read_git_index(repo_root: Path) -> List[str]:
+    """
+    Read the tracked file paths of a repository.
+
+    Args:
+        repo_root: Work tree root
+
+    Returns:
+        POSIX paths relative to repo_root, in index (sorted) order
+
+    Raises:
+        GitIndexError: If there is no readable index
+    """
+    git_dir = find_git_dir(repo_root)
+    if git_dir is None:
+        raise GitIndexError(f"{repo_root} is not a git work tree")
+
+    index_path = git_dir / "index"
+    try:
+        data = index_path.read_bytes()
+    except OSError as e:
+        raise GitIndexError(f"Cannot read {index_path}: {e}") from e
+
+    if len(data) < _HEADER.size:
+        raise GitIndexError(f"{index_path} is truncated")
+    signature, version, count = _HEADER.unpack_from(data, 0)
+    if signature != b"DIRC":
+        raise GitIndexError(f"{index_path} has a bad signature")
+    if version not in (2, 3, 4):
+        raise GitIndexError(f"Unsupported git index version {version}")
+
+    oid_size = _object_id_size(git_dir)
+    paths: List[str] = []
+    pos = _HEADER.size
+    previous = b""
+
+    try:
+        for _ in range(count):
+            entry_start = pos
+            mode = _STAT.unpack_from(data, pos)[6]
+            pos += _STAT.size + oid_size
+            (flags,) = struct.unpack_from(">H", data, pos)
+            pos += 2
+            if version >= 3 and flags & _FLAG_EXTENDED:
+                pos += 2
+
+            if version == 4:
+                # Varint: number of bytes to strip from the previous path
+                byte = data[pos]
+                pos += 1
+                strip = byte & 0x7F
+                while byte & 0x80:
+                    strip += 1
+                    byte = data[pos]
+                    pos += 1
+                    strip = (strip << 7) + (byte & 0x7F)
+                end = data.index(b"\0", pos)
+                name = previous[:len(previous) - strip] + data[pos:end]
+                pos = end + 1
+            else:
+                name_len = flags & _NAME_MASK
+                if name_len < _NAME_MASK:
+                    end = pos + name_len
+                else:
+                    end = data.index(b"\0", pos)
+                name = data[pos:end]
+                # Entries are NUL-padded to a multiple of 8 bytes
+                entry_len = end - entry_start
+                pos = entry_start + (entry_len + 8) // 8 * 8
+            previous = name
+
+            kind = mode & _MODE_TYPE_MASK
+            if kind in (_MODE_GITLINK, _MODE_DIRECTORY):
+                continue
+            path = name.decode("utf-8", errors="surrogateescape")
+            # Conflicted paths appear once per stage; keep the first
+            if paths and paths[-1] == path:
+                continue
+            paths.append(path)
+    except (IndexError, ValueError, struct.error) as e:
+        raise GitIndexError(f"{index_path} is corrupt: {e}") from e
+
+    return paths
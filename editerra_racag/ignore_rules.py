@@ -0,0 +1,209 @@
+"""
+Compiled .gitignore / .racagignore matching.
+
+Implements the gitignore pattern rules that matter for file discovery:
+
+- blank lines and `#` comments are skipped, `\\#` / `\\!` escape them
+- `!pattern` re-includes a previously ignored path (last match wins)
+- a trailing `/` only matches directories
+- a pattern containing a `/` is anchored to the directory of the ignore
+  file; otherwise it matches a name at any depth
+- `*`, `?`, `[...]` and `**` behave as in git
+
+Each pattern is translated to a regular expression once. Rule sets without
+negations are additionally folded into a single alternation, so the common
+case costs one regex search per path.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regex body."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                at_start = i == 0 or pattern[i - 1] == "/"
+                at_end = i + 2 == n or pattern[i + 2] == "/"
+                if at_start and at_end:
+                    if i + 2 == n:
+                        out.append(".*")             # trailing "/**"
+                        i += 2
+                    else:
+                        out.append("(?:.*/)?")       # leading or middle "**/"
+                        i += 3
+                    continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _parse_line(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """Parse one ignore line into (regex, negated, dir_only) or None."""
+    line = line.rstrip("\n").rstrip("\r")
+    # Trailing spaces are ignored unless escaped
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+
+    negated = False
+    if line.startswith("!"):
+        negated = True
+        line = line[1:]
+    elif line.startswith("\\#") or line.startswith("\\!"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    anchored = "/" in line
+    line = line.lstrip("/")
+    body = _translate_glob(line)
+    if not anchored:
+        body = "(?:.*/)?" + body
+    return body, negated, dir_only
+
+
+class IgnoreRules:
+    """Patterns from one ignore file, relative to the file's directory."""
+
+    def __init__(self, lines: Sequence[str], base: str = ""):
+        """
+        Args:
+            lines: Raw lines of the ignore file
+            base: POSIX directory (relative to the walk root) the file lives in,
+                "" for the root; patterns only apply below it
+        """
+        self.base = base.strip("/") + "/" if base.strip("/") else ""
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            parsed = _parse_line(line)
+            if parsed is None:
+                continue
+            body, negated, dir_only = parsed
+            self.rules.append((re.compile(body + r"\Z", re.DOTALL), negated, dir_only))
+
+        # Fast path: without negations, order does not matter
+        self._combined: Optional[Tuple[Optional[re.Pattern], Optional[re.Pattern]]] = None
+        if self.rules and not any(neg for _, neg, _ in self.rules):
+            any_kind = [r.pattern for r, _, d in self.rules if not d]
+            dirs = [r.pattern for r, _, d in self.rules if d]
+            self._combined = (
+                re.compile("|".join(f"(?:{p})" for p in any_kind), re.DOTALL) if any_kind else None,
+                re.compile("|".join(f"(?:{p})" for p in dirs), re.DOTALL) if dirs else None,
+            )
+
+    @classmethod
+    def from_file(cls, path: Path, base: str = "") -> "IgnoreRules":
+        try:
+            text = Path(path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            text = ""
+        return cls(text.splitlines(), base)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Return True (ignored), False (re-included) or None (no rule matched).
+
+        Args:
+            rel_path: POSIX path relative to the walk root
+            is_dir: Whether the path is a directory
+        """
+        if self.base:
+            if not rel_path.startswith(self.base):
+                return None
+            rel_path = rel_path[len(self.base):]
+
+        if self._combined is not None:
+            any_kind, dirs = self._combined
+            if any_kind is not None and any_kind.match(rel_path):
+                return True
+            if is_dir and dirs is not None and dirs.match(rel_path):
+                return True
+            return None
+
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negated
+        return None
+
+
+class IgnoreMatcher:
+    """A stack of IgnoreRules; later (deeper) rule sets take precedence."""
+
+    def __init__(self, rule_sets: Sequence[IgnoreRules] = ()):
+        self.rule_sets: List[IgnoreRules] = [r for r in rule_sets if r.rules]
+
+    @classmethod
+    def for_repo(cls, repo_root: Path, ignore_files: Sequence[str] = (".gitignore",)) -> "IgnoreMatcher":
+        """Load root-level ignore files (plus .git/info/exclude for .gitignore)."""
+        repo_root = Path(repo_root)
+        rule_sets = []
+        exclude = repo_root / ".git" / "info" / "exclude"
+        if ".gitignore" in ignore_files and exclude.is_file():
+            rule_sets.append(IgnoreRules.from_file(exclude))
+        for name in ignore_files:
+            path = repo_root / name
+            if path.is_file():
+                rule_sets.append(IgnoreRules.from_file(path))
+        return cls(rule_sets)
+
+    def with_rules(self, rules: IgnoreRules) -> "IgnoreMatcher":
+        """Return a new matcher with an extra (nested) rule set on top."""
+        if not rules.rules:
+            return self
+        return IgnoreMatcher(self.rule_sets + [rules])
+
+    def __bool__(self) -> bool:
+        return bool(self.rule_sets)
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Whether this exact path is ignored (parents are not checked)."""
+        for rules in reversed(self.rule_sets):
+            result = rules.match(rel_path, is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def is_path_ignored(self, rel_path: str) -> bool:
+        """Whether a file, or any of its parent directories, is ignored."""
+        parts = rel_path.split("/")
+        for i in range(1, len(parts)):
+            if self.is_ignored("/".join(parts[:i]), is_dir=True):
+                return True
+        return self.is_ignored(rel_path, is_dir=False)
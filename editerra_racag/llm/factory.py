@@ -5,11 +5,14 @@ LLM Provider Factory
 Creates the appropriate LLM provider based on configuration.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
+import os
 
-from editerra_racag.config import EditerraConfig
+import requests
+
+from editerra_racag.config import DEFAULT_CONFIG, EditerraConfig
 from editerra_racag.llm.base import LLMProvider
-from editerra_racag.llm.providers import OpenAIProvider, OllamaProvider
+from editerra_racag.llm.providers import OpenAIProvider, OllamaProvider, LocalProvider
 
 
 def get_provider(config: EditerraConfig) -> LLMProvider:
@@ -34,6 +37,9 @@ def get_provider(config: EditerraConfig) -> LLMProvider:
     elif provider_name == "ollama":
         return OllamaProvider(provider_config)
     
+    elif provider_name == "local":
+        return LocalProvider(provider_config)
+    
     # Future providers
     elif provider_name == "anthropic":
         raise NotImplementedError("Anthropic provider coming soon!")
@@ -50,10 +56,32 @@ def get_provider(config: EditerraConfig) -> LLMProvider:
     else:
         raise ValueError(
             f"Unknown LLM provider: {provider_name}. "
-            f"Supported providers: openai, ollama"
+            f"Supported providers: openai, ollama, local"
         )
 
 
+def get_available_providers() -> List[str]:
+    """
+    Names of the providers usable in this environment.
+    
+    The local provider always is; OpenAI needs OPENAI_API_KEY and Ollama a
+    server answering at the default URL.
+    """
+    available = ["local"]
+    
+    if os.getenv("OPENAI_API_KEY"):
+        available.append("openai")
+    
+    try:
+        response = requests.get(f"{DEFAULT_CONFIG['ollama']['base_url']}/api/tags", timeout=1)
+        if response.status_code == 200:
+            available.append("ollama")
+    except Exception:
+        pass
+    
+    return available
+
+
 # Global provider instance (lazy-loaded)
 _global_provider: LLMProvider | None = None
 
@@ -2,5 +2,6 @@
 
 from editerra_racag.llm.providers.openai_provider import OpenAIProvider
 from editerra_racag.llm.providers.ollama_provider import OllamaProvider
+from editerra_racag.llm.providers.local_provider import LocalProvider
 
-__all__ = ["OpenAIProvider", "OllamaProvider"]
+__all__ = ["OpenAIProvider", "OllamaProvider", "LocalProvider"]
@@ -0,0 +1,130 @@
+"""
+Local LLM Provider
+==================
+
+Offline, deterministic embeddings with a hashing-trick vectorizer.
+
+Text is split into lowercased words and identifier parts (camelCase and
+snake_case are broken up, so `fetchUserData` also yields `fetch`, `user`,
+`data`), plus word n-grams. Each feature is hashed (CRC32) into one of
+`embedding_dimensions` buckets with a hash-derived sign, weighted by
+sublinear term frequency (1 + log tf), and the vector is L2-normalized.
+
+No model, no network: a large repository embeds in seconds on one CPU,
+and the same text always produces the same vector, which makes this the
+baseline provider for benchmarks and air-gapped installs. Matching is
+lexical, so retrieval quality is below that of a neural embedding model.
+"""
+
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+import logging
+import re
+import zlib
+
+import numpy as np
+
+from editerra_racag.llm.base import LLMProvider
+
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+_CAMEL = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+@lru_cache(maxsize=65536)
+def _word_parts(word: str) -> Tuple[str, ...]:
+    """Lowercased word followed by its camelCase / snake_case parts."""
+    lower = word.lower()
+    parts = [p.lower() for piece in word.split("_") for p in _CAMEL.findall(piece)]
+    if len(parts) <= 1:
+        return (lower,)
+    return (lower, *parts)
+
+
+@lru_cache(maxsize=262144)
+def _bucket(feature: str, dims: int) -> Tuple[int, float]:
+    """Hash bucket and sign of a feature."""
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % dims, (1.0 if h & 0x80000000 else -1.0)
+
+
+class LocalProvider(LLMProvider):
+    """Hashing-trick embedding provider (offline, deterministic)."""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+
+        self._embedding_dims = int(config.get("embedding_dimensions", 1024))
+        self.ngram_max = max(1, int(config.get("ngram_max", 2)))
+        if self._embedding_dims <= 0:
+            raise ValueError("local.embedding_dimensions must be positive")
+        # Part of the embedding cache key: bump when feature extraction changes
+        self.embedding_model = f"hashing-ngram{self.ngram_max}-v1"
+
+    def _features(self, text: str) -> Counter:
+        """Term frequencies of the features of one text."""
+        features = Counter()
+        words = _WORD.findall(text)
+        for word in words:
+            features.update(_word_parts(word))
+        words = [w.lower() for w in words]
+        for n in range(2, self.ngram_max + 1):
+            features.update(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+        return features
+
+    def _vectorize(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dims) matrix of L2-normalized hashed features."""
+        dims = self._embedding_dims
+        rows: List[int] = []
+        cols: List[int] = []
+        weights: List[float] = []
+        for row, text in enumerate(texts):
+            for feature, tf in self._features(text).items():
+                col, sign = _bucket(feature, dims)
+                rows.append(row)
+                cols.append(col)
+                weights.append(sign * (1.0 + np.log(tf)))
+
+        flat = np.asarray(rows, dtype=np.int64) * dims + np.asarray(cols, dtype=np.int64)
+        matrix = np.bincount(
+            flat, weights=np.asarray(weights, dtype=np.float64), minlength=len(texts) * dims
+        ).reshape(len(texts), dims)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (matrix / norms).astype(np.float32)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings locally."""
+        if not texts:
+            return []
+        return self._vectorize(texts).tolist()
+
+    def embed_single(self, text: str) -> List[float]:
+        """Generate embedding for a single text."""
+        embeddings = self.embed([text])
+        return embeddings[0] if embeddings else []
+
+    def rerank(self, query: str, candidates: List[str]) -> List[float]:
+        """
+        Score candidates by cosine similarity of their hashed features.
+        """
+        if not candidates:
+            return []
+
+        matrix = self._vectorize([query, *candidates])
+        scores = matrix[1:] @ matrix[0]
+        return [float(s) for s in np.clip(scores, 0.0, 1.0)]
+
+    @property
+    def embedding_dimensions(self) -> int:
+        """Return embedding dimensionality (configurable)."""
+        return self._embedding_dims
+
+    @property
+    def provider_name(self) -> str:
+        """Return provider name."""
+        return "local"
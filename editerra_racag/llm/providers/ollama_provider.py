@@ -5,9 +5,10 @@ Ollama LLM Provider
 Implementation using Ollama for local, free LLM inference.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 
 from editerra_racag.llm.base import LLMProvider
 
@@ -24,10 +25,21 @@ class OllamaProvider(LLMProvider):
         self.base_url = config.get("base_url", "http://localhost:11434")
         self.embedding_model = config.get("embedding_model", "nomic-embed-text")
         self.rerank_model = config.get("rerank_model", "llama3.1:8b")
+        self.keep_alive = config.get("keep_alive", "5m")
+        self.timeout = config.get("timeout", 120)
+        
+        # Keep-alive connection pool sized for the concurrent embedding requests
+        pool_size = max(1, int(config.get("max_concurrency", 1)))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Set when the server predates the batched /api/embed endpoint
+        self._legacy_embeddings: Optional[bool] = None
         
         # Test connection
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=2)
             if response.status_code != 200:
                 logger.warning("Ollama server not responding. Is it running?")
         except Exception as e:
@@ -35,34 +47,88 @@ class OllamaProvider(LLMProvider):
             logger.info("Install Ollama from https://ollama.ai or change llm_provider in config")
     
     def embed(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings using Ollama."""
+        """
+        Generate embeddings using Ollama.
+        
+        The whole batch is sent in one /api/embed request; servers older than
+        Ollama 0.3.4 fall back to one /api/embeddings request per text.
+        """
         if not texts:
             return []
         
-        embeddings = []
-        for text in texts:
+        if not self._legacy_embeddings:
             try:
-                response = requests.post(
-                    f"{self.base_url}/api/embeddings",
+                response = self.session.post(
+                    f"{self.base_url}/api/embed",
                     json={
                         "model": self.embedding_model,
-                        "prompt": text
+                        "input": list(texts),
+                        "keep_alive": self.keep_alive
                     },
-                    timeout=30
+                    timeout=self.timeout
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
-                    embeddings.append(data.get("embedding", []))
+                    self._legacy_embeddings = False
+                    embeddings = response.json().get("embeddings") or []
+                    if len(embeddings) == len(texts):
+                        return embeddings
+                    logger.error(
+                        f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs"
+                    )
+                    return [[] for _ in texts]
+                if response.status_code == 404 and self._model_error(response):
+                    # The endpoint exists; the model does not (e.g. not pulled yet)
+                    logger.error(f"Ollama embedding failed: {self._model_error(response)}")
+                    return [[] for _ in texts]
+                if response.status_code == 404 and self._legacy_embeddings is None:
+                    logger.info("Ollama server has no /api/embed; using /api/embeddings")
+                    self._legacy_embeddings = True
                 else:
                     logger.error(f"Ollama embedding failed: {response.text}")
-                    embeddings.append([])
+                    return [[] for _ in texts]
             
             except Exception as e:
                 logger.error(f"Ollama embedding request failed: {e}")
-                embeddings.append([])
+                return [[] for _ in texts]
+        
+        return [self._embed_legacy(text) for text in texts]
+    
+    @staticmethod
+    def _model_error(response) -> Optional[str]:
+        """
+        The error message of a JSON error response (e.g. model not found).
+        
+        A missing endpoint on older servers is a plain-text 404 instead.
+        """
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        if isinstance(body, dict) and body.get("error"):
+            return str(body["error"])
+        return None
+    
+    def _embed_legacy(self, text: str) -> List[float]:
+        """Embed one text with the pre-0.3.4 /api/embeddings endpoint."""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/embeddings",
+                json={
+                    "model": self.embedding_model,
+                    "prompt": text,
+                    "keep_alive": self.keep_alive
+                },
+                timeout=self.timeout
+            )
+            
+            if response.status_code == 200:
+                return response.json().get("embedding", [])
+            logger.error(f"Ollama embedding failed: {response.text}")
         
-        return embeddings
+        except Exception as e:
+            logger.error(f"Ollama embedding request failed: {e}")
+        return []
     
     def embed_single(self, text: str) -> List[float]:
         """Generate embedding for a single text."""
@@ -79,7 +145,7 @@ class OllamaProvider(LLMProvider):
         try:
             prompt = self._build_rerank_prompt(query, candidates)
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": self.rerank_model,
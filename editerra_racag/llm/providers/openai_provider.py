@@ -33,6 +33,8 @@ class OpenAIProvider(LLMProvider):
         self.embedding_model = config.get("embedding_model", "text-embedding-3-large")
         self.rerank_model = config.get("rerank_model", "gpt-4o-mini")
         self._embedding_dims = config.get("embedding_dimensions", 1536)
+        # text-embedding-3 models return shortened (Matryoshka) vectors on request
+        self._shorten = self.embedding_model.startswith("text-embedding-3")
     
     def embed(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts."""
@@ -40,9 +42,11 @@ class OpenAIProvider(LLMProvider):
             return []
         
         try:
+            kwargs = {"dimensions": self._embedding_dims} if self._shorten else {}
             response = self.client.embeddings.create(
                 model=self.embedding_model,
-                input=texts
+                input=texts,
+                **kwargs
             )
             return [item.embedding for item in response.data]
         except Exception as e:
@@ -1,14 +1,14 @@
 import sys
-from chromadb import PersistentClient
 from openai import OpenAI
 import os
 
+from editerra_racag.db import create_vector_store
+
 # Load OpenAI key
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-# Init ChromaDB client
-chroma_client = PersistentClient(path="racag/db/chroma_store")
-collection = chroma_client.get_or_create_collection(name="kairos_chunks")
+# Init vector store
+store = create_vector_store("racag/db/chroma_store", "kairos_chunks")
 
 def embed_query(query: str):
     """Embed the search query"""
@@ -19,21 +19,15 @@ def embed_query(query: str):
     return response.data[0].embedding
 
 def search(query: str, top_k: int = 3):
-    """Query ChromaDB and return top-k results"""
+    """Query the vector store and return top-k results"""
     query_vector = embed_query(query)
-    results = collection.query(
-        query_embeddings=[query_vector],
-        n_results=top_k
-    )
-
-    docs = results["documents"][0]
-    metadata = results["metadatas"][0]
+    hits = store.query(query_vector, top_k)
 
-    for i, doc in enumerate(docs):
+    for i, hit in enumerate(hits):
         print(f"\n🔹 Match {i+1}:")
-        print(f"📄 File: {metadata[i]['file']} ({metadata[i]['lines']})")
-        print(f"🧠 Chunk ID: {metadata[i]['chunk_id']}")
-        print("📜 Text:\n" + doc.strip())
+        print(f"📄 File: {hit.metadata['file']} ({hit.metadata['lines']})")
+        print(f"🧠 Chunk ID: {hit.metadata['chunk_id']}")
+        print("📜 Text:\n" + hit.document.strip())
 
 if __name__ == "__main__":
     if len(sys.argv) < 3 or sys.argv[1] != "--query":
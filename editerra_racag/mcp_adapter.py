@@ -9,7 +9,7 @@ import logging
 import sys
 from typing import Any
 
-from editerra_racag.runtime.racag_runtime import run_racag
+from editerra_racag.runtime.racag_runtime import health_check, run_racag, warm_up
 
 
 def _disable_verbose_logging() -> None:
@@ -34,7 +34,7 @@ def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Run RACAG retrieval and emit JSON context for MCP clients.",
     )
-    parser.add_argument("query", nargs="+", help="Natural language query to contextualise")
+    parser.add_argument("query", nargs="*", help="Natural language query to contextualise")
     parser.add_argument(
         "--top-k",
         dest="top_k",
@@ -42,6 +42,11 @@ def _parse_args() -> argparse.Namespace:
         default=3,
         help="Maximum number of chunks to return (default: 3)",
     )
+    parser.add_argument(
+        "--health",
+        action="store_true",
+        help="Open the vector store, probe it and emit its health instead of querying",
+    )
     return parser.parse_args()
 
 
@@ -53,6 +58,18 @@ def _emit(data: Any) -> None:
 
 def main() -> int:
     args = _parse_args()
+
+    if args.health:
+        _disable_verbose_logging()
+        try:
+            store = warm_up()
+            report = health_check()
+        except Exception as exc:  # pragma: no cover - defensive guard
+            _emit({"status": "error", "message": str(exc)})
+            return 1
+        _emit({"status": "ok" if report["ok"] else "degraded", "warm_up": store, **report})
+        return 0 if report["ok"] else 1
+
     query = " ".join(arg.strip() for arg in args.query).strip()
 
     if not query:
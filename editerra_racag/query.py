@@ -1,19 +1,22 @@
 # racag/query.py
 
 import json
+from pathlib import Path
+from typing import Optional
+
 from editerra_racag.retrieval.query_embedder import embed_query
 from editerra_racag.retrieval.semantic_retriever import semantic_search
 from editerra_racag.context.context_assembler import assemble_context
 from datetime import datetime
 
-def query_racag(text: str, top_k: int = 5):
+def query_racag(text: str, top_k: int = 5, workspace: Optional[Path] = None):
     print(f"\n🔍 Searching RACAG for: \"{text}\"\n")
 
     # Convert text → embedding
     q_emb = embed_query(text)
 
     # Retrieve chunks (new schema)
-    results = semantic_search(q_emb, top_k=top_k)
+    results = semantic_search(q_emb, top_k=top_k, workspace=workspace)
 
     if not results:
         print("⚠️ No results found.")
@@ -35,7 +38,7 @@ def query_racag(text: str, top_k: int = 5):
     context_bundle["_timestamp"] = datetime.now().isoformat()
 
     # Save the assembled context so Copilot or other tools can read it
-    with open("racag/logs/last_context.json", "w", encoding="utf-8") as f:
+    with open(Path(workspace or ".") / "racag/logs/last_context.json", "w", encoding="utf-8") as f:
         json.dump(context_bundle, f, indent=2)
 
     print("🧠 Context assembled → racag/logs/last_context.json")
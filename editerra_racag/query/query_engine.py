@@ -4,22 +4,22 @@ RACAG — Query Engine
 
 Responsibilities:
     1. Embed the user query
-    2. Retrieve top-N candidates from Chroma
+    2. Retrieve top-N candidates from the vector store
     3. Call the Rerank Engine (cosine + GPT-4.1-mini)
     4. Assemble clean final context response
 
 Dependencies:
     • embedding/model_loader
-    • chromadb persistent client
+    • vector store (editerra_racag.db)
     • reranker/rerank_engine
 """
 
 from __future__ import annotations
-from typing import List, Dict, Any
-
-import chromadb
-from chromadb.config import Settings
+from typing import List, Dict, Any, Optional
 
+from editerra_racag.db import VectorStore
+from editerra_racag.db.quantization import DEFAULT_OVERSAMPLE
+from editerra_racag.db.registry import get_quantized_index, get_store, registry
 from editerra_racag.reranker.rerank_engine import rerank_results
 from editerra_racag.reranker import model_loader as ml
 
@@ -68,11 +68,53 @@ class QueryEngine:
         coll_name: str = COLL_NAME,
         retrieve_k: int = RETRIEVE_K,
         final_k: int = FINAL_K,
+        quantization: Optional[str] = None,
+        oversample: int = DEFAULT_OVERSAMPLE,
+        vector_backend: str = "chroma",
     ):
         self.chroma_path = chroma_path
         self.coll_name = coll_name
         self.retrieve_k = retrieve_k
         self.final_k = final_k
+        # "int8" / "float16": search the quantized sidecar index instead of HNSW
+        self.quantization = quantization
+        self.oversample = oversample
+        # Vector store backend ("chroma" or "flat")
+        self.vector_backend = vector_backend
+
+    @property
+    def store(self) -> VectorStore:
+        # Opened once per process (on first use) and shared across queries
+        return get_store(self.chroma_path, self.coll_name, self.vector_backend)
+
+    def warm_up(self) -> Dict[str, Any]:
+        """Open the store and load its index ahead of the first query."""
+        return registry.warm_up(self.chroma_path, self.coll_name, self.vector_backend, self.quantization)
+
+    def _quantized_candidates(self, store: VectorStore, query_vec: List[float]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Candidates from the quantized sidecar index, or None if there is none.
+
+        Only the candidates' float32 vectors are read (from the sidecar's
+        memory-mapped file); the store is asked for documents and metadata only.
+        """
+        if not self.quantization:
+            return None
+        index = get_quantized_index(self.chroma_path, self.coll_name, self.quantization)
+        if index is None:
+            return None
+        ids = [cid for cid, _ in index.search(query_vec, self.retrieve_k, self.oversample)]
+        stored = {hit.id: hit for hit in store.get(ids)}
+        return [
+            {
+                "id": cid,
+                "chunk_text": stored[cid].document,
+                "metadata": stored[cid].metadata,
+                "embedding": vector,
+            }
+            for cid, vector in zip(ids, index.vectors(ids))
+            if cid in stored and vector is not None
+        ]
 
     def run(self, user_query: str) -> Dict[str, Any]:
         """
@@ -90,34 +132,24 @@ class QueryEngine:
         query_vec = ml.embed_text(user_query)
         logger.debug("Query embedded successfully.")
 
-        # Step 2 — retrieve from Chroma
-        client = chromadb.PersistentClient(
-            path=self.chroma_path,
-            settings=Settings(anonymized_telemetry=False),
-        )
-        col = client.get_collection(self.coll_name)
-
-        logger.debug(f"Retrieving top {self.retrieve_k} candidates from Chroma…")
-        results = col.query(
-            query_embeddings=[query_vec],
-            n_results=self.retrieve_k,
-            include=["documents", "metadatas", "embeddings"],
-        )
-
-        # Flatten Chroma output
-        candidates: List[Dict[str, Any]] = []
-        if results and results.get("ids") and results["ids"][0]:
-            for i in range(len(results["ids"][0])):
-                md = results["metadatas"][0][i]
-                md = md if isinstance(md, dict) else {}
-                candidates.append(
-                    {
-                        "id": results["ids"][0][i],
-                        "chunk_text": results["documents"][0][i],
-                        "metadata": md,
-                        "embedding": results["embeddings"][0][i],
-                    }
-                )
+        # Step 2 — retrieve from the vector store
+        candidates = self._quantized_candidates(self.store, query_vec)
+        if candidates is not None:
+            logger.debug(f"Retrieved top {self.retrieve_k} candidates from the quantized index")
+        else:
+            logger.debug(f"Retrieving top {self.retrieve_k} candidates from {self.vector_backend}…")
+            hits = self.store.query(
+                query_vec, self.retrieve_k, include=["documents", "metadatas", "embeddings"]
+            )
+            candidates = [
+                {
+                    "id": hit.id,
+                    "chunk_text": hit.document,
+                    "metadata": hit.metadata if isinstance(hit.metadata, dict) else {},
+                    "embedding": hit.embedding,
+                }
+                for hit in hits
+            ]
 
         logger.debug(f"Retrieved {len(candidates)} raw candidates.")
         if not candidates:
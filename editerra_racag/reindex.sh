@@ -71,7 +71,7 @@ CHUNK_COUNT=$(wc -l < racag/output/chunks.jsonl | xargs)
 echo "   Chunks indexed: $CHUNK_COUNT"
 
 # Query DB to get embedding count
-DB_COUNT=$(python3 -c "from chromadb import PersistentClient; c = PersistentClient(path='racag/db/chroma_store'); print(c.get_or_create_collection('kairos_chunks').count())")
+DB_COUNT=$(python3 -c "from editerra_racag.db import create_vector_store; print(create_vector_store('racag/db/chroma_store', 'kairos_chunks').count())")
 echo "   Embeddings stored: $DB_COUNT"
 
 if [ "$CHUNK_COUNT" -eq "$DB_COUNT" ]; then
@@ -1,16 +1,74 @@
 import math
-from typing import List, Dict
-from chromadb import PersistentClient
+from pathlib import Path
+from typing import Any, List, Dict, Optional
+
+from editerra_racag.db.base import VectorStore
+from editerra_racag.db.quantization import DEFAULT_OVERSAMPLE, QuantizedIndex
+from editerra_racag.db.registry import get_quantized_index, get_store, registry
 
 class SemanticRetriever:
-    """Semantic search using ChromaDB."""
+    """Semantic search over the configured vector store."""
     
-    def __init__(self, db_path: str, collection_name: str, llm_provider=None):
+    def __init__(
+        self,
+        db_path: str,
+        collection_name: str,
+        llm_provider=None,
+        quantization: Optional[str] = None,
+        oversample: int = DEFAULT_OVERSAMPLE,
+        vector_backend: str = "chroma"
+    ):
+        """
+        Args:
+            db_path: Vector database directory
+            collection_name: Collection to search
+            llm_provider: Provider used to embed queries
+            quantization: "int8" / "float16" to search the collection's quantized
+                sidecar index (with float32 rescoring) instead of the store
+            oversample: Candidates rescored per result in quantized search
+            vector_backend: Vector store backend ("chroma" or "flat")
+        """
         self.db_path = db_path
         self.collection_name = collection_name
         self.llm_provider = llm_provider
-        self.client = PersistentClient(path=db_path)
-        self.collection = self.client.get_or_create_collection(name=collection_name)
+        self.vector_backend = vector_backend
+        self.quantization = quantization
+        self.oversample = oversample
+    
+    @property
+    def store(self) -> VectorStore:
+        """The collection's shared store (reopened after registry.close_all())."""
+        return get_store(self.db_path, self.collection_name, self.vector_backend)
+    
+    def _quantized_index(self) -> Optional[QuantizedIndex]:
+        """The sidecar index, reloaded whenever indexing has saved a new one."""
+        if not self.quantization:
+            return None
+        return get_quantized_index(self.db_path, self.collection_name, self.quantization)
+    
+    def _retrieve_quantized(self, index: QuantizedIndex, query_embedding: List[float], top_k: int) -> List[Dict]:
+        hits = index.search(query_embedding, top_k, self.oversample)
+        stored = {hit.id: hit for hit in self.store.get([cid for cid, _ in hits])}
+        # Cosine similarity (rescored against float32 vectors), in rank order
+        return [
+            self._format_chunk(cid, stored[cid].document, stored[cid].metadata, score)
+            for cid, score in hits
+            if cid in stored
+        ]
+    
+    @staticmethod
+    def _format_chunk(chunk_id: str, document: str, metadata: Dict, score: float) -> Dict:
+        chunk = {
+            'id': chunk_id,
+            'content': document,
+            'score': score,
+            'metadata': metadata
+        }
+        # Extract common fields from metadata
+        chunk['file_path'] = metadata.get('file_path', 'unknown')
+        chunk['start_line'] = int(metadata.get('lines', '0-0').split('-')[0])
+        chunk['end_line'] = int(metadata.get('lines', '0-0').split('-')[1])
+        return chunk
     
     def retrieve(self, query: str, top_k: int = 5) -> List[Dict]:
         """
@@ -26,44 +84,34 @@ class SemanticRetriever:
         # Embed the query
         query_embedding = self.llm_provider.embed_single(query)
         
-        # Search in ChromaDB
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k
-        )
-        
-        # Format results
-        chunks = []
-        if results and results['ids']:
-            for i in range(len(results['ids'][0])):
-                chunk = {
-                    'id': results['ids'][0][i],
-                    'content': results['documents'][0][i],
-                    'score': 1.0 - results['distances'][0][i],  # Convert distance to similarity
-                    'metadata': results['metadatas'][0][i] if results['metadatas'] else {}
-                }
-                # Extract common fields from metadata
-                metadata = chunk['metadata']
-                chunk['file_path'] = metadata.get('file_path', 'unknown')
-                chunk['start_line'] = int(metadata.get('lines', '0-0').split('-')[0])
-                chunk['end_line'] = int(metadata.get('lines', '0-0').split('-')[1])
-                chunks.append(chunk)
+        index = self._quantized_index()
+        if index is not None and index.count():
+            return self._retrieve_quantized(index, query_embedding, top_k)
         
-        return chunks
+        # Search the vector store. Its distance depends on the collection's
+        # metric (Chroma defaults to L2), so score by cosine similarity as
+        # the quantized path does
+        hits = self.store.query(query_embedding, top_k, include=["documents", "metadatas", "embeddings"])
+        scored = [
+            (cosine_similarity(query_embedding, hit.embedding) if hit.embedding is not None else hit.score, hit)
+            for hit in hits
+        ]
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [
+            self._format_chunk(hit.id, hit.document, hit.metadata, score)
+            for score, hit in scored
+        ]
 
-# Legacy global instances for backward compatibility
-_default_client = None
-_default_collection = None
+# Legacy default store (resolved from the workspace, default the working
+# directory) for backward compatibility
+def _get_default_store(workspace: Optional[Path] = None):
+    from editerra_racag.paths import resolve_db_path, resolve_collection_name
+    return get_store(resolve_db_path(workspace=workspace), resolve_collection_name())
 
-def _get_default_collection():
-    global _default_client, _default_collection
-    if _default_client is None:
-        from editerra_racag.paths import resolve_db_path, resolve_collection_name
-        _default_client = PersistentClient(path=resolve_db_path())
-        _default_collection = _default_client.get_or_create_collection(name=resolve_collection_name())
-    return _default_collection
-
-collection = property(lambda self: _get_default_collection())
+def warm_up_default_store(workspace: Optional[Path] = None) -> Dict[str, Any]:
+    """Open the default store and load its index before the first query."""
+    from editerra_racag.paths import resolve_db_path, resolve_collection_name
+    return registry.warm_up(resolve_db_path(workspace=workspace), resolve_collection_name())
 
 # ---------- BASIC COSINE SIMILARITY ----------
 def cosine_similarity(a: List[float], b: List[float]) -> float:
@@ -74,29 +122,18 @@ def cosine_similarity(a: List[float], b: List[float]) -> float:
         return 0.0
     return dot / (norm_a * norm_b)
 
-# ---------- MAIN SEARCH USING CHROMA ----------
-def semantic_search(query_embedding: List[float], top_k: int = 5) -> List[Dict]:
+# ---------- MAIN SEARCH USING THE DEFAULT STORE ----------
+def semantic_search(query_embedding: List[float], top_k: int = 5, workspace: Optional[Path] = None) -> List[Dict]:
     """
-    Runs vector similarity search over ChromaDB using the RACAG unified metadata format.
+    Runs vector similarity search over the default store using the RACAG unified metadata format.
     """
 
-    # Query Chroma
-    results = collection.query(
-        query_embeddings=[query_embedding],
-        n_results=top_k,
-        include=["metadatas", "documents", "distances"]
-    )
-
     out = []
-    ids = results.get("ids", [[]])[0]
-    metas = results.get("metadatas", [[]])[0]
-    dists = results.get("distances", [[]])[0]
-
-    for chunk_id, meta, dist in zip(ids, metas, dists):
+    for hit in _get_default_store(workspace).query(query_embedding, top_k, include=["metadatas"]):
         out.append({
-            "chunk_id": chunk_id,
-            "score": 1 / (1 + dist),  # convert distance → similarity
-            "metadata": meta
+            "chunk_id": hit.id,
+            "score": 1 / (1 + hit.distance),  # convert distance → similarity
+            "metadata": hit.metadata
         })
 
     return out
\ No newline at end of file
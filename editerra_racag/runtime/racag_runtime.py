@@ -14,11 +14,17 @@ This file exposes a single clean call:
 
 Which produces the final LLM-ready "Context Packet"
 (used by Copilot, VSCode, or the Kairos iOS adapter).
+
+Long-running hosts (API servers) call warm_up() at startup and expose
+health_check(); the vector store is opened once per process through the
+shared registry in editerra_racag.db.registry.
 """
 
 from __future__ import annotations
 from typing import Dict, Any, List
 
+from editerra_racag.config import get_config
+from editerra_racag.db.registry import registry
 from editerra_racag.query.query_engine import QueryEngine
 from editerra_racag.reranker.rerank_engine import ReRanker
 from editerra_racag.context.context_assembler import assemble_context
@@ -28,10 +34,35 @@ from editerra_racag.context.context_assembler import assemble_context
 # Instantiate global components (cached, not recreated per call)
 # ============================================================
 
-query_engine = QueryEngine()
+# Store, backend and quantization come from the workspace configuration
+# (.editerra-racag.yaml in the working directory), as in EditerraEngine
+config = get_config()
+registry.max_readers = config.get("store_max_readers", registry.max_readers)
+
+query_engine = QueryEngine(
+    chroma_path=str(config.db_path),
+    coll_name=config.collection_name,
+    quantization=config.get("vector_quantization"),
+    oversample=config.get("quantization_oversample", 4),
+    vector_backend=config.get("vector_backend", "chroma"),
+)
 reranker = ReRanker()
 
 
+# ============================================================
+# LIFECYCLE
+# ============================================================
+
+def warm_up() -> Dict[str, Any]:
+    """Open the query engine's store and load its index before the first query."""
+    return query_engine.warm_up()
+
+
+def health_check() -> Dict[str, Any]:
+    """Status of every vector store open in this process."""
+    return registry.health_check()
+
+
 # ============================================================
 # MAIN PIPELINE
 # ============================================================
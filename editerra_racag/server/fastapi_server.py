@@ -11,8 +11,9 @@ It is safe for production and usable by:
 - Fastify backend
 - Local dev
 
-Endpoint:
+Endpoints:
     POST /racag/query
+    GET  /health
 
 Request JSON:
 {
@@ -39,6 +40,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from editerra_racag.adapters.backend_adapter import build_backend_response
+from editerra_racag.db.registry import registry
+from editerra_racag.runtime import racag_runtime
 
 
 # -------------------------------
@@ -69,15 +72,39 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def warm_up_store():
+    # Open the vector store once, before the first request
+    try:
+        racag_runtime.warm_up()
+    except Exception as e:
+        print(f"⚠️ Vector store warm-up failed: {e}")
+
+
+@app.on_event("shutdown")
+def close_stores():
+    registry.close_all()
+
+
 @app.get("/")
 async def home():
     return {"status": "ok", "message": "RACAG FastAPI server running"}
 
 
+@app.get("/health")
+def health():
+    report = racag_runtime.health_check()
+    return {"status": "ok" if report["ok"] else "degraded", **report}
+
+
 @app.post("/racag/query")
-async def racag_query(request: RACAGRequest):
+def racag_query(request: RACAGRequest):
     """
     Accepts a RACAG query request and returns structured JSON.
+
+    A plain (sync) endpoint: FastAPI runs it in its threadpool, so queries
+    are served in parallel instead of blocking the event loop, and their
+    store reads share the store's bounded reader pool.
     """
 
     result = build_backend_response(
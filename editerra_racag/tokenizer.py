@@ -0,0 +1,63 @@
+"""
+Shared token counting for Editerra RAC-CAG.
+
+Uses tiktoken (cl100k_base) when it is installed and falls back to the
+~4 characters per token heuristic otherwise. The encoding is loaded once
+per process.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List
+
+try:  # pragma: no cover - optional dependency
+    import tiktoken  # type: ignore
+except ImportError:  # pragma: no cover
+    tiktoken = None
+
+ENCODING_NAME = "cl100k_base"
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def get_encoding(name: str = ENCODING_NAME):
+    """Return the tiktoken encoding, or None if tiktoken is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        # e.g. no network to download the BPE file
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in `text` (at least 1 for non-empty text)."""
+    if not text:
+        return 0
+    enc = get_encoding()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def split_to_tokens(text: str, max_tokens: int) -> List[str]:
+    """Cut `text` into consecutive pieces of at most `max_tokens` tokens each."""
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    enc = get_encoding()
+    if enc is None:
+        step = max_tokens * CHARS_PER_TOKEN
+        return [text[i:i + step] for i in range(0, len(text), step)] or [""]
+    tokens = enc.encode(text, disallowed_special=())
+    # Decoding arbitrary token slices can split a multi-byte character;
+    # the replacement character is acceptable at a hard cut.
+    return [enc.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)] or [""]
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Return the longest prefix of `text` that fits in `max_tokens` tokens."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    return split_to_tokens(text, max_tokens)[0]
@@ -5,7 +5,7 @@ from threading import Thread
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
-from editerra_racag.chunking.code_chunker import extract_code_chunks
+from editerra_racag.chunking.incremental import IncrementalChunker
 from editerra_racag.embedding.prompt_formatter import format_chunk_as_prompt
 
 
@@ -16,6 +16,9 @@ class SwiftFileHandler(FileSystemEventHandler):
     def __init__(self, prompts_dir: str):
         super().__init__()
         self.prompts_dir = prompts_dir
+        # Keeps the last parse tree of recently edited files so a save only
+        # reparses (and re-emits) what changed.
+        self.chunker = IncrementalChunker()
         os.makedirs(prompts_dir, exist_ok=True)
 
     def on_modified(self, event):
@@ -26,16 +29,20 @@ class SwiftFileHandler(FileSystemEventHandler):
         print(f"\n📝 Swift file modified: {file_path}")
 
         try:
-            chunks = extract_code_chunks(file_path)
+            chunks, incremental = self.chunker.update(file_path)
         except Exception as e:
             print(f"❌ Failed to extract chunks from {file_path}: {e}")
             return
 
         if not chunks:
-            print("⚠️ No valid chunks extracted.")
+            if incremental:
+                print("ℹ️ No declarations changed.")
+            else:
+                print("⚠️ No valid chunks extracted.")
             return
 
-        print(f"✅ Extracted {len(chunks)} chunks:")
+        label = "changed" if incremental else "extracted"
+        print(f"✅ {len(chunks)} chunks {label}:")
         for chunk in chunks:
             chunk_id = chunk.get("chunk_id", "UNKNOWN")
             chunk_lines = chunk.get("lines", "??–??")
@@ -54,6 +61,10 @@ class SwiftFileHandler(FileSystemEventHandler):
             except Exception as e:
                 print(f"❌ Failed to write prompt file: {e}")
 
+    def on_deleted(self, event):
+        if not event.is_directory and event.src_path.endswith(".swift"):
+            self.chunker.forget(event.src_path)
+
 
 class SwiftWatcherThread(Thread):
     def __init__(self, prompts_dir: str):
@@ -14,6 +14,11 @@ The watcher monitors:
 - /android/** (Android code)
 - /.github/** (GitHub configs & instructions)
 - /infra/** (Infrastructure configs)
+
+Reindexing runs in a separate process. Its store writes take an exclusive
+lock on the database (see editerra_racag.db.executor), so a running API
+server keeps answering queries between write batches instead of racing
+the upserts.
 """
 
 import os
@@ -0,0 +1,149 @@
+"""Tests for token-targeted chunk balancing."""
+
+import pytest
+
+from editerra_racag.chunking.balancer import (
+    ChunkBudget,
+    balance_chunks,
+    iter_balanced_chunks,
+    split_chunk,
+)
+from editerra_racag.tokenizer import count_tokens
+
+BUDGET = ChunkBudget(target_tokens=60, min_tokens=20, max_tokens=100, overlap_tokens=10)
+
+
+def _chunk(text: str, start_line: int, symbol: str, file_path: str = "src/app.py", **extra):
+    return {
+        "chunk_id": f"{file_path}::{symbol}",
+        "chunk_text": text,
+        "file_path": file_path,
+        "start_line": start_line,
+        "end_line": start_line + text.count("\n"),
+        "symbol": symbol,
+        "function": symbol,
+        "tags": ["function"],
+        **extra,
+    }
+
+
+def _lines(prefix: str, count: int) -> str:
+    return "\n".join(f"{prefix}_{i} = compute_value({i}, factor={i * 3})" for i in range(count))
+
+
+def _line_cost(line: str) -> int:
+    return count_tokens(line) + 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"min_tokens": 0},
+        {"min_tokens": 500},
+        {"max_tokens": 300},
+        {"overlap_tokens": 400},
+    ],
+)
+def test_invalid_budget(kwargs):
+    with pytest.raises(ValueError):
+        ChunkBudget(**kwargs)
+
+
+def test_budget_key_tracks_every_field():
+    assert BUDGET.key == "60-20-100-10"
+
+
+def test_small_neighbours_are_merged():
+    chunks = [_chunk(f"def f{i}(): pass", i * 2 + 1, f"f{i}") for i in range(3)]
+    merged = balance_chunks(chunks, BUDGET)
+    assert len(merged) == 1
+    assert merged[0]["chunk_text"] == "\n\n".join(c["chunk_text"] for c in chunks)
+    assert (merged[0]["start_line"], merged[0]["end_line"]) == (1, 5)
+    assert merged[0]["symbol"] == "f0..f2"
+    assert merged[0]["function"] == ""
+
+
+def test_merge_stops_at_target_and_file_boundary():
+    small = "def f(): pass"
+    chunks = [
+        _chunk(small, 1, "a"),
+        _chunk(small, 3, "b", file_path="src/other.py"),
+        _chunk(_lines("x", 4), 5, "c", file_path="src/other.py"),
+    ]
+    assert count_tokens(small) + count_tokens(chunks[2]["chunk_text"]) <= BUDGET.target_tokens
+    balanced = balance_chunks(chunks, BUDGET)
+    assert [c["file_path"] for c in balanced] == ["src/app.py", "src/other.py"]
+    assert balanced[1]["symbol"] == "b..c"
+
+
+def test_nested_chunks_are_not_merged_into_their_parent():
+    parent = _chunk("class A:\n    def m(self): pass", 1, "A")
+    child = _chunk("def m(self): pass", 2, "m")
+    assert len(balance_chunks([parent, child], BUDGET)) == 2
+
+
+def test_oversized_chunk_is_split_with_overlap():
+    text = _lines("value", 40)
+    longest = max(_line_cost(line) for line in text.split("\n"))
+    # Room for about six lines per piece and one line of overlap
+    budget = ChunkBudget(
+        target_tokens=6 * longest, min_tokens=1, max_tokens=8 * longest, overlap_tokens=longest
+    )
+    assert count_tokens(text) > budget.max_tokens
+    pieces = split_chunk(_chunk(text, 10, "big"), budget)
+
+    assert len(pieces) > 1
+    for i, piece in enumerate(pieces, 1):
+        assert count_tokens(piece["chunk_text"]) <= budget.max_tokens
+        assert f"part:{i}/{len(pieces)}" in piece["tags"]
+        assert piece["symbol"] == f"big#part{i}"
+    assert pieces[0]["start_line"] == 10
+    assert pieces[-1]["end_line"] == 49
+    # Each piece repeats the last line of the previous one
+    for previous, piece in zip(pieces, pieces[1:]):
+        assert piece["start_line"] == previous["end_line"]
+        assert piece["chunk_text"].split("\n")[0] == previous["chunk_text"].split("\n")[-1]
+    # Every source line survives the split
+    lines = text.split("\n")
+    covered = set()
+    for piece in pieces:
+        covered.update(piece["chunk_text"].split("\n"))
+    assert covered == set(lines)
+
+
+def test_split_prefers_blank_lines():
+    head = _lines("a", 4)
+    text = head + "\n\n" + _lines("b", 30)
+    head_cost = sum(_line_cost(line) for line in head.split("\n"))
+    # The blank line fits in the first piece, the first "b" line does not
+    budget = ChunkBudget(
+        target_tokens=head_cost + 2, min_tokens=1, max_tokens=4 * head_cost, overlap_tokens=0
+    )
+    pieces = split_chunk(_chunk(text, 1, "big"), budget)
+    assert pieces[0]["chunk_text"] == head
+    assert (pieces[0]["start_line"], pieces[0]["end_line"]) == (1, 4)
+
+
+def test_single_enormous_line_is_cut_by_tokens():
+    text = " ".join(f"token{i}" for i in range(2000))
+    pieces = split_chunk(_chunk(text, 7, "blob"), BUDGET)
+    assert len(pieces) > 1
+    assert all(count_tokens(p["chunk_text"]) <= BUDGET.target_tokens + 1 for p in pieces)
+    assert all((p["start_line"], p["end_line"]) == (7, 7) for p in pieces)
+    assert "".join(p["chunk_text"] for p in pieces).replace(" ", "") == text.replace(" ", "")
+
+
+def test_split_pieces_get_fresh_ids_and_hashes():
+    pieces = split_chunk(_chunk(_lines("value", 40), 1, "big"), BUDGET)
+    assert len({p["chunk_id"] for p in pieces}) == len(pieces)
+    assert len({p["content_hash"] for p in pieces}) == len(pieces)
+
+
+def test_iter_balanced_chunks_is_lazy():
+    def chunks():
+        for i in range(1000):
+            yield _chunk(_lines(f"v{i}", 3), i * 10 + 1, f"f{i}")
+
+    balanced = iter_balanced_chunks(chunks(), BUDGET)
+    first = next(balanced)
+    assert first["start_line"] == 1
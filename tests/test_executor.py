@@ -0,0 +1,186 @@
+"""Tests for the single-writer, multi-reader store executor."""
+
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from editerra_racag.db.executor import (
+    LOCK_FILENAME,
+    SerializedStore,
+    StoreExecutor,
+    _ReadWriteLock,
+    fcntl,
+)
+from editerra_racag.db.flat_index import FlatStore
+
+
+def _started(target, *args) -> threading.Thread:
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture(params=["in-process", "flock"])
+def lock(request, tmp_path: Path):
+    if request.param == "flock" and fcntl is None:
+        pytest.skip("fcntl is not available")
+    rw = _ReadWriteLock(tmp_path / LOCK_FILENAME if request.param == "flock" else None)
+    yield rw
+    rw.close()
+
+
+def test_readers_share_the_lock(lock):
+    inside = threading.Barrier(3, timeout=5)
+
+    def read():
+        lock.acquire_read()
+        try:
+            inside.wait()  # all three readers hold the lock at once
+        finally:
+            lock.release_read()
+
+    threads = [_started(read) for _ in range(2)]
+    read()
+    for thread in threads:
+        thread.join(5)
+    assert not inside.broken
+
+
+def test_writer_waits_for_readers_and_excludes_them(lock):
+    events = []
+    lock.acquire_read()
+
+    def write():
+        lock.acquire_write()
+        events.append("write")
+        time.sleep(0.05)
+        events.append("write done")
+        lock.release_write()
+
+    writer = _started(write)
+    time.sleep(0.05)
+    assert events == []  # blocked by the reader
+    lock.release_read()
+    time.sleep(0.01)
+
+    def read():
+        lock.acquire_read()
+        events.append("read")
+        lock.release_read()
+
+    reader = _started(read)
+    writer.join(5)
+    reader.join(5)
+    assert events == ["write", "write done", "read"]
+
+
+def test_waiting_writer_holds_back_new_readers(lock):
+    events = []
+    lock.acquire_read()
+
+    def write():
+        lock.acquire_write()
+        events.append("write")
+        lock.release_write()
+
+    writer = _started(write)
+    time.sleep(0.05)
+
+    def read():
+        lock.acquire_read()
+        events.append("read")
+        lock.release_read()
+
+    reader = _started(read)
+    time.sleep(0.05)
+    assert events == []  # the new reader queues behind the writer
+    lock.release_read()
+    writer.join(5)
+    reader.join(5)
+    assert events == ["write", "read"]
+
+
+@pytest.mark.skipif(fcntl is None, reason="fcntl is not available")
+def test_writer_in_another_process_excludes_readers(tmp_path):
+    lock_path = tmp_path / LOCK_FILENAME
+    child = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            textwrap.dedent(
+                f"""
+                import time
+                from pathlib import Path
+                from editerra_racag.db.executor import _ReadWriteLock
+                lock = _ReadWriteLock(Path({str(lock_path)!r}))
+                lock.acquire_write()
+                print("locked", flush=True)
+                time.sleep(0.3)
+                lock.release_write()
+                """
+            ),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    try:
+        assert child.stdout.readline().strip() == "locked"
+        lock = _ReadWriteLock(lock_path)
+        started = time.monotonic()
+        lock.acquire_read()
+        waited = time.monotonic() - started
+        lock.release_read()
+        lock.close()
+        assert waited > 0.1
+    finally:
+        child.wait(5)
+
+
+@pytest.fixture
+def flat_store(tmp_path: Path):
+    store = FlatStore(str(tmp_path / "db"), "chunks")
+    yield store
+    store.close()
+
+
+def test_writes_run_in_order_on_one_thread(flat_store):
+    executor = StoreExecutor(flat_store, max_readers=2)
+    seen = []
+
+    def record(i):
+        seen.append((i, threading.current_thread().name))
+
+    futures = [executor.submit_write(record, i) for i in range(20)]
+    for future in futures:
+        future.result(5)
+    executor.shutdown()
+    assert [i for i, _ in seen] == list(range(20))
+    assert len({name for _, name in seen}) == 1
+    assert executor.stats()["writes"] == 20
+
+
+def test_nested_calls_run_inline(flat_store):
+    executor = StoreExecutor(flat_store, max_readers=1)
+    # A read issued from inside a write would deadlock if it were queued
+    assert executor.write(lambda: executor.read(lambda: "inner")) == "inner"
+    executor.shutdown()
+
+
+def test_serialized_store_round_trip(flat_store):
+    store = SerializedStore(StoreExecutor(flat_store))
+    store.upsert(["a", "b"], [[1, 0], [0, 1]], [{"n": 1}, {"n": 2}], ["A", "B"])
+    assert store.count() == 2
+    assert [hit.id for hit in store.query([1, 0.1], 1)] == ["a"]
+    assert store.get(["b"])[0].document == "B"
+    pages = list(store.snapshot(include=("metadatas",), page_size=1))
+    assert [hit.id for page in pages for hit in page] == ["a", "b"]
+    store.delete(["a"])
+    assert store.count() == 1
+    assert store.reads_during_writes
+    store.executor.shutdown()
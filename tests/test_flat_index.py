@@ -0,0 +1,104 @@
+"""Tests for the memory-mapped flat vector index."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from editerra_racag.db.flat_index import FlatCollection
+
+
+def _unit(*values: float):
+    vector = np.array(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+@pytest.fixture
+def collection(tmp_path: Path) -> FlatCollection:
+    coll = FlatCollection(tmp_path / "coll")
+    coll.upsert(
+        ["a", "b", "c"],
+        [[1, 0, 0], [0, 1, 0], [0, 0, 1]],
+        [{"n": 1}, {"n": 2}, {"n": 3}],
+        ["A", "B", "C"],
+    )
+    yield coll
+    coll.close()
+
+
+def _query(coll: FlatCollection, vector, k: int = 3):
+    result = coll.query([vector], n_results=k)
+    return result["ids"][0], result["distances"][0]
+
+
+def test_query_orders_by_cosine_distance(collection):
+    ids, distances = _query(collection, _unit(1, 0.5, 0))
+    assert ids == ["a", "b", "c"]
+    assert distances[0] == pytest.approx(1 - 1 / np.sqrt(1.25), abs=1e-6)
+    assert distances[2] == pytest.approx(1.0, abs=1e-6)
+
+
+def test_upsert_replaces_vector_document_and_metadata(collection):
+    collection.upsert(["a"], [[0, 0, 2]], [{"n": 10}], ["A2"])
+    assert collection.count() == 3
+    ids, distances = _query(collection, [0, 0, 1], k=2)
+    assert set(ids) == {"a", "c"}
+    assert distances == pytest.approx([0.0, 0.0], abs=1e-6)
+    fetched = collection.get(["a"], include=["documents", "metadatas", "embeddings"])
+    assert fetched["documents"] == ["A2"]
+    assert fetched["metadatas"] == [{"n": 10}]
+    assert fetched["embeddings"][0] == pytest.approx([0, 0, 1])
+
+
+def test_upsert_never_rewrites_scanned_rows(collection):
+    before = np.array(collection._vectors[:3])
+    collection.upsert(["b"], [[1, 1, 0]])
+    # A query that started before the upsert only scans the first rows
+    assert np.array_equal(collection._vectors[:3], before)
+    assert collection._rows["b"] >= 3
+
+
+def test_repeated_upserts_compact(collection):
+    for i in range(20):
+        collection.upsert(["a"], [[1, i, 0]])
+    assert len(collection._ids) < 10
+    assert collection.count() == 3
+    ids, _ = _query(collection, _unit(1, 19, 0), k=1)
+    assert ids == ["a"]
+
+
+def test_delete_and_compaction(collection):
+    collection.delete(["b", "missing"])
+    assert collection.count() == 2
+    ids, _ = _query(collection, [0, 1, 0])
+    assert ids == ["a", "c"] or ids == ["c", "a"]
+    collection.delete(["a"])
+    # More than a quarter of the rows were dead, so rows were renumbered
+    assert collection._ids == ["c"]
+    assert collection.get(["c"])["documents"] == ["C"]
+
+
+def test_dimension_mismatch(collection):
+    with pytest.raises(ValueError):
+        collection.upsert(["d"], [[1, 0]])
+
+
+def test_reopen_and_refresh_after_another_writer(tmp_path, collection):
+    other = FlatCollection(tmp_path / "coll")
+    assert other.count() == 3
+    other.upsert(["d"], [[1, 1, 1]], [{"n": 4}], ["D"])
+    other.delete(["a"])
+    # The first handle picks up the other connection's commits
+    assert collection.count() == 3
+    assert collection.get(["d"])["documents"] == ["D"]
+    ids, _ = _query(collection, _unit(1, 1, 1), k=1)
+    assert ids == ["d"]
+    other.close()
+
+
+def test_clear(collection):
+    collection.clear()
+    assert collection.count() == 0
+    assert _query(collection, [1, 0, 0]) == ([], [])
+    collection.upsert(["x"], [[0, 1]])
+    assert collection.dims == 2
@@ -0,0 +1,76 @@
+"""Tests for the .git/index reader and git-aware file discovery."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from editerra_racag.file_inventory import iter_repo_files
+from editerra_racag.git_index import GitIndexError, read_git_index
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+TRACKED = [
+    "README.md",
+    "src/app/main.py",
+    "src/app/main_test.py",
+    "src/app/models/user.py",
+    "src/application.py",
+    "src/lib/util.py",
+    "zeta/" + "deep/" * 40 + "long_name.py",
+]
+
+
+def _git(repo: Path, *args: str):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init", "-q")
+    for rel_path in TRACKED:
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {rel_path}\n")
+    _git(tmp_path, "add", ".")
+    return tmp_path
+
+
+@pytest.mark.parametrize("version", [2, 4])
+def test_read_git_index_versions(repo: Path, version: int):
+    _git(repo, "update-index", "--index-version", str(version))
+    assert (repo / ".git" / "index").read_bytes()[4:8] == version.to_bytes(4, "big")
+    assert read_git_index(repo) == sorted(TRACKED)
+
+
+def test_read_git_index_skips_removed_and_keeps_sorted(repo: Path):
+    _git(repo, "update-index", "--index-version", "4")
+    _git(repo, "rm", "-q", "--cached", "src/app/main_test.py")
+    assert read_git_index(repo) == sorted(p for p in TRACKED if p != "src/app/main_test.py")
+
+
+def test_read_git_index_rejects_corrupt_index(repo: Path):
+    index = repo / ".git" / "index"
+    index.write_bytes(index.read_bytes()[:40])
+    with pytest.raises(GitIndexError):
+        read_git_index(repo)
+
+
+def test_git_discovery_includes_untracked_but_not_ignored(repo: Path):
+    (repo / ".gitignore").write_text("build/\n*.log\n")
+    (repo / "build").mkdir()
+    (repo / "build" / "out.py").write_text("")
+    (repo / "debug.log").write_text("")
+    (repo / "src" / "app" / "new.py").write_text("")
+    (repo / "src" / "lib" / "util.py").unlink()  # deleted but still staged
+
+    found = [entry.rel_path for entry in iter_repo_files(repo, mode="git")]
+
+    assert "src/app/new.py" in found
+    assert ".gitignore" in found
+    assert "build/out.py" not in found
+    assert "debug.log" not in found
+    assert "src/lib/util.py" not in found
+    assert found == sorted(found)
+    assert found == [entry.rel_path for entry in iter_repo_files(repo, mode="auto")]
@@ -0,0 +1,131 @@
+"""Tests for byte diffing and incremental re-chunking."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from editerra_racag.chunking import incremental
+from editerra_racag.chunking.incremental import IncrementalChunker, diff_bytes
+
+SOURCE = """def first():
+    return 1
+
+
+def second():
+    return 2
+
+
+class Third:
+    def method(self):
+        return 3
+"""
+
+
+def _reference_diff(old: bytes, new: bytes):
+    """Byte-by-byte common prefix / suffix."""
+    if old == new:
+        return None
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    suffix = 0
+    while suffix < limit - start and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return start, len(old) - suffix, len(new) - suffix
+
+
+@pytest.mark.parametrize(
+    "old, new, expected",
+    [
+        (b"abc", b"abc", None),
+        (b"abcdef", b"abXYef", (2, 4, 4)),
+        (b"abcdef", b"abef", (2, 4, 2)),
+        (b"abef", b"abcdef", (2, 2, 4)),
+        (b"", b"abc", (0, 0, 3)),
+        (b"abc", b"", (0, 3, 0)),
+        # Prefix and suffix must not overlap
+        (b"aaa", b"aaaa", (3, 3, 4)),
+        (b"abab", b"ab", (2, 4, 2)),
+    ],
+)
+def test_diff_bytes(old, new, expected):
+    assert diff_bytes(old, new) == expected
+
+
+def test_diff_bytes_matches_reference_across_blocks(monkeypatch):
+    # Small blocks exercise the block skipping and the bisection
+    monkeypatch.setattr(incremental, "_DIFF_BLOCK", 8)
+    rng = random.Random(0)
+    for _ in range(500):
+        old = bytes(rng.choice(b"ab\n") for _ in range(rng.randint(0, 200)))
+        start = rng.randint(0, len(old))
+        end = rng.randint(start, len(old))
+        insert = bytes(rng.choice(b"abc\n") for _ in range(rng.randint(0, 20)))
+        new = old[:start] + insert + old[end:]
+        assert diff_bytes(old, new) == _reference_diff(old, new)
+
+
+@pytest.fixture
+def source_file(tmp_path: Path) -> Path:
+    path = tmp_path / "module.py"
+    path.write_text(SOURCE)
+    return path
+
+
+def _symbols(chunks):
+    return [chunk["symbol"] for chunk in chunks]
+
+
+def test_first_update_returns_every_chunk(source_file):
+    chunks, is_incremental = IncrementalChunker().update(source_file)
+    assert not is_incremental
+    assert len(chunks) == 4
+    assert "first" in _symbols(chunks) and "second" in _symbols(chunks)
+
+
+def test_edit_reemits_only_the_changed_function(source_file):
+    chunker = IncrementalChunker()
+    chunker.update(source_file)
+    source_file.write_text(SOURCE.replace("return 2", "value = 2\n    return value"))
+    chunks, is_incremental = chunker.update(source_file)
+    assert is_incremental
+    assert _symbols(chunks) == ["second"]
+    assert chunks[0]["lines"] == "5-7"
+    assert "value = 2" in chunks[0]["chunk_text"]
+
+
+def test_edit_in_method_selects_innermost_declaration(source_file):
+    chunker = IncrementalChunker()
+    chunker.update(source_file)
+    source_file.write_text(SOURCE.replace("return 3", "return 4"))
+    chunks, _ = chunker.update(source_file)
+    assert len(chunks) == 1
+    assert chunks[0]["lines"] == "10-11"
+
+
+def test_unchanged_save_returns_nothing(source_file):
+    chunker = IncrementalChunker()
+    chunker.update(source_file)
+    assert chunker.update(source_file) == ([], True)
+
+
+def test_forget_and_eviction_force_a_full_parse(tmp_path, source_file):
+    chunker = IncrementalChunker(max_files=1)
+    chunker.update(source_file)
+    chunker.forget(source_file)
+    assert not chunker.update(source_file)[1]
+
+    other = tmp_path / "other.py"
+    other.write_text(SOURCE)
+    chunker.update(other)
+    # Only one tree is kept, so the first file was evicted
+    assert not chunker.update(source_file)[1]
+
+
+def test_unsupported_extension(tmp_path):
+    path = tmp_path / "notes.unknown"
+    path.write_text("text")
+    with pytest.raises(ValueError):
+        IncrementalChunker().update(path)
@@ -0,0 +1,117 @@
+"""Tests for the streaming JSON chunker."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from editerra_racag.chunking import json_chunker
+from editerra_racag.chunking.json_chunker import chunk_json, iter_json_chunks
+
+
+def _write(tmp_path: Path, data, **dump_kwargs) -> Path:
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(data, **dump_kwargs), encoding="utf-8")
+    return path
+
+
+def _assert_spans_match_source(path: Path, chunks):
+    lines = path.read_text(encoding="utf-8").split("\n")
+    for chunk in chunks:
+        span = "\n".join(lines[chunk["start_line"] - 1:chunk["end_line"]])
+        assert chunk["chunk_text"] in span
+        assert chunk["lines"] == f"{chunk['start_line']}-{chunk['end_line']}"
+
+
+def _paths(chunks):
+    return [
+        tag.split(":", 1)[1] for chunk in chunks for tag in chunk["tags"] if tag.startswith("json_path:")
+    ]
+
+
+@pytest.fixture(params=[1 << 20, 7], ids=["one-block", "tiny-blocks"])
+def block_size(request, monkeypatch):
+    # Tiny blocks put strings, escapes and tokens across block boundaries
+    monkeypatch.setattr(json_chunker, "READ_BLOCK_BYTES", request.param)
+    return request.param
+
+
+def test_small_file_is_one_chunk(tmp_path, block_size):
+    path = _write(tmp_path, {"a": 1, "b": [1, 2]}, indent=2)
+    chunks = chunk_json(str(path))
+    assert len(chunks) == 1
+    assert json.loads(chunks[0]["chunk_text"]) == {"a": 1, "b": [1, 2]}
+    assert (chunks[0]["start_line"], chunks[0]["end_line"]) == (1, 7)
+    assert chunks[0]["language"] == "json"
+
+
+def test_top_level_members_are_grouped_with_exact_line_spans(tmp_path, block_size):
+    data = {f"key_{i}": {"label": f"Label {i}", "hint": "x" * 40} for i in range(100)}
+    path = _write(tmp_path, data, indent=2)
+    chunks = list(iter_json_chunks(str(path), min_bytes=512, max_bytes=4096))
+
+    assert len(chunks) > 1
+    _assert_spans_match_source(path, chunks)
+    # Consecutive chunks cover consecutive lines
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk["start_line"] == previous["end_line"] + 1
+    assert chunks[0]["start_line"] == 1
+    assert chunks[-1]["end_line"] == len(path.read_text().split("\n"))
+    assert all("json_fragment" not in chunk["tags"] for chunk in chunks)
+    assert _paths(chunks)[0] == "$.key_0"
+    assert all(p.startswith("$.key_") for p in _paths(chunks))
+
+
+def test_array_paths_use_indexes(tmp_path, block_size):
+    data = [{"id": i, "text": "y" * 60} for i in range(50)]
+    path = _write(tmp_path, data, indent=1)
+    chunks = list(iter_json_chunks(str(path), min_bytes=300, max_bytes=4096))
+    paths = _paths(chunks)
+    assert paths[0] == "$[0]"
+    indexes = [int(p[2:-1]) for p in paths]
+    assert indexes == sorted(indexes)
+    _assert_spans_match_source(path, chunks)
+
+
+def test_large_member_is_cut_into_fragments(tmp_path, block_size):
+    data = {"strings": {f"s{i}": f"value {i}" for i in range(500)}}
+    path = _write(tmp_path, data, indent=2)
+    chunks = list(iter_json_chunks(str(path), min_bytes=256, max_bytes=1024))
+    assert len(chunks) > 1
+    assert all(len(chunk["chunk_text"].encode()) <= 1024 + 64 for chunk in chunks)
+    assert all("json_fragment" in chunk["tags"] for chunk in chunks[1:])
+    assert _paths(chunks)[1].startswith("$.strings.s")
+    _assert_spans_match_source(path, chunks)
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_long_string_is_cut_inside_the_string(tmp_path, block_size, ensure_ascii):
+    text = 'héllo "wörld" \\ ' * 2000
+    path = _write(tmp_path, {"a": 1, "long": text}, ensure_ascii=ensure_ascii)
+    chunks = list(iter_json_chunks(str(path), min_bytes=256, max_bytes=1024))
+
+    assert len(chunks) > 10
+    assert all(len(chunk["chunk_text"].encode()) <= 1024 + 16 for chunk in chunks)
+    assert all("�" not in chunk["chunk_text"] for chunk in chunks)
+    assert all("json_fragment" in chunk["tags"] for chunk in chunks[1:])
+    assert set(_paths(chunks)[1:]) == {"$.long"}
+    # No escape is split, and the pieces add back up to the string
+    encoded = json.dumps(text, ensure_ascii=ensure_ascii)
+    assert encoded in "".join(chunk["chunk_text"] for chunk in chunks)
+
+
+def test_multiline_values_keep_line_numbers(tmp_path, block_size):
+    path = tmp_path / "data.json"
+    members = ",\n".join(f'  "k{i}": [\n    {i},\n    {i + 1}\n  ]' for i in range(60))
+    path.write_text("{\n" + members + "\n}\n")
+    chunks = list(iter_json_chunks(str(path), min_bytes=128, max_bytes=4096))
+    _assert_spans_match_source(path, chunks)
+    first = chunks[1]
+    key = _paths([first])[0].split(".")[1]
+    assert f'"{key}"' in path.read_text().split("\n")[first["start_line"] - 1]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("")
+    assert chunk_json(str(path)) == []
@@ -0,0 +1,148 @@
+"""Tests for the quantized sidecar index."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from editerra_racag.db.flat_index import FlatStore
+from editerra_racag.db.quantization import QuantizedIndex, encode, normalize
+
+DIMS = 64
+
+
+def _vectors(n: int, seed: int = 0) -> np.ndarray:
+    """Clustered vectors, so near neighbours are close in score."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((16, DIMS))
+    return (centres[rng.integers(0, 16, n)] + 0.3 * rng.standard_normal((n, DIMS))).astype(np.float32)
+
+
+def _ids(n: int):
+    return [f"chunk-{i}" for i in range(n)]
+
+
+@pytest.fixture
+def index_dir(tmp_path: Path) -> Path:
+    return tmp_path / "quantized"
+
+
+@pytest.mark.parametrize("codec, tolerance", [("int8", 0.02), ("float16", 0.002)])
+def test_encode_round_trip(codec, tolerance):
+    vectors = normalize(_vectors(100))
+    codes, scales = encode(vectors, codec)
+    decoded = codes.astype(np.float32) * scales[:, None]
+    assert np.abs(decoded - vectors).max() < tolerance
+
+
+def test_unknown_codec(index_dir):
+    with pytest.raises(ValueError):
+        QuantizedIndex(index_dir, codec="int4")
+
+
+@pytest.mark.parametrize("codec", ["int8", "float16"])
+def test_rescored_search_recall(index_dir, codec):
+    vectors = _vectors(3000)
+    index = QuantizedIndex(index_dir, codec)
+    index.upsert(_ids(3000), vectors)
+    queries = _vectors(50, seed=1)
+
+    assert index.recall(queries, k=10, oversample=4) >= 0.95
+    # Rescored scores are exact cosine similarities
+    cid, score = index.search(queries[0], 1)[0]
+    row = int(cid.split("-")[1])
+    expected = normalize(vectors[row])[0] @ normalize(queries[0])[0]
+    assert score == pytest.approx(float(expected), abs=1e-5)
+    found, exact = index.search(queries[0], 5), index.exact_search(queries[0], 5)
+    assert [cid for cid, _ in found] == [cid for cid, _ in exact]
+    assert [s for _, s in found] == pytest.approx([s for _, s in exact], abs=1e-5)
+
+
+def test_memory_is_a_quarter_of_float32_with_int8(index_dir):
+    index = QuantizedIndex(index_dir, "int8")
+    index.upsert(_ids(1000), _vectors(1000))
+    float32_bytes = 1000 * DIMS * 4
+    assert index.memory_bytes() == 1000 * DIMS + 1000 * 4
+    assert index.memory_bytes() < float32_bytes / 3
+
+
+def test_upsert_replaces_and_delete_removes(index_dir):
+    index = QuantizedIndex(index_dir)
+    index.upsert(["a", "b"], [[1, 0, 0], [0, 1, 0]])
+    index.upsert(["a"], [[0, 0, 1]])
+    assert index.count() == 2
+    assert index.search([0, 0, 1], 1)[0][0] == "a"
+    assert index.vectors(["a", "missing"]) == [pytest.approx([0, 0, 1]), None]
+    index.delete(["a"])
+    assert index.count() == 1
+    assert [cid for cid, _ in index.search([0, 0, 1], 5)] == ["b"]
+    with pytest.raises(ValueError):
+        index.upsert(["c"], [[1, 0]])
+
+
+def test_save_and_reload_read_only(index_dir):
+    vectors = _vectors(200)
+    index = QuantizedIndex(index_dir, "int8")
+    index.upsert(_ids(200), vectors)
+    index.save()
+
+    reader = QuantizedIndex(index_dir, "int8", read_only=True)
+    assert reader.count() == 200
+    assert reader.search(vectors[7], 3) == index.search(vectors[7], 3)
+    with pytest.raises(ValueError):
+        reader.upsert(["x"], vectors[:1])
+    with pytest.raises(ValueError):
+        reader.save()
+
+
+def test_readers_keep_their_version_until_reload(index_dir):
+    vectors = _vectors(100)
+    writer = QuantizedIndex(index_dir)
+    writer.upsert(_ids(100), vectors)
+    writer.save()
+    reader = QuantizedIndex(index_dir, read_only=True)
+    before = reader.search(vectors[3], 5)
+
+    # Replace every vector and drop half: rows are appended, then compacted
+    writer.upsert(_ids(100), vectors[::-1])
+    writer.delete(_ids(100)[50:])
+    writer.save()
+    assert len(list(index_dir.glob("vectors.*.npy"))) == 1
+
+    assert reader.search(vectors[3], 5) == before
+    reloaded = QuantizedIndex(index_dir, read_only=True)
+    assert reloaded.count() == 50
+    assert reloaded.search(vectors[96], 1)[0][0] == "chunk-3"
+
+
+def test_codec_change_reencodes_on_load(index_dir):
+    vectors = _vectors(100)
+    index = QuantizedIndex(index_dir, "float16")
+    index.upsert(_ids(100), vectors)
+    index.save()
+    reopened = QuantizedIndex(index_dir, "int8")
+    assert reopened.count() == 100
+    assert reopened.search(vectors[5], 1)[0][0] == "chunk-5"
+
+
+def test_clear_is_published_by_the_next_save(index_dir):
+    index = QuantizedIndex(index_dir)
+    index.upsert(["a"], [[1, 0]])
+    index.save()
+    index.clear()
+    assert QuantizedIndex(index_dir, read_only=True).count() == 1
+    index.save()
+    assert QuantizedIndex(index_dir, read_only=True).count() == 0
+
+
+def test_sync_with_store(tmp_path, index_dir):
+    vectors = _vectors(30)
+    store = FlatStore(str(tmp_path / "db"), "chunks")
+    store.upsert(_ids(30), vectors.tolist(), [{}] * 30, ["doc"] * 30)
+    index = QuantizedIndex(index_dir)
+
+    assert index.sync_with(store)
+    assert index.count() == 30
+    assert not index.sync_with(store)
+    assert index.search(vectors[12], 1)[0][0] == "chunk-12"
+    store.close()